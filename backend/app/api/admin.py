@@ -1,14 +1,23 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
 from typing import List
-from app.db.database import get_db
-from app.models.user import User, UserRole
+from app.db.database import get_db, get_pool_status
+from app.db import search_index
+from app.db.projections import select_for
+from app.db.resource_owner import invalidate_resource_owner
+from app.db.token_versions import bump_token_version, forget_token_version, token_version_cache_stats
+from app.models.user import User, UserRole, UserTheme
 from app.schemas.user import UserResponse
-from app.api.deps import get_current_user
+from app.api.deps import get_current_user, invalidate_principal, principal_cache
+from app.api.export import export_response
+from app.api.serialization import ListSerializer
+from app.core.security import hash_pool
 from pydantic import BaseModel
 
 router = APIRouter()
 
+user_list = ListSerializer(UserResponse)
+
 
 class UpdateUserRoleRequest(BaseModel):
     role: UserRole
@@ -30,23 +39,21 @@ def list_all_users(
     db: Session = Depends(get_db)
 ):
     """Get all users - accessible by admin only"""
-    users = db.query(User).all()
+    users = db.execute(select_for(User, UserResponse)).all()
     
-    # Convert UUIDs to strings
-    return [
-        UserResponse(
-            id=str(user.id),
-            email=user.email,
-            display_name=user.display_name,
-            tagline=user.tagline,
-            bio=user.bio,
-            avatar_url=user.avatar_url,
-            role=user.role,
-            is_protected=user.is_protected,
-            created_at=user.created_at
-        )
-        for user in users
-    ]
+    return user_list.response(users)
+
+
+@router.get("/users/export")
+def export_users(
+    export_format: str = Query("ndjson", alias="format", pattern="^(ndjson|csv)$"),
+    compress: bool = Query(False, alias="gzip"),
+    current_user: User = Depends(require_admin)
+):
+    """Stream every user as NDJSON or CSV, in id order - accessible by admin only"""
+    query = select_for(User, UserResponse).order_by(User.id)
+    # Ids as strings, like GET /api/admin/users
+    return export_response(query, export_format, "users", compress, text_columns=("id",))
 
 
 @router.patch("/users/{user_id}/role", response_model=UserResponse)
@@ -95,10 +102,14 @@ def update_user_role(
                     detail="Cannot demote the last admin. At least one admin must remain."
                 )
         
-        # Update role
+        # Update role; tokens carrying the old role claim stop working
         user.role = role_update.role
+        bump_token_version(db, user.id)
         db.commit()
         db.refresh(user)
+        forget_token_version(user.id)
+        invalidate_principal(user.email)
+        invalidate_resource_owner()
         
     except HTTPException:
         db.rollback()
@@ -167,8 +178,14 @@ def delete_user(
                 )
         
         # Delete user (cascades to resources due to relationship configuration)
+        search_index.remove_resources(db.connection(), [resource.id for resource in user.resources])
         db.delete(user)
+        db.query(UserTheme).filter(UserTheme.user_id == str(user.id)).delete(synchronize_session=False)
+        bump_token_version(db, user.id)
         db.commit()
+        forget_token_version(user.id)
+        invalidate_principal(user.email)
+        invalidate_resource_owner()
         
         return {"success": True, "message": f"User {user.email} deleted successfully"}
         
@@ -181,3 +198,27 @@ def delete_user(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to delete user: {str(e)}"
         )
+
+
+@router.get("/cache/principals")
+def get_principal_cache_stats(current_user: User = Depends(require_admin)):
+    """Hit/miss counters of the authenticated principal cache (this worker only)"""
+    return principal_cache.stats()
+
+
+@router.get("/cache/token-versions")
+def get_token_version_cache_stats(current_user: User = Depends(require_admin)):
+    """Hit/miss counters of the token revocation version cache (this worker only)"""
+    return token_version_cache_stats()
+
+
+@router.get("/hash-pool")
+def get_hash_pool_stats(current_user: User = Depends(require_admin)):
+    """Password hashing pool load and rejection counters (this worker only)"""
+    return hash_pool.stats()
+
+
+@router.get("/db/pool")
+def get_db_pool_stats(current_user: User = Depends(require_admin)):
+    """Connection pool usage, overflow and wait counters (this worker only)"""
+    return get_pool_status()
@@ -7,6 +7,7 @@ from app.models.user import User
 from app.core.security import get_password_hash, verify_password, create_access_token
 from app.core.config import settings
 from app.db.seed import seed_default_resources
+from app.db.token_versions import load_token_version
 
 router = APIRouter()
 
@@ -20,6 +21,7 @@ def signup(user_data: UserCreate, db: Session = Depends(get_db)):
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email already registered"
         )
+    db.close()
     
     # Create new user
     hashed_password = get_password_hash(user_data.password)
@@ -38,10 +40,16 @@ def signup(user_data: UserCreate, db: Session = Depends(get_db)):
     # Seed default resources for new user
     seed_default_resources(db, str(new_user.id))
     
-    # Create access token
+    # Create access token (role/id/version claims let read endpoints skip the DB)
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
-        data={"sub": new_user.email}, expires_delta=access_token_expires
+        data={
+            "sub": new_user.email,
+            "uid": new_user.id,
+            "role": new_user.role.value,
+            "ver": load_token_version(db, new_user.id)
+        },
+        expires_delta=access_token_expires
     )
     
     # Convert UUID to string for response
@@ -65,6 +73,10 @@ def signup(user_data: UserCreate, db: Session = Depends(get_db)):
 @router.post("/login", response_model=Token)
 def login(login_data: LoginRequest, db: Session = Depends(get_db)):
     user = db.query(User).filter(User.email == login_data.email).first()
+    # Uncached: a bump on another worker must not leave a new token already revoked
+    token_version = load_token_version(db, user.id) if user else 0
+    # Hand the connection back to the pool before the slow bcrypt check
+    db.close()
     
     if not user or not verify_password(login_data.password, user.hashed_password):
         raise HTTPException(
@@ -74,7 +86,13 @@ def login(login_data: LoginRequest, db: Session = Depends(get_db)):
     
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
-        data={"sub": user.email}, expires_delta=access_token_expires
+        data={
+            "sub": user.email,
+            "uid": user.id,
+            "role": user.role.value,
+            "ver": token_version
+        },
+        expires_delta=access_token_expires
     )
     
     return {"access_token": access_token, "token_type": "bearer"}
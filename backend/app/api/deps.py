@@ -1,34 +1,125 @@
+from typing import Optional
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
+from sqlalchemy import inspect
+from sqlalchemy.orm import Session, make_transient_to_detached
 from app.db.database import get_db
-from app.core.security import decode_access_token
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.security import decode_access_token_claims
+from app.db.token_versions import get_token_version, load_token_version
 from app.models.user import User, UserRole
+from app.schemas.user import TokenPrincipal
 
 security = HTTPBearer()
 
+# (column snapshot, token version) of authenticated users, keyed by token
+# subject (email). Role changes and deletions bump the user's token_versions
+# row, so a snapshot is only used while that row still holds its version.
+principal_cache = TTLCache(
+    max_entries=settings.PRINCIPAL_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.PRINCIPAL_CACHE_TTL_SECONDS
+)
 
-def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
-) -> User:
-    token = credentials.credentials
-    email = decode_access_token(token)
-    
-    if email is None:
+_USER_COLUMNS = [attr.key for attr in inspect(User).column_attrs]
+
+
+def invalidate_principal(email: str) -> None:
+    """Drop a cached principal so the next request reloads it from the database"""
+    principal_cache.invalidate(email)
+
+
+def _attach_cached_user(db: Session, snapshot: dict) -> User:
+    # Rebuild a per-request instance and attach it without a SELECT, so handlers
+    # can still modify current_user and commit through their own session.
+    user = User(**snapshot)
+    make_transient_to_detached(user)
+    return db.merge(user, load=False)
+
+
+def _decode_credentials(credentials: HTTPAuthorizationCredentials) -> dict:
+    claims = decode_access_token_claims(credentials.credentials)
+    if claims is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Could not validate credentials"
         )
-    
+    return claims
+
+
+def _check_token_version(db: Session, claims: dict, version: Optional[int] = None) -> None:
+    # Tokens issued before the version claim existed carry no "ver"
+    if "ver" not in claims or "uid" not in claims:
+        return
+    if version is None:
+        version = get_token_version(db, claims["uid"])
+    if claims["ver"] != version:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Token has been revoked"
+        )
+
+
+def get_current_user(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: Session = Depends(get_db)
+) -> User:
+    claims = _decode_credentials(credentials)
+    email = claims["sub"]
+
+    cached = principal_cache.get(email)
+    if cached is not None:
+        snapshot, version = cached
+        # Read the version from the database, not the per-worker cache: another
+        # worker may have just demoted or deleted this user
+        current_version = load_token_version(db, snapshot["id"])
+        db.rollback()
+        if current_version == version:
+            _check_token_version(db, claims, current_version)
+            return _attach_cached_user(db, snapshot)
+        principal_cache.invalidate(email)
+
     user = db.query(User).filter(User.email == email).first()
     if user is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="User not found"
         )
-    
-    return user
+
+    version = load_token_version(db, user.id)
+    _check_token_version(db, claims, version)
+    snapshot = {key: getattr(user, key) for key in _USER_COLUMNS}
+    principal_cache.set(email, (snapshot, version))
+    # Give the connection back before the handler runs: holding it across
+    # threadpool hops lets a burst of cold requests exhaust the pool.
+    db.expunge(user)
+    db.rollback()
+    return _attach_cached_user(db, snapshot)
+
+
+def get_token_principal(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: Session = Depends(get_db)
+) -> TokenPrincipal:
+    """Authorize read-only endpoints from the token claims alone
+
+    Only the (cached) token version is checked, so role changes, password
+    resets and deletions still revoke access. Older tokens without the claims
+    fall back to the full user lookup.
+    """
+    claims = _decode_credentials(credentials)
+    if not all(key in claims for key in ("uid", "role", "ver")):
+        user = get_current_user(credentials, db)
+        return TokenPrincipal(id=user.id, email=user.email, role=user.role)
+
+    _check_token_version(db, claims)
+    try:
+        return TokenPrincipal(id=claims["uid"], email=claims["sub"], role=claims["role"])
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials"
+        )
 
 
 def get_current_admin_user(
@@ -0,0 +1,107 @@
+"""Streaming NDJSON/CSV exports with flat memory.
+
+``export_response`` runs a SELECT on its own connection with
+``stream_results`` (a server-side cursor where the driver has one) and
+``yield_per``, and encodes each partition of ``EXPORT_CHUNK_ROWS`` rows into
+one body chunk of a StreamingResponse. Only one partition is in memory at a
+time, whatever the size of the table. With ``compress=True`` the chunks are
+gzipped on the fly and the download is a ``.gz`` file. ``text_columns`` are
+written as strings, like the response schemas do for ids.
+"""
+import csv
+import io
+import json
+import zlib
+from datetime import date, datetime
+from enum import Enum
+from typing import Iterator, Sequence
+from fastapi.responses import StreamingResponse
+from sqlalchemy import Select
+from app.core.config import settings
+from app.db.database import engine
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+EXPORT_FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+
+
+def _plain(value):
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+def _ndjson_chunk(columns, rows) -> bytes:
+    if orjson is not None:
+        return b"".join(
+            orjson.dumps(dict(zip(columns, row)), default=_plain) + b"\n" for row in rows
+        )
+    return "".join(
+        json.dumps(dict(zip(columns, row)), default=_plain, separators=(",", ":")) + "\n" for row in rows
+    ).encode()
+
+
+def _as_text(rows, positions) -> list:
+    rows = [list(row) for row in rows]
+    for row in rows:
+        for i in positions:
+            if row[i] is not None:
+                row[i] = str(row[i])
+    return rows
+
+
+def _csv_chunk(rows) -> bytes:
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows([_plain(value) for value in row] for row in rows)
+    return buffer.getvalue().encode()
+
+
+def _stream_rows(statement: Select, export_format: str, compress: bool,
+                 text_columns: Sequence[str]) -> Iterator[bytes]:
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31) if compress else None
+
+    def emit(chunk: bytes) -> bytes:
+        return compressor.compress(chunk) if compressor else chunk
+
+    with engine.connect() as conn:
+        result = conn.execution_options(
+            stream_results=True, yield_per=settings.EXPORT_CHUNK_ROWS
+        ).execute(statement)
+        columns = list(result.keys())
+        positions = [i for i, name in enumerate(columns) if name in text_columns]
+        if export_format == "csv":
+            buffer = io.StringIO()
+            csv.writer(buffer).writerow(columns)
+            yield emit(buffer.getvalue().encode())
+        for partition in result.partitions():
+            if positions:
+                partition = _as_text(partition, positions)
+            chunk = _csv_chunk(partition) if export_format == "csv" else _ndjson_chunk(columns, partition)
+            data = emit(chunk)
+            if data:
+                yield data
+    if compressor:
+        yield compressor.flush()
+
+
+def export_response(statement: Select, export_format: str, filename: str,
+                    compress: bool = False, text_columns: Sequence[str] = ()) -> StreamingResponse:
+    """Stream the statement's rows as an NDJSON or CSV download"""
+    filename = f"{filename}.{export_format}"
+    media_type = EXPORT_FORMATS[export_format]
+    if compress:
+        filename += ".gz"
+        media_type = "application/gzip"
+    return StreamingResponse(
+        _stream_rows(statement, export_format, compress, text_columns),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
@@ -1,367 +1,87 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import (
+    APIRouter, BackgroundTasks, Depends, File, HTTPException, Query, Request, Response, UploadFile, status
+)
+from sqlalchemy import and_, func, or_, select
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
+from datetime import datetime
+import base64
+import json
+from app.core.config import settings
+from app.core.templates import get_catalog
 from app.db.database import get_db
+from app.db.async_database import get_async_db
+from app.db.projections import select_for
+from app.db.resource_owner import resolve_resource_owner_id
 from app.models.user import User
-from app.models.resource import Resource
-from app.schemas.resource import ResourceCreate, ResourceUpdate, ResourceResponse
-from app.api.deps import get_current_user
+from app.models.resource import Resource, ResourceImportJob
+from app.schemas.user import TokenPrincipal
+from app.schemas.resource import (
+    ResourceCreate, ResourceUpdate, ResourceResponse,
+    ResourcePatch, ResourceBulkDelete, BulkItemResult, BulkResponse, ResourceImportJobResponse,
+    ResourceSearchHit
+)
+from app.db import bulk, resource_import, search_index
+from app.api.deps import get_current_user, get_token_principal
+from app.api.etag import etag_matches, make_etag, not_modified, set_etag
+from app.api.export import export_response
+from app.api.serialization import ListSerializer
 
 router = APIRouter()
 
-# Template resources - Azure specific
-TEMPLATE_RESOURCES = [
-    {
-        "title": "Azure Virtual Machine",
-        "resource_name": "vm-prod-eastus-01",
-        "description": "Windows/Linux VM for compute workloads",
-        "icon": "server",
-        "status": "Running",
-        "region": "East US"
-    },
-    {
-        "title": "Azure App Service",
-        "resource_name": "app-service-api-prod",
-        "description": "Managed web app hosting",
-        "icon": "globe",
-        "status": "Running",
-        "region": "East US"
-    },
-    {
-        "title": "Azure SQL Database",
-        "resource_name": "sqldb-prod-eastus",
-        "description": "Managed relational database",
-        "icon": "database",
-        "status": "Running",
-        "region": "East US"
-    },
-    {
-        "title": "Azure Cosmos DB",
-        "resource_name": "cosmosdb-main",
-        "description": "NoSQL distributed database",
-        "icon": "box",
-        "status": "Running",
-        "region": "East US"
-    },
-    {
-        "title": "Azure Storage Account",
-        "resource_name": "stgacct-prod-eastus",
-        "description": "Blob, Table, Queue storage",
-        "icon": "hard_drive",
-        "status": "Running",
-        "region": "East US"
-    },
-    {
-        "title": "Azure Key Vault",
-        "resource_name": "keyvault-prod-eastus",
-        "description": "Secrets and certificate management",
-        "icon": "lock",
-        "status": "Running",
-        "region": "East US"
-    },
-    {
-        "title": "Azure Load Balancer",
-        "resource_name": "lb-frontend-prod",
-        "description": "Network load balancing",
-        "icon": "network",
-        "status": "Running",
-        "region": "East US"
-    },
-    {
-        "title": "Azure API Management",
-        "resource_name": "apim-prod-eastus",
-        "description": "API gateway and management",
-        "icon": "link",
-        "status": "Running",
-        "region": "East US"
-    },
-    {
-        "title": "Azure Container Registry",
-        "resource_name": "acr-prod-eastus",
-        "description": "Docker container image repository",
-        "icon": "container",
-        "status": "Running",
-        "region": "East US"
-    },
-    {
-        "title": "Azure Functions",
-        "resource_name": "func-app-serverless",
-        "description": "Serverless compute functions",
-        "icon": "zap",
-        "status": "Running",
-        "region": "East US"
-    },
-    {
-        "title": "Azure Service Bus",
-        "resource_name": "servicebus-prod",
-        "description": "Message queuing and pub/sub",
-        "icon": "activity",
-        "status": "Running",
-        "region": "East US"
-    },
-    {
-        "title": "Azure Application Insights",
-        "resource_name": "appinsights-prod",
-        "description": "Application monitoring and analytics",
-        "icon": "shield",
-        "status": "Running",
-        "region": "East US"
-    },
-    {
-        "title": "Azure Virtual Network",
-        "resource_name": "vnet-prod-eastus",
-        "description": "Virtual networking and connectivity",
-        "icon": "network",
-        "status": "Running",
-        "region": "East US"
-    },
-    {
-        "title": "Azure VPN Gateway",
-        "resource_name": "vpn-gateway-prod",
-        "description": "Secure site-to-site connectivity",
-        "icon": "lock",
-        "status": "Running",
-        "region": "East US"
-    },
-    {
-        "title": "Azure ExpressRoute",
-        "resource_name": "expressroute-prod",
-        "description": "Dedicated network connection",
-        "icon": "link",
-        "status": "Running",
-        "region": "East US"
-    },
-    {
-        "title": "Azure CDN",
-        "resource_name": "cdn-prod-eastus",
-        "description": "Content delivery network",
-        "icon": "globe",
-        "status": "Running",
-        "region": "East US"
-    },
-    {
-        "title": "Azure Monitor",
-        "resource_name": "monitor-prod",
-        "description": "Comprehensive monitoring platform",
-        "icon": "activity",
-        "status": "Running",
-        "region": "East US"
-    },
-    {
-        "title": "Azure Log Analytics",
-        "resource_name": "log-analytics-prod",
-        "description": "Log collection and analysis",
-        "icon": "database",
-        "status": "Running",
-        "region": "East US"
-    },
-    {
-        "title": "Azure Security Center",
-        "resource_name": "security-center-prod",
-        "description": "Unified security management",
-        "icon": "shield",
-        "status": "Running",
-        "region": "East US"
-    },
-    {
-        "title": "Azure Backup",
-        "resource_name": "backup-vault-prod",
-        "description": "Data protection and recovery",
-        "icon": "box",
-        "status": "Running",
-        "region": "East US"
-    },
-    {
-        "title": "Azure Site Recovery",
-        "resource_name": "site-recovery-prod",
-        "description": "Disaster recovery solution",
-        "icon": "zap",
-        "status": "Running",
-        "region": "East US"
-    },
-    {
-        "title": "Azure DevOps",
-        "resource_name": "devops-project-prod",
-        "description": "CI/CD and project management",
-        "icon": "activity",
-        "status": "Running",
-        "region": "East US"
-    },
-    {
-        "title": "Azure Data Factory",
-        "resource_name": "data-factory-prod",
-        "description": "Data integration and ETL",
-        "icon": "database",
-        "status": "Running",
-        "region": "East US"
-    },
-    {
-        "title": "Azure Synapse Analytics",
-        "resource_name": "synapse-prod-eastus",
-        "description": "Big data and analytics",
-        "icon": "box",
-        "status": "Running",
-        "region": "East US"
-    },
-    {
-        "title": "Azure Databricks",
-        "resource_name": "databricks-prod",
-        "description": "Apache Spark analytics platform",
-        "icon": "zap",
-        "status": "Running",
-        "region": "East US"
-    },
-    {
-        "title": "Azure Machine Learning",
-        "resource_name": "ml-workspace-prod",
-        "description": "ML model development and deployment",
-        "icon": "cloud",
-        "status": "Running",
-        "region": "East US"
-    },
-    {
-        "title": "Azure Cognitive Services",
-        "resource_name": "cognitive-services-prod",
-        "description": "AI APIs for vision, language, speech",
-        "icon": "zap",
-        "status": "Running",
-        "region": "East US"
-    },
-    {
-        "title": "Azure Bot Service",
-        "resource_name": "bot-service-prod",
-        "description": "Build intelligent bots",
-        "icon": "globe",
-        "status": "Running",
-        "region": "East US"
-    },
-    {
-        "title": "Azure Search",
-        "resource_name": "search-service-prod",
-        "description": "Full-text search capability",
-        "icon": "box",
-        "status": "Running",
-        "region": "East US"
-    },
-    {
-        "title": "Azure Redis Cache",
-        "resource_name": "redis-cache-prod",
-        "description": "In-memory data store",
-        "icon": "database",
-        "status": "Running",
-        "region": "East US"
-    },
-    {
-        "title": "Azure IoT Hub",
-        "resource_name": "iot-hub-prod",
-        "description": "IoT device management and data",
-        "icon": "zap",
-        "status": "Running",
-        "region": "East US"
-    },
-    {
-        "title": "Azure Event Hubs",
-        "resource_name": "event-hub-prod",
-        "description": "Real-time data streaming",
-        "icon": "activity",
-        "status": "Running",
-        "region": "East US"
-    },
-    {
-        "title": "Azure Stream Analytics",
-        "resource_name": "stream-analytics-prod",
-        "description": "Real-time analytics processing",
-        "icon": "activity",
-        "status": "Running",
-        "region": "East US"
-    },
-    {
-        "title": "Azure Time Series Insights",
-        "resource_name": "tsi-prod-eastus",
-        "description": "Time series data storage and analysis",
-        "icon": "database",
-        "status": "Running",
-        "region": "East US"
-    },
-    {
-        "title": "Azure Digital Twins",
-        "resource_name": "digital-twins-prod",
-        "description": "Digital representation platform",
-        "icon": "cloud",
-        "status": "Running",
-        "region": "East US"
-    },
-    {
-        "title": "Azure Bastion",
-        "resource_name": "bastion-prod-eastus",
-        "description": "Secure remote access to VMs",
-        "icon": "lock",
-        "status": "Running",
-        "region": "East US"
-    },
-    {
-        "title": "Azure Firewall",
-        "resource_name": "firewall-prod-eastus",
-        "description": "Network security and threat protection",
-        "icon": "shield",
-        "status": "Running",
-        "region": "East US"
-    },
-    {
-        "title": "Azure DDoS Protection",
-        "resource_name": "ddos-protection-prod",
-        "description": "DDoS attack mitigation",
-        "icon": "shield",
-        "status": "Running",
-        "region": "East US"
-    },
-    {
-        "title": "Azure Front Door",
-        "resource_name": "front-door-prod",
-        "description": "Global load balancer and WAF",
-        "icon": "link",
-        "status": "Running",
-        "region": "East US"
-    },
-    {
-        "title": "Azure Traffic Manager",
-        "resource_name": "traffic-manager-prod",
-        "description": "DNS-based traffic management",
-        "icon": "network",
-        "status": "Running",
-        "region": "East US"
-    },
-    {
-        "title": "Azure Private Link",
-        "resource_name": "private-link-prod",
-        "description": "Private connectivity to Azure services",
-        "icon": "lock",
-        "status": "Running",
-        "region": "East US"
-    },
-    {
-        "title": "Azure Notification Hubs",
-        "resource_name": "notification-hub-prod",
-        "description": "Push notification platform",
-        "icon": "activity",
-        "status": "Running",
-        "region": "East US"
-    },
-    {
-        "title": "Azure Service Fabric",
-        "resource_name": "service-fabric-prod",
-        "description": "Distributed systems platform",
-        "icon": "boxes",
-        "status": "Running",
-        "region": "East US"
-    }
-]
+resource_list = ListSerializer(ResourceResponse)
+search_hits = ListSerializer(ResourceSearchHit)
+
+# Templates created by POST /seed/templates (the first entries of the catalog)
+SEED_TEMPLATE_COUNT = 12
+
+
+def _insert_templates(db: Session, user_id, template_ids) -> List[ResourceResponse]:
+    """Insert the given catalog entries for a user in one set-based statement"""
+    templates = get_catalog().rows
+    rows = [
+        {**templates[template_id], "user_id": user_id}
+        for template_id in template_ids
+        if 0 <= template_id < len(templates)
+    ]
+    created = bulk.insert_resources(db, rows)
+    search_index.index_resources(db.connection(), created)
+    db.commit()
+    return [_resource_response(r) for r in created]
+
+
+def _resource_response(r) -> ResourceResponse:
+    return ResourceResponse(
+        id=r.id,
+        user_id=str(r.user_id),
+        icon=r.icon,
+        title=r.title,
+        resource_name=r.resource_name,
+        description=r.description,
+        status=r.status,
+        region=r.region,
+        created_at=r.created_at,
+        updated_at=r.updated_at
+    )
 
 
 @router.get("/templates")
-def get_templates():
+def get_templates(request: Request):
     """Get list of available template resources"""
-    return [{"id": i, **t} for i, t in enumerate(TEMPLATE_RESOURCES)]
+    catalog = get_catalog()
+    encoding, body = catalog.negotiate(request.headers.get("accept-encoding", ""))
+    etag = catalog.etags[encoding]
+    headers = {
+        "ETag": etag,
+        "Cache-Control": f"public, max-age={settings.TEMPLATE_CACHE_MAX_AGE_SECONDS}",
+        "Vary": "Accept-Encoding"
+    }
+    if etag_matches(request, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    
+    if encoding:
+        headers["Content-Encoding"] = encoding
+    return Response(content=body, media_type="application/json", headers=headers)
 
 
 @router.post("/import-templates", response_model=List[ResourceResponse], status_code=status.HTTP_201_CREATED)
@@ -379,74 +99,257 @@ def import_selected_templates(
             detail="Only admins can import resources"
         )
     
-    created_resources = []
-    for template_id in template_ids:
-        if 0 <= template_id < len(TEMPLATE_RESOURCES):
-            template = TEMPLATE_RESOURCES[template_id]
-            resource = Resource(
-                user_id=current_user.id,
-                title=template["title"],
-                resource_name=template["resource_name"],
-                description=template["description"],
-                icon=template["icon"],
-                status=template["status"],
-                region=template["region"]
+    return _insert_templates(db, current_user.id, template_ids)
+
+
+# Sort keys accepted by GET /api/resources/ (prefix with "-" for descending)
+RESOURCE_SORT_COLUMNS = {
+    "created_at": Resource.created_at,
+    "updated_at": Resource.updated_at,
+    "title": Resource.title,
+}
+
+
+def _encode_cursor(sort: str, value, resource_id: int) -> str:
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    raw = json.dumps([sort, value, resource_id]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str, sort: str) -> tuple:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        cursor_sort, value, resource_id = json.loads(base64.urlsafe_b64decode(padded))
+        if cursor_sort != sort:
+            raise ValueError("cursor was issued for a different sort order")
+        if value is not None and sort.lstrip("-") != "title":
+            value = datetime.fromisoformat(value)
+        return value, int(resource_id)
+    except (ValueError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+
+
+def _after_cursor(sort_column, value, last_id: int, descending: bool):
+    """Keyset predicate for rows after (value, last_id)
+
+    created_at and updated_at are nullable. SQLite and Azure SQL both sort
+    NULL first ascending and last descending, so a NULL cursor value is
+    matched with IS NULL and the NULL group is placed explicitly.
+    """
+    if descending:
+        if value is None:
+            return and_(sort_column.is_(None), Resource.id < last_id)
+        return or_(
+            sort_column < value,
+            and_(sort_column == value, Resource.id < last_id),
+            sort_column.is_(None)
+        )
+    if value is None:
+        return or_(
+            and_(sort_column.is_(None), Resource.id > last_id),
+            sort_column.is_not(None)
+        )
+    return or_(
+        sort_column > value,
+        and_(sort_column == value, Resource.id > last_id)
+    )
+
+
+def _escape_like(value: str) -> str:
+    return (
+        value.replace("\\", "\\\\")
+        .replace("%", "\\%")
+        .replace("_", "\\_")
+        .replace("[", "\\[")
+    )
+
+
+@router.get("/", response_model=List[ResourceResponse])
+async def get_user_resources(
+    request: Request,
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=settings.RESOURCES_MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    status_filter: Optional[str] = Query(None, alias="status"),
+    region: Optional[str] = None,
+    icon: Optional[str] = None,
+    title_prefix: Optional[str] = Query(None, max_length=100),
+    sort: str = Query("created_at", pattern="^-?(created_at|updated_at|title)$"),
+    current_user: TokenPrincipal = Depends(get_token_principal),
+    db=Depends(get_async_db)
+):
+    """Get resources - admin sees their own, others see admin's resources
+
+    Without ``limit`` every matching row is returned (legacy behaviour). With
+    ``limit`` results are keyset-paginated on (sort column, id); the cursor for
+    the next page is returned in the ``X-Next-Cursor`` header. The ETag is
+    derived from the owner's collection version, so an unchanged collection
+    answers If-None-Match with 304 before any rows are loaded.
+    """
+    from app.models.user import UserRole
+    
+    if current_user.role == UserRole.admin:
+        # Admin sees their own resources
+        owner_id = current_user.id
+    else:
+        # Regular users see the resource owner's (cached designated admin) resources
+        owner_id = await db.run_sync(resolve_resource_owner_id)
+        if owner_id is None:
+            return []
+    
+    # Collection version: any insert, update or delete changes one of these
+    version = await db.execute(
+        select(func.count(Resource.id), func.max(Resource.updated_at), func.max(Resource.id))
+        .where(Resource.user_id == owner_id)
+    )
+    row_count, last_updated, max_id = version.one()
+    etag = make_etag("resources", owner_id, row_count, last_updated, max_id, request.url.query)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    set_etag(response, etag)
+    
+    query = select_for(Resource, ResourceResponse).where(Resource.user_id == owner_id)
+    if status_filter:
+        query = query.where(Resource.status == status_filter)
+    if region:
+        query = query.where(Resource.region == region)
+    if icon:
+        query = query.where(Resource.icon == icon)
+    if title_prefix:
+        query = query.where(Resource.title.like(f"{_escape_like(title_prefix)}%", escape="\\"))
+    
+    descending = sort.startswith("-")
+    sort_column = RESOURCE_SORT_COLUMNS[sort.lstrip("-")]
+    
+    if cursor:
+        value, last_id = _decode_cursor(cursor, sort)
+        query = query.where(_after_cursor(sort_column, value, last_id, descending))
+    
+    if descending:
+        query = query.order_by(sort_column.desc(), Resource.id.desc())
+    else:
+        query = query.order_by(sort_column.asc(), Resource.id.asc())
+    
+    if limit is not None:
+        # Fetch one extra row to learn whether another page exists
+        resources = (await db.execute(query.limit(limit + 1))).all()
+        if len(resources) > limit:
+            resources = resources[:limit]
+            last = resources[-1]
+            response.headers["X-Next-Cursor"] = _encode_cursor(
+                sort, getattr(last, sort_column.key), last.id
             )
-            db.add(resource)
-            db.flush()
-            
-            created_resources.append(ResourceResponse(
-                id=resource.id,
-                user_id=str(resource.user_id),
-                icon=resource.icon,
-                title=resource.title,
-                resource_name=resource.resource_name,
-                description=resource.description,
-                status=resource.status,
-                region=resource.region,
-                created_at=resource.created_at,
-                updated_at=resource.updated_at
-            ))
+    else:
+        resources = (await db.execute(query)).all()
     
-    db.commit()
-    return created_resources
+    return resource_list.response(resources, response)
 
 
-@router.get("/", response_model=List[ResourceResponse])
-def get_user_resources(
-    current_user: User = Depends(get_current_user),
+@router.get("/search", response_model=List[ResourceSearchHit])
+def search_resources(
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(20, ge=1, le=settings.RESOURCES_MAX_PAGE_SIZE),
+    current_user: TokenPrincipal = Depends(get_token_principal),
     db: Session = Depends(get_db)
 ):
-    """Get all resources - admin sees their own, others see admin's resources"""
+    """Search the visible resources' title, resource_name and description
+
+    Every word of ``q`` must start a word in one of the fields (case and
+    accents ignored). Hits come best first with a ``score`` and
+    ``highlights``, the fields HTML-escaped with matches wrapped in <mark>.
+    """
     from app.models.user import UserRole
     
     if current_user.role == UserRole.admin:
-        # Admin sees their own resources
-        resources = db.query(Resource).filter(Resource.user_id == current_user.id).all()
+        owner_id = current_user.id
     else:
-        # Regular users see the admin's resources
-        admin = db.query(User).filter(User.role == UserRole.admin).first()
-        if admin:
-            resources = db.query(Resource).filter(Resource.user_id == admin.id).all()
-        else:
-            resources = []
+        owner_id = resolve_resource_owner_id(db)
     
-    # Convert UUID to string for response
-    return [
-        ResourceResponse(
-            id=r.id,
-            user_id=str(r.user_id),
-            icon=r.icon,
-            title=r.title,
-            resource_name=r.resource_name,
-            description=r.description,
-            status=r.status,
-            region=r.region,
-            created_at=r.created_at,
-            updated_at=r.updated_at
+    return search_hits.response(search_index.search(db.connection(), owner_id, q, limit))
+
+
+@router.get("/export")
+def export_resources(
+    export_format: str = Query("ndjson", alias="format", pattern="^(ndjson|csv)$"),
+    compress: bool = Query(False, alias="gzip"),
+    status_filter: Optional[str] = Query(None, alias="status"),
+    region: Optional[str] = None,
+    icon: Optional[str] = None,
+    current_user: TokenPrincipal = Depends(get_token_principal),
+    db: Session = Depends(get_db)
+):
+    """Stream every visible resource as NDJSON or CSV, in id order
+
+    Sees the same resources as GET /api/resources/, but memory stays flat
+    however many rows there are. ``gzip=true`` downloads a .gz file.
+    """
+    from app.models.user import UserRole
+    
+    if current_user.role == UserRole.admin:
+        owner_id = current_user.id
+    else:
+        owner_id = resolve_resource_owner_id(db)
+    # The export streams on its own connection; give this one back first
+    db.rollback()
+    
+    # No resource owner yet: IS NULL matches nothing, like the empty list
+    owner = str(owner_id) if owner_id is not None else None
+    query = select_for(Resource, ResourceResponse).where(Resource.user_id == owner)
+    if status_filter:
+        query = query.where(Resource.status == status_filter)
+    if region:
+        query = query.where(Resource.region == region)
+    if icon:
+        query = query.where(Resource.icon == icon)
+    return export_response(query.order_by(Resource.id), export_format, "resources", compress)
+
+
+@router.post("/import", response_model=ResourceImportJobResponse, status_code=status.HTTP_202_ACCEPTED)
+def import_resources(
+    background_tasks: BackgroundTasks,
+    file: UploadFile = File(...),
+    import_format: Optional[str] = Query(None, alias="format", pattern="^(ndjson|csv)$"),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Import a CSV or NDJSON file of resources in the background (admin only)
+
+    Rows use the POST /api/resources/ fields (CSV: one header row naming them).
+    Returns the queued job at once; poll GET /import/{job_id} for progress.
+    Invalid rows are skipped and reported with their line numbers.
+    """
+    _require_bulk_admin(current_user, "import")
+    
+    import_format = import_format or resource_import.detect_format(file.filename, file.content_type)
+    if import_format is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Unknown file format; upload a .csv or .ndjson file or pass ?format="
         )
-        for r in resources
-    ]
+    
+    path, size = resource_import.spool_upload(file.file)
+    job = resource_import.create_job(db, current_user.id, file.filename, import_format, size)
+    background_tasks.add_task(resource_import.run_import, job.id, path, current_user.id, import_format)
+    return job
+
+
+@router.get("/import/{job_id}", response_model=ResourceImportJobResponse)
+def get_import_job(
+    job_id: int,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Progress and row errors of a resource import"""
+    _require_bulk_admin(current_user, "import")
+    
+    job = db.query(ResourceImportJob).filter(ResourceImportJob.id == job_id).first()
+    if not job:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Import job not found")
+    return job
 
 
 @router.post("/", response_model=ResourceResponse, status_code=status.HTTP_201_CREATED)
@@ -479,6 +382,8 @@ def create_resource(
         resource.created_at = resource_data.created_at
     
     db.add(resource)
+    db.flush()
+    search_index.index_resources(db.connection(), [resource])
     db.commit()
     db.refresh(resource)
     
@@ -533,6 +438,7 @@ def update_resource(
     if resource_data.created_at:
         resource.created_at = resource_data.created_at
     
+    search_index.index_resources(db.connection(), [resource])
     db.commit()
     db.refresh(resource)
     
@@ -567,135 +473,7 @@ def seed_template_resources(
             detail="Only admins can seed resources"
         )
     
-    # Template resources - Azure specific
-    templates = [
-        {
-            "title": "Azure Virtual Machine",
-            "resource_name": "vm-prod-eastus-01",
-            "description": "Windows/Linux VM for compute workloads",
-            "icon": "server",
-            "status": "Running",
-            "region": "East US"
-        },
-        {
-            "title": "Azure App Service",
-            "resource_name": "app-service-api-prod",
-            "description": "Managed web app hosting",
-            "icon": "globe",
-            "status": "Running",
-            "region": "East US"
-        },
-        {
-            "title": "Azure SQL Database",
-            "resource_name": "sqldb-prod-eastus",
-            "description": "Managed relational database",
-            "icon": "database",
-            "status": "Running",
-            "region": "East US"
-        },
-        {
-            "title": "Azure Cosmos DB",
-            "resource_name": "cosmosdb-main",
-            "description": "NoSQL distributed database",
-            "icon": "box",
-            "status": "Running",
-            "region": "East US"
-        },
-        {
-            "title": "Azure Storage Account",
-            "resource_name": "stgacct-prod-eastus",
-            "description": "Blob, Table, Queue storage",
-            "icon": "hard_drive",
-            "status": "Running",
-            "region": "East US"
-        },
-        {
-            "title": "Azure Key Vault",
-            "resource_name": "keyvault-prod-eastus",
-            "description": "Secrets and certificate management",
-            "icon": "lock",
-            "status": "Running",
-            "region": "East US"
-        },
-        {
-            "title": "Azure Load Balancer",
-            "resource_name": "lb-frontend-prod",
-            "description": "Network load balancing",
-            "icon": "network",
-            "status": "Running",
-            "region": "East US"
-        },
-        {
-            "title": "Azure API Management",
-            "resource_name": "apim-prod-eastus",
-            "description": "API gateway and management",
-            "icon": "link",
-            "status": "Running",
-            "region": "East US"
-        },
-        {
-            "title": "Azure Container Registry",
-            "resource_name": "acr-prod-eastus",
-            "description": "Docker container image repository",
-            "icon": "container",
-            "status": "Running",
-            "region": "East US"
-        },
-        {
-            "title": "Azure Functions",
-            "resource_name": "func-app-serverless",
-            "description": "Serverless compute functions",
-            "icon": "zap",
-            "status": "Running",
-            "region": "East US"
-        },
-        {
-            "title": "Azure Service Bus",
-            "resource_name": "servicebus-prod",
-            "description": "Message queuing and pub/sub",
-            "icon": "activity",
-            "status": "Running",
-            "region": "East US"
-        },
-        {
-            "title": "Azure Application Insights",
-            "resource_name": "appinsights-prod",
-            "description": "Application monitoring and analytics",
-            "icon": "shield",
-            "status": "Running",
-            "region": "East US"
-        }
-    ]
-    
-    created_resources = []
-    for template in templates:
-        resource = Resource(
-            user_id=current_user.id,
-            title=template["title"],
-            resource_name=template["resource_name"],
-            description=template["description"],
-            icon=template["icon"],
-            status=template["status"],
-            region=template["region"]
-        )
-        db.add(resource)
-        db.flush()
-        
-        created_resources.append(ResourceResponse(
-            id=resource.id,
-            user_id=str(resource.user_id),
-            icon=resource.icon,
-            title=resource.title,
-            resource_name=resource.resource_name,
-            description=resource.description,
-            status=resource.status,
-            region=resource.region,
-            created_at=resource.created_at,
-            updated_at=resource.updated_at
-        ))
-    
-    db.commit()
-    return created_resources
+    return _insert_templates(db, current_user.id, range(SEED_TEMPLATE_COUNT))
 
 
 @router.delete("/{resource_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -722,6 +500,143 @@ def delete_resource(
             detail="Resource not found"
         )
     
+    search_index.remove_resources(db.connection(), [resource.id])
     db.delete(resource)
     db.commit()
     return None
+
+
+def _require_bulk_admin(current_user: User, action: str) -> None:
+    from app.models.user import UserRole
+    
+    if current_user.role != UserRole.admin:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail=f"Only admins can {action} resources"
+        )
+
+
+def _check_batch_size(count: int) -> None:
+    if count > settings.RESOURCES_BULK_MAX_ITEMS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Batch too large: {count} items (max {settings.RESOURCES_BULK_MAX_ITEMS})"
+        )
+
+
+def _bulk_response(results: List[BulkItemResult]) -> BulkResponse:
+    failed = sum(1 for result in results if result.error)
+    return BulkResponse(succeeded=len(results) - failed, failed=failed, results=results)
+
+
+@router.post("/bulk", response_model=BulkResponse, status_code=status.HTTP_201_CREATED)
+def bulk_create_resources(
+    items: List[ResourceCreate],
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Create many resources in one transaction - admin only"""
+    _require_bulk_admin(current_user, "create")
+    _check_batch_size(len(items))
+    
+    rows = []
+    for item in items:
+        row = item.model_dump(exclude={"created_at"})
+        row["user_id"] = current_user.id
+        if item.created_at:
+            row["created_at"] = item.created_at
+        rows.append(row)
+    
+    try:
+        created = bulk.insert_resources(db, rows)
+        search_index.index_resources(db.connection(), created)
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        print(f"⚠️  Bulk create failed: {str(e)[:200]}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to create resources"
+        )
+    
+    return _bulk_response([
+        BulkItemResult(index=i, id=r.id, status="created", resource=_resource_response(r))
+        for i, r in enumerate(created)
+    ])
+
+
+@router.patch("/bulk", response_model=BulkResponse)
+def bulk_update_resources(
+    patches: List[ResourcePatch],
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Apply many partial updates in one transaction - admin only
+
+    Unknown ids are reported per item and do not abort the batch.
+    """
+    _require_bulk_admin(current_user, "update")
+    _check_batch_size(len(patches))
+    
+    try:
+        existing = bulk.existing_resource_ids(db, [patch.id for patch in patches])
+        now = datetime.utcnow()
+        rows = [
+            {**patch.model_dump(exclude_unset=True), "updated_at": now}
+            for patch in patches if patch.id in existing
+        ]
+        bulk.update_resources(db, rows)
+        updated = bulk.load_resources(db, existing)
+        search_index.index_resources(db.connection(), updated.values())
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        print(f"⚠️  Bulk update failed: {str(e)[:200]}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to update resources"
+        )
+    
+    results = []
+    for i, patch in enumerate(patches):
+        if patch.id in existing:
+            results.append(BulkItemResult(
+                index=i, id=patch.id, status="updated",
+                resource=_resource_response(updated[patch.id])
+            ))
+        else:
+            results.append(BulkItemResult(
+                index=i, id=patch.id, status="not_found", error="Resource not found"
+            ))
+    return _bulk_response(results)
+
+
+@router.post("/bulk/delete", response_model=BulkResponse)
+def bulk_delete_resources(
+    request_body: ResourceBulkDelete,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Delete many resources in one transaction - admin only"""
+    _require_bulk_admin(current_user, "delete")
+    _check_batch_size(len(request_body.ids))
+    
+    try:
+        existing = bulk.existing_resource_ids(db, request_body.ids)
+        bulk.delete_resources(db, existing)
+        search_index.remove_resources(db.connection(), existing)
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        print(f"⚠️  Bulk delete failed: {str(e)[:200]}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to delete resources"
+        )
+    
+    return _bulk_response([
+        BulkItemResult(index=i, id=resource_id, status="deleted")
+        if resource_id in existing
+        else BulkItemResult(index=i, id=resource_id, status="not_found", error="Resource not found")
+        for i, resource_id in enumerate(request_body.ids)
+    ])
@@ -0,0 +1,53 @@
+"""Response serialization shared by the routers.
+
+``JSON_RESPONSE_CLASS`` is the app's default response class: orjson when it
+is installed, the standard library otherwise.
+
+List endpoints use ``ListSerializer`` instead of building one response model
+per row and letting FastAPI validate the list again through
+``response_model``. Rows (ORM objects or column tuples) are validated once by
+a cached TypeAdapter and written to JSON bytes by pydantic-core, skipping
+``jsonable_encoder``. Keep ``response_model`` on the route for the OpenAPI
+schema; it is not applied to a returned Response.
+"""
+from typing import Generic, Iterable, List, Optional, Type, TypeVar
+from fastapi import Response
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel, TypeAdapter
+from sqlalchemy.engine import Row
+
+try:
+    import orjson
+    from fastapi.responses import ORJSONResponse as JSON_RESPONSE_CLASS
+except ImportError:
+    orjson = None
+    JSON_RESPONSE_CLASS = JSONResponse
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+
+class ListSerializer(Generic[ModelT]):
+    def __init__(self, schema: Type[ModelT]):
+        self.schema = schema
+        self._adapter = TypeAdapter(List[schema])
+
+    def validate(self, rows: Iterable) -> List[ModelT]:
+        rows = list(rows)
+        if rows and isinstance(rows[0], Row):
+            # Column tuples validate faster as dicts than through attribute lookups
+            return self._adapter.validate_python([row._asdict() for row in rows])
+        return self._adapter.validate_python(rows, from_attributes=True)
+
+    def dump(self, rows: Iterable) -> bytes:
+        """JSON array of ``schema`` for the given rows"""
+        return self._adapter.dump_json(self.validate(rows))
+
+    def response(self, rows: Iterable, response: Optional[Response] = None,
+                 status_code: int = 200) -> Response:
+        """JSON response for the rows, keeping headers set on the injected ``response``"""
+        serialized = Response(content=self.dump(rows), media_type="application/json", status_code=status_code)
+        if response is not None:
+            serialized.raw_headers.extend(
+                (name, value) for name, value in response.raw_headers if name != b"content-length"
+            )
+        return serialized
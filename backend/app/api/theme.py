@@ -1,30 +1,70 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from sqlalchemy import select
 from sqlalchemy.orm import Session
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
+from datetime import datetime
 import json
+from app.core.cache import TTLCache
+from app.core.config import settings
 from app.db.database import get_db
-from app.schemas.user import ThemeConfigResponse, ThemeConfigUpdate
-from app.models.user import ThemeConfig, User
-from app.api.deps import get_current_admin_user, get_current_user
+from app.db.async_database import get_async_db
+from app.db.cache_versions import bump_cache_version
+from app.db import global_theme
+from app.schemas.user import ThemeConfigResponse, ThemeConfigUpdate, TokenPrincipal, UserThemeResponse
+from app.models.user import ThemeConfig, User, UserTheme
+from app.api.deps import get_current_admin_user, get_current_user, get_token_principal
+from app.api.etag import ETAG_CACHE_CONTROL, etag_matches, make_etag, not_modified, set_etag
 
 router = APIRouter()
 
+# (updated_at, ETag, parsed theme) keyed by user id. Every read checks the
+# row's updated_at, so a save on any worker is seen by the next request.
+theme_cache = TTLCache(
+    max_entries=settings.THEME_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.THEME_CACHE_TTL_SECONDS
+)
+
+
+def _parse_theme(payload: Optional[str]) -> Dict[str, Any]:
+    if not payload:
+        return {}
+    try:
+        theme = json.loads(payload)
+    except json.JSONDecodeError:
+        return {}
+    return theme if isinstance(theme, dict) else {}
+
+
+def _encode_theme(theme_data: Dict[str, Any]) -> str:
+    return json.dumps(theme_data, separators=(",", ":"))
+
 
 @router.get("/")
-def get_user_theme(
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+async def get_user_theme(
+    request: Request,
+    response: Response,
+    current_user: TokenPrincipal = Depends(get_token_principal),
+    db=Depends(get_async_db)
 ):
-    config_key = f"user_theme_{current_user.id}"
-    config = db.query(ThemeConfig).filter(ThemeConfig.config_key == config_key).first()
-    
-    if config and config.config_value:
-        try:
-            return json.loads(config.config_value)
-        except json.JSONDecodeError:
-            return {}
+    cached = theme_cache.get(current_user.id)
+    if cached is not None:
+        result = await db.execute(select(UserTheme.updated_at).where(UserTheme.user_id == current_user.id))
+        if result.scalar() != cached[0]:
+            cached = None
+    if cached is None:
+        result = await db.execute(
+            select(UserTheme.updated_at, UserTheme.payload).where(UserTheme.user_id == current_user.id)
+        )
+        updated_at, payload = result.first() or (None, None)
+        # ETag over the stored JSON text, so a 304 never needs the parsed theme
+        cached = (updated_at, make_etag("theme", current_user.id, payload or ""), _parse_theme(payload))
+        theme_cache.set(current_user.id, cached)
     
-    return {}
+    _, etag, theme = cached
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    set_etag(response, etag)
+    return theme
 
 
 @router.put("/")
@@ -33,29 +73,70 @@ def save_user_theme(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    config_key = f"user_theme_{current_user.id}"
-    theme_json = json.dumps(theme_data)
+    payload = _encode_theme(theme_data)
     
-    config = db.query(ThemeConfig).filter(ThemeConfig.config_key == config_key).first()
-    
-    if not config:
-        config = ThemeConfig(
-            config_key=config_key,
-            config_value=theme_json
-        )
-        db.add(config)
+    user_id = str(current_user.id)
+    # Set here rather than by the database: CURRENT_TIMESTAMP has whole-second
+    # precision on SQLite, and readers compare updated_at to spot a change
+    updated_at = datetime.utcnow()
+    user_theme = db.get(UserTheme, user_id)
+    if not user_theme:
+        db.add(UserTheme(user_id=user_id, payload=payload, updated_at=updated_at))
     else:
-        config.config_value = theme_json
+        user_theme.payload = payload
+        user_theme.updated_at = updated_at
     
     db.commit()
+    theme_cache.invalidate(user_id)
     return theme_data
 
 
+@router.get("/global")
+async def get_global_theme(
+    request: Request,
+    db=Depends(get_async_db)
+):
+    """All global theme keys as one pre-serialized JSON object (no auth, like /api/resources/templates)"""
+    bundle = global_theme.fresh_bundle() or await db.run_sync(global_theme.load_bundle)
+    if etag_matches(request, bundle.etag):
+        return not_modified(bundle.etag)
+    return Response(
+        content=bundle.body,
+        media_type="application/json",
+        headers={"ETag": bundle.etag, "Cache-Control": ETAG_CACHE_CONTROL}
+    )
+
+
+@router.get("/users", response_model=List[UserThemeResponse])
+def list_user_themes(
+    response: Response,
+    limit: int = Query(100, ge=1, le=500),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor value from the previous page"),
+    current_admin = Depends(get_current_admin_user),
+    db: Session = Depends(get_db)
+):
+    """Per-user themes for admins, ordered by user id (keyset paginated)"""
+    query = db.query(UserTheme).order_by(UserTheme.user_id)
+    if cursor is not None:
+        query = query.filter(UserTheme.user_id > cursor)
+    rows = query.limit(limit + 1).all()
+    
+    if len(rows) > limit:
+        rows = rows[:limit]
+        response.headers["X-Next-Cursor"] = str(rows[-1].user_id)
+    
+    return [
+        UserThemeResponse(user_id=row.user_id, theme=_parse_theme(row.payload), updated_at=row.updated_at)
+        for row in rows
+    ]
+
+
 @router.get("/all", response_model=List[ThemeConfigResponse])
 def get_all_theme_configs(
     current_admin = Depends(get_current_admin_user),
     db: Session = Depends(get_db)
 ):
+    # Global keys only; per-user themes are listed by GET /users
     configs = db.query(ThemeConfig).all()
     return configs
 
@@ -79,6 +160,9 @@ def update_theme_config(
     else:
         config.config_value = config_update.config_value
     
+    # Every worker rebuilds its global theme bundle within one poll interval
+    bump_cache_version(db, global_theme.GLOBAL_THEME_CACHE)
     db.commit()
+    global_theme.invalidate_local()
     db.refresh(config)
     return config
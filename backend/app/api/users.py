@@ -1,17 +1,36 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from sqlalchemy.orm import Session
 from typing import List
 from app.db.database import get_db
+from app.db.projections import select_for
 from app.schemas.user import UserResponse, UserUpdate, PasswordResetRequest
 from app.models.user import User
-from app.api.deps import get_current_user, get_current_admin_user
+from app.api.deps import get_current_user, get_current_admin_user, invalidate_principal
+from app.api.etag import etag_matches, make_etag, not_modified, set_etag
+from app.api.serialization import ListSerializer
 from app.core.security import get_password_hash
+from app.db.token_versions import bump_token_version, forget_token_version
 
 router = APIRouter()
 
+user_list = ListSerializer(UserResponse)
+
 
 @router.get("/me", response_model=UserResponse)
-def get_current_user_profile(current_user: User = Depends(get_current_user)):
+def get_current_user_profile(
+    request: Request,
+    response: Response,
+    current_user: User = Depends(get_current_user)
+):
+    etag = make_etag(
+        "me", current_user.id, current_user.email, current_user.display_name,
+        current_user.tagline, current_user.bio, current_user.avatar_url,
+        current_user.role.value, current_user.created_at
+    )
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    set_etag(response, etag)
+    
     return UserResponse(
         id=str(current_user.id),
         email=current_user.email,
@@ -41,6 +60,7 @@ def update_current_user_profile(
     
     db.commit()
     db.refresh(current_user)
+    invalidate_principal(current_user.email)
     return UserResponse(
         id=str(current_user.id),
         email=current_user.email,
@@ -58,20 +78,8 @@ def get_all_users(
     current_admin: User = Depends(get_current_admin_user),
     db: Session = Depends(get_db)
 ):
-    users = db.query(User).all()
-    return [
-        UserResponse(
-            id=str(user.id),
-            email=user.email,
-            display_name=user.display_name,
-            tagline=user.tagline,
-            bio=user.bio,
-            avatar_url=user.avatar_url,
-            role=user.role,
-            created_at=user.created_at
-        )
-        for user in users
-    ]
+    users = db.execute(select_for(User, UserResponse)).all()
+    return user_list.response(users)
 
 
 @router.get("/{user_id}", response_model=UserResponse)
@@ -106,6 +114,9 @@ def reset_user_password(
     db: Session = Depends(get_db)
 ):
     """Admin can reset any user's password"""
+    # Hash before touching the database so no connection is held during bcrypt
+    hashed_password = get_password_hash(password_reset.new_password)
+    
     user = db.query(User).filter(User.id == user_id).first()
     if not user:
         raise HTTPException(
@@ -114,7 +125,10 @@ def reset_user_password(
         )
     
     # Update password
-    user.hashed_password = get_password_hash(password_reset.new_password)
+    user.hashed_password = hashed_password
+    bump_token_version(db, user.id)
     db.commit()
+    forget_token_version(user.id)
+    invalidate_principal(user.email)
     
     return {"message": f"Password reset successfully for user {user.email}"}
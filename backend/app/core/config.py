@@ -18,6 +18,35 @@ class Settings:
         self.AZURE_SQL_DATABASE = os.getenv("AZURE_SQL_DATABASE", "")
         self.AZURE_SQL_USERNAME = os.getenv("AZURE_SQL_USERNAME", "")
         self.AZURE_SQL_PASSWORD = os.getenv("AZURE_SQL_PASSWORD", "")
+        # Optional SQLite file used when Azure SQL is not configured (default: data/app.db)
+        self.SQLITE_PATH = os.getenv("SQLITE_PATH", "")
+        
+        # Server Configuration (mirrors run.py)
+        self.APP_ENV = os.getenv("APP_ENV", "development")
+        self.UVICORN_WORKERS = int(os.getenv("UVICORN_WORKERS", "4"))
+        
+        # Connection Pool Configuration
+        # DB_MAX_CONNECTIONS is the connection budget for the whole deployment; when set
+        # and DB_POOL_SIZE/DB_MAX_OVERFLOW are not, it is split across the uvicorn workers.
+        self.DB_MAX_CONNECTIONS = int(os.getenv("DB_MAX_CONNECTIONS", "0"))
+        self.DB_POOL_SIZE = os.getenv("DB_POOL_SIZE", "")
+        self.DB_MAX_OVERFLOW = os.getenv("DB_MAX_OVERFLOW", "")
+        self.DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+        # Azure SQL drops idle connections after ~30 minutes; recycle well before that
+        self.DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1500"))
+        self.DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+        self.DB_POOL_USE_LIFO = os.getenv("DB_POOL_USE_LIFO", "true").lower() == "true"
+        
+        # Async Database Path (aiosqlite for SQLite; Azure SQL always uses the threaded adapter)
+        self.ASYNC_DB_ENABLED = os.getenv("ASYNC_DB_ENABLED", "false").lower() == "true"
+        # Run schema checks and the admin seed in each worker's startup event;
+        # run.py sets this to false for its workers after bootstrapping once
+        self.DB_BOOTSTRAP_ON_STARTUP = os.getenv("DB_BOOTSTRAP_ON_STARTUP", "true").lower() == "true"
+        # Schema migrations: rows per backfill batch, ONLINE index builds on Azure SQL
+        self.MIGRATIONS_BACKFILL_BATCH_SIZE = int(os.getenv("MIGRATIONS_BACKFILL_BATCH_SIZE", "1000"))
+        # Pause between backfill chunks so request traffic gets the locks and I/O
+        self.MIGRATIONS_BACKFILL_SLEEP_MS = float(os.getenv("MIGRATIONS_BACKFILL_SLEEP_MS", "50"))
+        self.MIGRATIONS_ONLINE_INDEXES = os.getenv("MIGRATIONS_ONLINE_INDEXES", "true").lower() == "true"
         
         # Security Configuration
         self.SECRET_KEY = os.getenv("SECRET_KEY", "development-secret-key-change-in-production")
@@ -27,6 +56,54 @@ class Settings:
         # CORS Configuration
         self.CORS_ALLOW_ORIGINS = os.getenv("CORS_ALLOW_ORIGINS", "*")
         self.FRONTEND_URL = os.getenv("FRONTEND_URL", "http://localhost:5000")
+        
+        # Principal Cache Configuration (set TTL to 0 to disable)
+        self.PRINCIPAL_CACHE_TTL_SECONDS = float(os.getenv("PRINCIPAL_CACHE_TTL_SECONDS", "30"))
+        self.PRINCIPAL_CACHE_MAX_ENTRIES = int(os.getenv("PRINCIPAL_CACHE_MAX_ENTRIES", "1024"))
+        # Upper bound for another worker to notice revoked tokens
+        self.TOKEN_VERSION_CACHE_TTL_SECONDS = float(os.getenv("TOKEN_VERSION_CACHE_TTL_SECONDS", "5"))
+        # Parsed per-user themes; each read re-checks the row's updated_at
+        self.THEME_CACHE_TTL_SECONDS = float(os.getenv("THEME_CACHE_TTL_SECONDS", "10"))
+        self.THEME_CACHE_MAX_ENTRIES = int(os.getenv("THEME_CACHE_MAX_ENTRIES", "2048"))
+        # Workers re-check the global theme version stamp at most this often
+        self.THEME_GLOBAL_POLL_SECONDS = float(os.getenv("THEME_GLOBAL_POLL_SECONDS", "2"))
+        
+        # Resource Listing Configuration
+        self.RESOURCES_MAX_PAGE_SIZE = int(os.getenv("RESOURCES_MAX_PAGE_SIZE", "500"))
+        self.RESOURCE_OWNER_CACHE_TTL_SECONDS = float(os.getenv("RESOURCE_OWNER_CACHE_TTL_SECONDS", "60"))
+        self.RESOURCES_BULK_MAX_ITEMS = int(os.getenv("RESOURCES_BULK_MAX_ITEMS", "500"))
+        # Template catalog data file (default: app/core/resource_templates.json)
+        self.TEMPLATE_CATALOG_PATH = os.getenv("TEMPLATE_CATALOG_PATH", "")
+        self.TEMPLATE_CACHE_MAX_AGE_SECONDS = int(os.getenv("TEMPLATE_CACHE_MAX_AGE_SECONDS", "3600"))
+        # Rows fetched and encoded per chunk by the streaming export endpoints
+        self.EXPORT_CHUNK_ROWS = int(os.getenv("EXPORT_CHUNK_ROWS", "1000"))
+        # Background CSV/NDJSON imports: rows validated and committed per batch,
+        # row errors kept per job, and where uploads are spooled (default: system temp dir)
+        self.IMPORT_BATCH_ROWS = int(os.getenv("IMPORT_BATCH_ROWS", "1000"))
+        self.IMPORT_MAX_ERRORS = int(os.getenv("IMPORT_MAX_ERRORS", "1000"))
+        self.IMPORT_UPLOAD_DIR = os.getenv("IMPORT_UPLOAD_DIR", "")
+        
+        # Password Hashing Pool Configuration
+        # Executor: thread (default), process, or inline (no pool, no admission control)
+        self.PASSWORD_HASH_EXECUTOR = os.getenv("PASSWORD_HASH_EXECUTOR", "thread")
+        # 0 = one worker per CPU core
+        self.PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", "0")) or None
+        self.PASSWORD_HASH_QUEUE_LIMIT = int(os.getenv("PASSWORD_HASH_QUEUE_LIMIT", "16"))
+        self.PASSWORD_HASH_RETRY_AFTER_SECONDS = int(os.getenv("PASSWORD_HASH_RETRY_AFTER_SECONDS", "2"))
+        
+        # Request Metrics Configuration
+        self.METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() == "true"
+        self.METRICS_SERVER_TIMING = os.getenv("METRICS_SERVER_TIMING", "true").lower() == "true"
+        # Comma-separated client networks allowed to scrape GET /metrics (loopback
+        # only: behind a reverse proxy every client looks like a private address)
+        self.METRICS_ALLOWED_NETWORKS = os.getenv("METRICS_ALLOWED_NETWORKS", "127.0.0.0/8,::1/128")
+        # Scrapers sending "Authorization: Bearer <token>" are allowed from anywhere
+        self.METRICS_TOKEN = os.getenv("METRICS_TOKEN", "")
+        
+        # Query Auditor (development/CI): N+1 warnings and slow query log
+        self.QUERY_AUDIT_ENABLED = os.getenv("QUERY_AUDIT_ENABLED", "false").lower() == "true"
+        self.QUERY_AUDIT_REPEAT_THRESHOLD = int(os.getenv("QUERY_AUDIT_REPEAT_THRESHOLD", "5"))
+        self.QUERY_AUDIT_SLOW_MS = float(os.getenv("QUERY_AUDIT_SLOW_MS", "100"))
     
     @property
     def DATABASE_URL(self) -> str:
@@ -38,12 +115,35 @@ class Settings:
             f"@{self.AZURE_SQL_SERVER}:1433/{self.AZURE_SQL_DATABASE}"
         )
     
+    @property
+    def worker_count(self) -> int:
+        """Number of uvicorn worker processes run.py starts"""
+        if self.APP_ENV == "development":
+            return 1
+        return max(self.UVICORN_WORKERS, 1)
+    
+    @property
+    def db_pool_sizing(self) -> tuple:
+        """(pool_size, max_overflow) for one worker process"""
+        if self.DB_POOL_SIZE or self.DB_MAX_OVERFLOW:
+            return int(self.DB_POOL_SIZE or 5), int(self.DB_MAX_OVERFLOW or 10)
+        if self.DB_MAX_CONNECTIONS > 0:
+            per_worker = max(self.DB_MAX_CONNECTIONS // self.worker_count, 1)
+            pool_size = max((per_worker * 2) // 3, 1)
+            return pool_size, per_worker - pool_size
+        return 5, 10
+    
     @property
     def cors_allowed_origins(self) -> list:
         """Parse CORS_ALLOW_ORIGINS into a list for FastAPI middleware"""
         if self.CORS_ALLOW_ORIGINS == "*":
             return ["*"]
         return [origin.strip() for origin in self.CORS_ALLOW_ORIGINS.split(",") if origin.strip()]
+    
+    @property
+    def metrics_allowed_networks(self) -> list:
+        """Parse METRICS_ALLOWED_NETWORKS into a list of CIDR strings"""
+        return [network.strip() for network in self.METRICS_ALLOWED_NETWORKS.split(",") if network.strip()]
 
 
 settings = Settings()
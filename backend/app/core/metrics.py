@@ -0,0 +1,220 @@
+"""Request and SQL instrumentation exported in Prometheus text format.
+
+``MetricsMiddleware`` records per-route latency histograms, in-flight requests
+and status codes. ``instrument_engine`` hooks SQLAlchemy cursor events so every
+statement is counted and timed against the request that issued it (tracked in
+a context variable, which follows the request into threadpool workers).
+
+Like the other runtime stats, the registry is per process: with several
+uvicorn workers each one exposes its own series.
+"""
+import threading
+import time
+from contextvars import ContextVar
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SQL_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+# Requests that match no route share one label so scanners cannot blow up cardinality
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+class RequestSQLStats:
+    """SQL statements issued while serving one request"""
+
+    __slots__ = ("statements", "seconds")
+
+    def __init__(self):
+        self.statements = 0
+        self.seconds = 0.0
+
+
+_request_sql: ContextVar[Optional[RequestSQLStats]] = ContextVar("request_sql", default=None)
+
+
+def current_sql_stats() -> Optional[RequestSQLStats]:
+    return _request_sql.get()
+
+
+class Histogram:
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.total = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[index] += 1
+                break
+        self.total += 1
+        self.sum += value
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.latency: Dict[Tuple[str, str], Histogram] = {}
+        self.sql_per_request: Dict[Tuple[str, str], Histogram] = {}
+        self.sql_seconds: Dict[Tuple[str, str], float] = {}
+        self.responses: Dict[Tuple[str, str, str], int] = {}
+        self.sql_outside_requests = 0
+
+    def request_started(self) -> None:
+        with self._lock:
+            self.in_flight += 1
+
+    def request_finished(self, method: str, route: str, status: int, seconds: float,
+                         sql: RequestSQLStats) -> None:
+        key = (method, route)
+        with self._lock:
+            self.in_flight -= 1
+            if key not in self.latency:
+                self.latency[key] = Histogram(LATENCY_BUCKETS)
+                self.sql_per_request[key] = Histogram(SQL_COUNT_BUCKETS)
+                self.sql_seconds[key] = 0.0
+            self.latency[key].observe(seconds)
+            self.sql_per_request[key].observe(sql.statements)
+            self.sql_seconds[key] += sql.seconds
+            status_key = (method, route, str(status))
+            self.responses[status_key] = self.responses.get(status_key, 0) + 1
+
+    def sql_without_request(self) -> None:
+        with self._lock:
+            self.sql_outside_requests += 1
+
+    def render(self, extra: Optional[Dict[str, Tuple[str, str, float]]] = None) -> str:
+        """Prometheus text exposition; ``extra`` maps name -> (type, help, value)"""
+        lines = []
+        with self._lock:
+            lines += [
+                "# HELP http_requests_in_flight Requests currently being served",
+                "# TYPE http_requests_in_flight gauge",
+                f"http_requests_in_flight {self.in_flight}",
+            ]
+            _render_histograms(
+                lines, "http_request_duration_seconds",
+                "Request latency by route template", self.latency
+            )
+            lines += [
+                "# HELP http_responses_total Responses by route template and status code",
+                "# TYPE http_responses_total counter",
+            ]
+            for (method, route, status), count in sorted(self.responses.items()):
+                lines.append(
+                    f'http_responses_total{{method="{method}",route="{_escape(route)}",status="{status}"}} {count}'
+                )
+            _render_histograms(
+                lines, "http_request_sql_statements",
+                "SQL statements issued per request", self.sql_per_request
+            )
+            lines += [
+                "# HELP http_request_sql_seconds_total Time spent executing SQL by route template",
+                "# TYPE http_request_sql_seconds_total counter",
+            ]
+            for (method, route), seconds in sorted(self.sql_seconds.items()):
+                lines.append(
+                    f'http_request_sql_seconds_total{{method="{method}",route="{_escape(route)}"}} {seconds:.6f}'
+                )
+            lines += [
+                "# HELP sql_statements_outside_requests_total Statements run by startup and background work",
+                "# TYPE sql_statements_outside_requests_total counter",
+                f"sql_statements_outside_requests_total {self.sql_outside_requests}",
+            ]
+        for name, (kind, help_text, value) in (extra or {}).items():
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}", f"{name} {value}"]
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _render_histograms(lines: list, name: str, help_text: str,
+                       histograms: Dict[Tuple[str, str], Histogram]) -> None:
+    lines += [f"# HELP {name} {help_text}", f"# TYPE {name} histogram"]
+    for (method, route), histogram in sorted(histograms.items()):
+        labels = f'method="{method}",route="{_escape(route)}"'
+        cumulative = 0
+        for bound, count in zip(histogram.buckets, histogram.counts):
+            cumulative += count
+            lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+        lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {histogram.total}')
+        lines.append(f"{name}_sum{{{labels}}} {histogram.sum:.6f}")
+        lines.append(f"{name}_count{{{labels}}} {histogram.total}")
+
+
+registry = MetricsRegistry()
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Count and time every statement against the request that issued it"""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info["metrics_query_start"] = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        started = conn.info.pop("metrics_query_start", None)
+        stats = _request_sql.get()
+        if stats is None:
+            registry.sql_without_request()
+            return
+        stats.statements += 1
+        if started is not None:
+            stats.seconds += time.perf_counter() - started
+
+
+def _route_label(scope) -> str:
+    # FastAPI stores the matched route in the scope, so labels use the path
+    # template (/api/resources/{resource_id}) rather than the raw path.
+    route = scope.get("route")
+    return getattr(route, "path_format", None) or getattr(route, "path", None) or UNMATCHED_ROUTE
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware, so streaming responses are not buffered"""
+
+    def __init__(self, app, server_timing: bool = True):
+        self.app = app
+        self.server_timing = server_timing
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        sql = RequestSQLStats()
+        token = _request_sql.set(sql)
+        started = time.perf_counter()
+        status_code = 500
+        registry.request_started()
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                if self.server_timing:
+                    elapsed_ms = (time.perf_counter() - started) * 1000
+                    header = (
+                        f'app;dur={elapsed_ms:.1f}, '
+                        f'db;dur={sql.seconds * 1000:.1f};desc="{sql.statements} queries"'
+                    )
+                    message["headers"] = list(message.get("headers", [])) + [(b"server-timing", header.encode("latin-1"))]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            registry.request_finished(
+                scope["method"], _route_label(scope), status_code,
+                time.perf_counter() - started, sql
+            )
+            _request_sql.reset(token)
@@ -0,0 +1,93 @@
+"""Template resource catalog, loaded once and served as pre-encoded bytes.
+
+The catalog is read from ``resource_templates.json`` next to this module, or
+from ``TEMPLATE_CATALOG_PATH``. It is loaded on first use rather than at
+import, so a catalog of thousands of entries does not slow down startup.
+GET /api/resources/templates writes ``body`` (or a precompressed variant) as is.
+"""
+import gzip
+import hashlib
+import json
+import threading
+from pathlib import Path
+from types import MappingProxyType
+from typing import Dict, Mapping, Optional, Tuple
+from app.core.config import settings
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+DEFAULT_CATALOG_PATH = Path(__file__).resolve().parent / "resource_templates.json"
+
+# Columns of a template; anything else in the data file is ignored
+TEMPLATE_FIELDS = ("title", "resource_name", "description", "icon", "status", "region")
+
+# Bodies smaller than this are not worth a Content-Encoding
+MIN_COMPRESS_BYTES = 1024
+
+
+class TemplateCatalog:
+    def __init__(self, templates):
+        # Read-only insert-ready rows, indexed by template id
+        self.rows: Tuple[Mapping[str, str], ...] = tuple(
+            MappingProxyType({field: t[field] for field in TEMPLATE_FIELDS})
+            for t in templates
+        )
+        self.body = json.dumps(
+            [{"id": i, **row} for i, row in enumerate(self.rows)],
+            ensure_ascii=False,
+            separators=(",", ":")
+        ).encode()
+        digest = hashlib.sha1(self.body).hexdigest()
+        self.etag = f'"{digest}"'
+        # Precompressed bodies by Content-Encoding
+        self.encoded: Dict[str, bytes] = {}
+        if len(self.body) >= MIN_COMPRESS_BYTES:
+            self.encoded["gzip"] = gzip.compress(self.body, compresslevel=9, mtime=0)
+            if brotli is not None:
+                self.encoded["br"] = brotli.compress(self.body, quality=11)
+        # Strong validators differ per representation, so a cache never
+        # revalidates or serves one encoding for a request negotiating another
+        self.etags: Dict[Optional[str], str] = {None: self.etag}
+        self.etags.update({coding: f'"{digest}-{coding}"' for coding in self.encoded})
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def negotiate(self, accept_encoding: str) -> Tuple[Optional[str], bytes]:
+        """Smallest variant the client accepts, as (content_encoding, body); see ``etags``"""
+        accepted = set()
+        for item in accept_encoding.lower().split(","):
+            coding, _, params = item.partition(";")
+            quality = params.strip().removeprefix("q=")
+            try:
+                if params and float(quality) == 0:
+                    continue
+            except ValueError:
+                pass
+            accepted.add(coding.strip())
+        for coding in ("br", "gzip"):
+            if coding in self.encoded and (coding in accepted or "*" in accepted):
+                return coding, self.encoded[coding]
+        return None, self.body
+
+
+_lock = threading.Lock()
+_catalog: Optional[TemplateCatalog] = None
+
+
+def load_catalog(path=None) -> TemplateCatalog:
+    with open(path or settings.TEMPLATE_CATALOG_PATH or DEFAULT_CATALOG_PATH, encoding="utf-8") as f:
+        return TemplateCatalog(json.load(f))
+
+
+def get_catalog() -> TemplateCatalog:
+    """The process-wide catalog, loaded on first use"""
+    global _catalog
+    if _catalog is None:
+        with _lock:
+            if _catalog is None:
+                _catalog = load_catalog()
+    return _catalog
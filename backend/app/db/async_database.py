@@ -0,0 +1,118 @@
+"""Async database access for the hot read endpoints.
+
+Handlers that depend on ``get_async_db`` are ``async def`` and await their
+queries, so they do not hold one of Starlette's threadpool workers per request.
+
+With ``ASYNC_DB_ENABLED=true`` and an async driver available (aiosqlite for the
+local SQLite database) the dependency yields a real ``AsyncSession``. Otherwise
+(the default, and always on Azure SQL because pymssql has no async variant) it
+yields a ``ThreadedAsyncSession``: the regular sync session driven from a
+dedicated, bounded set of worker threads. Both expose the same awaitable API.
+"""
+from typing import Any, Callable, Optional
+from anyio import CapacityLimiter, Semaphore, to_thread
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.core.metrics import instrument_engine
+from app.db.database import SessionLocal, database_url, pool_size, max_overflow
+
+# A threaded session may hold a pooled connection between awaits, so the number
+# of live sessions (not just of running calls) is capped at the pool capacity.
+# Otherwise threads blocked waiting for a connection could starve the sessions
+# that hold one of the threads they need to finish and give it back.
+_SESSION_CAPACITY = max(pool_size + max_overflow, 1)
+_session_slots: Optional[Semaphore] = None
+_db_thread_limiter: Optional[CapacityLimiter] = None
+
+
+def _limiter() -> CapacityLimiter:
+    global _db_thread_limiter
+    if _db_thread_limiter is None:
+        _db_thread_limiter = CapacityLimiter(_SESSION_CAPACITY)
+    return _db_thread_limiter
+
+
+def _slots() -> Semaphore:
+    # Created lazily so it binds to the running event loop
+    global _session_slots
+    if _session_slots is None:
+        _session_slots = Semaphore(_SESSION_CAPACITY)
+    return _session_slots
+
+
+class ThreadedAsyncSession:
+    """AsyncSession-compatible facade over a sync Session run on worker threads"""
+
+    def __init__(self, session: Session):
+        self.sync_session = session
+
+    async def _run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        return await to_thread.run_sync(fn, *args, limiter=_limiter())
+
+    async def execute(self, statement, params=None):
+        def _execute():
+            # Buffer rows on the worker thread, like AsyncSession.execute does
+            return self.sync_session.execute(statement, params).freeze()()
+        return await self._run(_execute)
+
+    async def scalar(self, statement, params=None):
+        return await self._run(self.sync_session.scalar, statement, params)
+
+    async def run_sync(self, fn: Callable[..., Any], *args: Any) -> Any:
+        return await self._run(fn, self.sync_session, *args)
+
+    async def commit(self) -> None:
+        await self._run(self.sync_session.commit)
+
+    async def rollback(self) -> None:
+        await self._run(self.sync_session.rollback)
+
+    async def close(self) -> None:
+        await self._run(self.sync_session.close)
+
+
+def _build_async_sessionmaker():
+    if not settings.ASYNC_DB_ENABLED:
+        return None
+    if not database_url.startswith("sqlite"):
+        print("ℹ️  No async driver for Azure SQL (pymssql); async routes use the threaded adapter")
+        return None
+    try:
+        import aiosqlite  # noqa: F401
+    except ImportError:
+        print("⚠️  ASYNC_DB_ENABLED is set but aiosqlite is not installed; using the threaded adapter")
+        return None
+
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+    from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+    # aiosqlite defaults to NullPool, which opens a new connection (and thread) per session
+    async_engine = create_async_engine(
+        database_url.replace("sqlite://", "sqlite+aiosqlite://", 1),
+        echo=False,
+        poolclass=AsyncAdaptedQueuePool,
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_pre_ping=settings.DB_POOL_PRE_PING
+    )
+    if settings.METRICS_ENABLED:
+        instrument_engine(async_engine.sync_engine)
+    print("✅ Async database path enabled (aiosqlite)")
+    return async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+
+AsyncSessionLocal = _build_async_sessionmaker()
+
+
+async def get_async_db():
+    if AsyncSessionLocal is not None:
+        async with AsyncSessionLocal() as session:
+            yield session
+    else:
+        async with _slots():
+            session = ThreadedAsyncSession(SessionLocal())
+            try:
+                yield session
+            finally:
+                await session.close()
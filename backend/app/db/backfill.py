@@ -0,0 +1,192 @@
+"""Resumable, throttled backfills over large tables.
+
+A ``BackfillJob`` walks a table in primary-key order (keyset chunks: rows with
+``id > last_id``, ``batch_size`` at a time), updates each chunk in its own
+short transaction and sleeps between chunks, so a live database keeps serving
+requests while the backfill runs. The chunk's update and the job checkpoint
+commit together: an interrupted job resumes after the last completed chunk,
+and a finished job is skipped. Keys may be integers, strings or GUIDs; the
+checkpoint stores the last key as text, and the first chunk has no lower
+bound.
+
+Two kinds of update are supported:
+
+- set-based: ``set_sql="is_protected = 0", where="is_protected IS NULL"``
+- computed in Python: ``columns=[...]`` plus ``compute(rows) -> {pk: {col: value}}``
+  for precomputed fields that SQL cannot derive easily.
+
+    python -m app.db.backfill --status
+    python -m app.db.backfill --reset JOB_NAME
+"""
+import sys
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from sqlalchemy import func, select, text
+from sqlalchemy.engine import Connection
+
+from app.core.config import settings
+from app.db.database import engine
+
+STATUS_RUNNING = "running"
+STATUS_DONE = "done"
+
+# Print progress at most this often
+PROGRESS_INTERVAL_SECONDS = 5.0
+
+
+def _checkpoints():
+    # Created by migration 8 (app/db/schema_migrations.py)
+    from app.models.meta import BackfillCheckpoint
+    return BackfillCheckpoint.__table__
+
+
+class BackfillJob:
+    def __init__(self, name: str, table: str, set_sql: Optional[str] = None,
+                 where: Optional[str] = None, key: str = "id",
+                 columns: Sequence[str] = (),
+                 compute: Optional[Callable[[List[dict]], Dict[Any, dict]]] = None,
+                 batch_size: Optional[int] = None, sleep_ms: Optional[float] = None):
+        if (set_sql is None) == (compute is None):
+            raise ValueError("A backfill needs exactly one of set_sql or compute")
+        self.name = name
+        self.table = table
+        self.set_sql = set_sql
+        self.where = where
+        self.key = key
+        self.columns = list(columns)
+        self.compute = compute
+        self.batch_size = batch_size or settings.MIGRATIONS_BACKFILL_BATCH_SIZE
+        self.sleep_ms = settings.MIGRATIONS_BACKFILL_SLEEP_MS if sleep_ms is None else sleep_ms
+
+    def describe(self) -> str:
+        if self.set_sql is not None:
+            condition = f" WHERE {self.where}" if self.where else ""
+            return f"backfill {self.name}: {self.table} SET {self.set_sql}{condition}"
+        return f"backfill {self.name}: {self.table} computed from {', '.join(self.columns)}"
+
+    def _after(self, last: Optional[str]) -> str:
+        # No lower bound for the first chunk: 0 is no key below a GUID or a string
+        return "1 = 1" if last is None else f"{self.key} > :last"
+
+    def _chunk_end_sql(self, dialect: str, last: Optional[str]) -> str:
+        # Upper key of the next chunk; walking the key range (not only matching
+        # rows) keeps every chunk an index range seek. TOP 1 ... DESC rather
+        # than MAX(), which Azure SQL rejects for uniqueidentifier keys.
+        if dialect == "mssql":
+            inner = (f"SELECT TOP ({self.batch_size}) {self.key} FROM {self.table} "
+                     f"WHERE {self._after(last)} ORDER BY {self.key}")
+            return f"SELECT TOP 1 {self.key} FROM ({inner}) chunk ORDER BY {self.key} DESC"
+        inner = (f"SELECT {self.key} FROM {self.table} "
+                 f"WHERE {self._after(last)} ORDER BY {self.key} LIMIT {self.batch_size}")
+        return f"SELECT {self.key} FROM ({inner}) chunk ORDER BY {self.key} DESC LIMIT 1"
+
+    def _chunk_sql(self, last: Optional[str]) -> str:
+        """The chunk's UPDATE (set-based) or the SELECT feeding ``compute``"""
+        if self.set_sql is not None:
+            head = f"UPDATE {self.table} SET {self.set_sql}"
+        else:
+            head = f"SELECT {self.key}, {', '.join(self.columns)} FROM {self.table}"
+        condition = f" AND ({self.where})" if self.where else ""
+        return f"{head} WHERE {self._after(last)} AND {self.key} <= :upper{condition}"
+
+    def plan_sql(self, dialect: str) -> List[str]:
+        """Statements one chunk runs (for dry-run output)"""
+        return [self._chunk_end_sql(dialect, ":last"), self._chunk_sql(":last")]
+
+    def _apply_chunk(self, conn: Connection, last: Optional[str], upper) -> int:
+        params = {"last": last, "upper": upper}
+        if self.set_sql is not None:
+            return conn.execute(text(self._chunk_sql(last)), params).rowcount
+        rows = conn.execute(text(self._chunk_sql(last)), params).mappings().all()
+        updates = self.compute([dict(row) for row in rows]) if rows else {}
+        if not updates:
+            return 0
+        # One executemany per distinct set of changed columns
+        by_columns: Dict[tuple, list] = {}
+        for key_value, values in updates.items():
+            by_columns.setdefault(tuple(sorted(values)), []).append({**values, "_key": key_value})
+        for columns, params in by_columns.items():
+            assignments = ", ".join(f"{column} = :{column}" for column in columns)
+            conn.execute(text(f"UPDATE {self.table} SET {assignments} WHERE {self.key} = :_key"), params)
+        return len(updates)
+
+    def run(self) -> dict:
+        """Run (or resume) the job; returns rows, chunks, seconds and rows_per_second"""
+        checkpoints = _checkpoints()
+        with engine.connect() as conn:
+            checkpoint = conn.execute(
+                select(checkpoints).where(checkpoints.c.job_name == self.name)
+            ).mappings().first()
+        if checkpoint is None:
+            with engine.begin() as conn:
+                conn.execute(checkpoints.insert().values(
+                    job_name=self.name, last_key=None, rows_done=0, status=STATUS_RUNNING
+                ))
+            last, rows_done = None, 0
+        elif checkpoint["status"] == STATUS_DONE:
+            return {"job": self.name, "status": STATUS_DONE, "rows": checkpoint["rows_done"],
+                    "chunks": 0, "seconds": 0.0, "rows_per_second": 0.0}
+        else:
+            last, rows_done = checkpoint["last_key"], checkpoint["rows_done"]
+            print(f"ℹ️  Resuming {self.name} after {self.key} {last} ({rows_done} rows done)")
+
+        started = time.perf_counter()
+        last_report = started
+        rows_this_run = 0
+        chunks = 0
+        while True:
+            with engine.begin() as conn:
+                upper = conn.execute(text(self._chunk_end_sql(engine.dialect.name, last)), {"last": last}).scalar()
+                if upper is None:
+                    conn.execute(checkpoints.update().where(checkpoints.c.job_name == self.name).values(
+                        status=STATUS_DONE, finished_at=func.now()
+                    ))
+                    break
+                updated = self._apply_chunk(conn, last, upper)
+                rows_done += updated
+                # As text, like a resumed run reads it back
+                last = str(upper)
+                conn.execute(checkpoints.update().where(checkpoints.c.job_name == self.name).values(
+                    last_key=last, rows_done=rows_done, updated_at=func.now()
+                ))
+            rows_this_run += updated
+            chunks += 1
+            now = time.perf_counter()
+            if now - last_report >= PROGRESS_INTERVAL_SECONDS:
+                print(f"ℹ️  {self.name}: {rows_done} rows, up to {self.key} {last}, "
+                      f"{rows_this_run / (now - started):.0f} rows/s")
+                last_report = now
+            if self.sleep_ms:
+                time.sleep(self.sleep_ms / 1000)
+
+        seconds = time.perf_counter() - started
+        return {
+            "job": self.name,
+            "status": STATUS_DONE,
+            "rows": rows_done,
+            "chunks": chunks,
+            "seconds": round(seconds, 3),
+            "rows_per_second": round(rows_this_run / seconds, 1) if seconds else 0.0,
+        }
+
+
+def status() -> List[dict]:
+    checkpoints = _checkpoints()
+    with engine.connect() as conn:
+        return [dict(row) for row in conn.execute(select(checkpoints).order_by(checkpoints.c.job_name)).mappings()]
+
+
+def reset(name: str) -> None:
+    """Forget a job's progress so it runs again from the start"""
+    checkpoints = _checkpoints()
+    with engine.begin() as conn:
+        conn.execute(checkpoints.delete().where(checkpoints.c.job_name == name))
+
+
+if __name__ == "__main__":
+    if "--reset" in sys.argv[1:]:
+        reset(sys.argv[sys.argv.index("--reset") + 1])
+    for row in status():
+        print(f"{row['job_name']:40} {row['status']:8} rows={row['rows_done']} last_key={row['last_key']}")
+    engine.dispose()
@@ -0,0 +1,42 @@
+"""One-shot database bootstrap: schema migrations, then the admin seed.
+
+Workers call ``bootstrap_database`` from the startup event unless
+``DB_BOOTSTRAP_ON_STARTUP=false``. ``run.py`` runs it once before starting
+several workers and turns it off for them; other deployments can run
+
+    python -m app.db.bootstrap
+
+as a release step instead. When the highest applied migration is the latest
+one, a single query replaces all schema work and only the admin seed runs.
+"""
+import time
+from app.db.database import SessionLocal, engine
+from app.db import migrations
+
+
+def ensure_schema() -> bool:
+    """Apply pending migrations; returns True if any schema work ran"""
+    latest = migrations.latest_version()
+    if migrations.current_version() == latest:
+        print(f"ℹ️  Schema is at version {latest}, no migrations to apply")
+        return False
+    migrations.migrate()
+    print(f"✅ Schema migrated to version {latest}")
+    return True
+
+
+def bootstrap_database() -> None:
+    from app.db.super_user_seed import create_super_user
+    started = time.perf_counter()
+    ensure_schema()
+    db = SessionLocal()
+    try:
+        create_super_user(db)
+    finally:
+        db.close()
+    print(f"✅ Database bootstrap finished in {(time.perf_counter() - started) * 1000:.0f} ms")
+
+
+if __name__ == "__main__":
+    bootstrap_database()
+    engine.dispose()
@@ -0,0 +1,117 @@
+from typing import Dict, Iterable, List, Optional, Sequence
+from sqlalchemy import Table, bindparam, delete, insert, select, text, update
+from sqlalchemy.engine import Connection, Row
+from sqlalchemy.orm import Session
+from app.models.resource import Resource
+
+# MSSQL caps a statement at 2100 bind parameters; keep IN lists well below it
+IN_CLAUSE_CHUNK = 1000
+
+# Bind parameters per statement (Azure SQL allows 2100, SQLite >= 3.32 32766)
+# and the most rows one VALUES list may hold on Azure SQL
+MAX_PARAMS = {"mssql": 2000, "sqlite": 32000}
+MAX_VALUES_ROWS = 1000
+
+
+def _chunks(values: Sequence, size: int) -> Iterable[Sequence]:
+    for start in range(0, len(values), size):
+        yield values[start:start + size]
+
+
+def insert_resources(db: Session, rows: List[Dict]) -> List[Row]:
+    """Insert many resources and return the stored rows, in input order
+
+    SQLAlchemy batches this into multi-row INSERT ... VALUES statements with
+    RETURNING (SQLite) or OUTPUT INSERTED (MSSQL), so generated ids and
+    timestamps come back without one round trip per row.
+    """
+    if not rows:
+        return []
+    if db.get_bind().dialect.name == "sqlite":
+        # SQLAlchemy will only batch SQLite RETURNING when it may reorder rows.
+        # SQLite assigns rowids in VALUES order, so sorting by id restores it.
+        statement = insert(Resource).returning(*Resource.__table__.columns)
+        return sorted(db.execute(statement, rows).all(), key=lambda row: row.id)
+    statement = insert(Resource).returning(
+        *Resource.__table__.columns, sort_by_parameter_order=True
+    )
+    return db.execute(statement, rows).all()
+
+
+def existing_resource_ids(db: Session, resource_ids: Iterable[int]) -> set:
+    """Subset of the given ids that exist in the resources table"""
+    ids = list(set(resource_ids))
+    found = set()
+    for chunk in _chunks(ids, IN_CLAUSE_CHUNK):
+        found.update(db.execute(select(Resource.id).where(Resource.id.in_(chunk))).scalars())
+    return found
+
+
+def update_resources(db: Session, rows: List[Dict]) -> None:
+    """Bulk UPDATE by primary key; every dict must contain ``id``"""
+    if rows:
+        db.execute(update(Resource), rows)
+
+
+def delete_resources(db: Session, resource_ids: Iterable[int]) -> None:
+    ids = list(set(resource_ids))
+    for chunk in _chunks(ids, IN_CLAUSE_CHUNK):
+        db.execute(delete(Resource).where(Resource.id.in_(chunk)))
+
+
+def load_resources(db: Session, resource_ids: Iterable[int]) -> Dict[int, Row]:
+    """Fetch resource rows by id in as few statements as possible"""
+    ids = list(set(resource_ids))
+    rows = {}
+    for chunk in _chunks(ids, IN_CLAUSE_CHUNK):
+        result = db.execute(select(*Resource.__table__.columns).where(Resource.id.in_(chunk)))
+        rows.update({row.id: row for row in result})
+    return rows
+
+
+# Compiled multi-row INSERT statements by (table, columns, row count)
+_values_statements: Dict[tuple, object] = {}
+
+
+def _values_statement(table: Table, columns: Sequence[str], count: int):
+    """INSERT ... VALUES with ``count`` rows of typed bind parameters, built once per shape
+
+    A text() statement, because SQLAlchemy does not cache the compiled form
+    of multi-row ``insert().values()`` and would recompile it every batch.
+    """
+    key = (table.name, tuple(columns), count)
+    statement = _values_statements.get(key)
+    if statement is None:
+        rows = ", ".join(
+            "(" + ", ".join(f":{column}_{i}" for column in columns) + ")" for i in range(count)
+        )
+        statement = text(f"INSERT INTO {table.name} ({', '.join(columns)}) VALUES {rows}").bindparams(*[
+            bindparam(f"{column}_{i}", type_=table.c[column].type)
+            for i in range(count) for column in columns
+        ])
+        _values_statements[key] = statement
+    return statement
+
+
+def insert_rows(conn: Connection, table: Table, rows: List[dict], multi_values: Optional[bool] = None) -> None:
+    """Insert rows in as few round trips as the driver allows
+
+    Azure SQL gets multi-row VALUES statements sized to its bind parameter
+    limit; the statement for each size is compiled once and reused. SQLite's
+    executemany already runs one prepared statement in C, which is faster
+    than any VALUES list there.
+    """
+    if not rows:
+        return
+    dialect = conn.dialect.name
+    if multi_values is None:
+        multi_values = dialect != "sqlite"
+    if not multi_values:
+        conn.execute(table.insert(), rows)
+        return
+    columns = list(rows[0])
+    per_statement = max(1, min(MAX_PARAMS.get(dialect, 1000) // len(columns), MAX_VALUES_ROWS))
+    for start in range(0, len(rows), per_statement):
+        chunk = rows[start:start + per_statement]
+        params = {f"{column}_{i}": row[column] for i, row in enumerate(chunk) for column in columns}
+        conn.execute(_values_statement(table, columns, len(chunk)), params)
@@ -0,0 +1,31 @@
+from sqlalchemy import update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from app.models.meta import CacheVersion
+
+
+def get_cache_version(db: Session, name: str) -> int:
+    """Current stamp of a cached data set (0 if it was never bumped)"""
+    return db.query(CacheVersion.version).filter(CacheVersion.name == name).scalar() or 0
+
+
+def _increment(db: Session, name: str) -> bool:
+    result = db.execute(
+        update(CacheVersion)
+        .where(CacheVersion.name == name)
+        .values(version=CacheVersion.version + 1)
+    )
+    return result.rowcount > 0
+
+
+def bump_cache_version(db: Session, name: str) -> None:
+    """Invalidate every worker's copy of a data set; the caller commits"""
+    if _increment(db, name):
+        return
+    try:
+        # Savepoint: a losing insert must not roll back the caller's changes
+        with db.begin_nested():
+            db.add(CacheVersion(name=name, version=1))
+    except IntegrityError:
+        # Another worker created the stamp between our UPDATE and INSERT
+        _increment(db, name)
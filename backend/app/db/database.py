@@ -1,155 +1,118 @@
-from sqlalchemy import create_engine, text
+from sqlalchemy import create_engine, exc
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import QueuePool
 from pathlib import Path
 from dotenv import load_dotenv
 import os
 import sys
+import threading
+import time
 
 # Load .env FIRST before importing settings
 env_file = Path(__file__).parent.parent.parent / ".env"
 load_dotenv(env_file)
 
 from app.core.config import settings
+from app.core.metrics import instrument_engine
+
+
+class PoolWaitStats:
+    """Counters for checkouts that found the pool exhausted (shared across pool recreation)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.waits = 0
+        self.wait_time = 0.0
+        self.timeouts = 0
+
+    def record(self, waited: float, timed_out: bool = False) -> None:
+        with self._lock:
+            self.waits += 1
+            self.wait_time += waited
+            if timed_out:
+                self.timeouts += 1
+
+
+pool_wait_stats = PoolWaitStats()
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that records how often and how long checkouts wait for a free connection"""
+
+    def _do_get(self):
+        exhausted = (
+            self._max_overflow > -1
+            and self.checkedin() == 0
+            and self.overflow() >= self._max_overflow
+        )
+        if not exhausted:
+            return super()._do_get()
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            pool_wait_stats.record(time.perf_counter() - started, timed_out=True)
+            raise
+        pool_wait_stats.record(time.perf_counter() - started)
+        return connection
+
+
+pool_size, max_overflow = settings.db_pool_sizing
+pool_kwargs = {
+    "poolclass": InstrumentedQueuePool,
+    "pool_size": pool_size,
+    "max_overflow": max_overflow,
+    "pool_timeout": settings.DB_POOL_TIMEOUT,
+    "pool_recycle": settings.DB_POOL_RECYCLE,
+    "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    "pool_use_lifo": settings.DB_POOL_USE_LIFO,
+}
 
 if settings.AZURE_SQL_SERVER and settings.AZURE_SQL_DATABASE:
     print(f"✅ Using Azure SQL: {settings.AZURE_SQL_SERVER}")
     database_url = settings.DATABASE_URL
-    engine_kwargs = {"echo": False}
+    engine_kwargs = {"echo": False, **pool_kwargs}
 else:
     print("✅ Using SQLite for local development")
-    db_dir = Path(__file__).parent.parent.parent / "data"
-    db_dir.mkdir(exist_ok=True)
-    database_url = f"sqlite:///{db_dir}/app.db"
+    if settings.SQLITE_PATH:
+        db_path = Path(settings.SQLITE_PATH)
+    else:
+        db_path = Path(__file__).parent.parent.parent / "data" / "app.db"
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    database_url = f"sqlite:///{db_path}"
     engine_kwargs = {
         "connect_args": {"check_same_thread": False},
-        "echo": False
+        "echo": False,
+        **pool_kwargs
     }
 
 engine = create_engine(database_url, **engine_kwargs)
+if settings.METRICS_ENABLED:
+    instrument_engine(engine)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
 
-def init_db():
-    """Initialize database and fix schema if needed"""
-    # 🔴 यह बदलना है: Azure SQL-specific initialization for production
-    try:
-        if "mssql" in str(database_url):
-            with engine.begin() as conn:
-                # 🔴 यह बदलना है: Fix resources table for Azure SQL
-                check_table = text("""
-                    SELECT COUNT(*) FROM INFORMATION_SCHEMA.TABLES 
-                    WHERE TABLE_NAME = 'resources'
-                """)
-                result = conn.execute(check_table)
-                resources_exists = result.scalar() > 0
-                
-                if resources_exists:
-                    check_type = text("""
-                    SELECT DATA_TYPE FROM INFORMATION_SCHEMA.COLUMNS
-                    WHERE TABLE_NAME = 'resources' AND COLUMN_NAME = 'user_id'
-                    """)
-                    result = conn.execute(check_type)
-                    data_type = result.scalar()
-                    if data_type not in ('varchar', 'nvarchar'):
-                        conn.execute(text("DROP TABLE IF EXISTS resources"))
-                        resources_exists = False
-                
-                if not resources_exists:
-                    # 🔴 यह बदलना है: Create resources table with Azure SQL syntax
-                    conn.execute(text("""
-                    CREATE TABLE resources (
-                        id INT PRIMARY KEY IDENTITY(1,1),
-                        user_id VARCHAR(36) NOT NULL,
-                        icon VARCHAR(20) NOT NULL,
-                        title VARCHAR(100) NOT NULL,
-                        resource_name VARCHAR(200) NOT NULL,
-                        description VARCHAR(500),
-                        status VARCHAR(20) DEFAULT 'Running',
-                        region VARCHAR(50) DEFAULT 'East US',
-                        created_at DATETIME DEFAULT GETUTCDATE(),
-                        updated_at DATETIME DEFAULT GETUTCDATE()
-                    );
-                    CREATE INDEX idx_resources_user_id ON resources(user_id);
-                    """))
-                    print("✅ Created resources table")
-                
-                # 🔴 यह बदलना है: Fix theme_config table for Azure SQL
-                check_theme = text("""
-                    SELECT COUNT(*) FROM INFORMATION_SCHEMA.TABLES 
-                    WHERE TABLE_NAME = 'theme_config'
-                """)
-                result = conn.execute(check_theme)
-                theme_exists = result.scalar() > 0
-                
-                if theme_exists:
-                    # Check if it has correct columns
-                    check_cols = text("""
-                    SELECT COUNT(*) FROM INFORMATION_SCHEMA.COLUMNS 
-                    WHERE TABLE_NAME = 'theme_config' AND COLUMN_NAME = 'config_key'
-                    """)
-                    result = conn.execute(check_cols)
-                    has_config_key = result.scalar() > 0
-                    
-                    if not has_config_key:
-                        conn.execute(text("DROP TABLE IF EXISTS theme_config"))
-                        theme_exists = False
-                
-                if not theme_exists:
-                    # 🔴 यह बदलना है: Create theme_config table with Azure SQL syntax (2000 chars for theme JSON)
-                    conn.execute(text("""
-                    CREATE TABLE theme_config (
-                        id INT PRIMARY KEY IDENTITY(1,1),
-                        config_key VARCHAR(100) UNIQUE NOT NULL,
-                        config_value VARCHAR(500) NOT NULL,
-                        created_at DATETIME DEFAULT GETUTCDATE(),
-                        updated_at DATETIME DEFAULT GETUTCDATE()
-                    );
-                    CREATE INDEX idx_theme_config_key ON theme_config(config_key);
-                    """))
-                    print("✅ Created theme_config table")
-                
-                # 🔴 यह बदलना है: Fix users table - add missing columns if they don't exist
-                check_users = text("""
-                    SELECT COUNT(*) FROM INFORMATION_SCHEMA.TABLES 
-                    WHERE TABLE_NAME = 'users'
-                """)
-                result = conn.execute(check_users)
-                users_exists = result.scalar() > 0
-                
-                if users_exists:
-                    # Check for missing columns
-                    missing_columns = []
-                    columns_to_check = [
-                        ('display_name', "VARCHAR(100)"),
-                        ('tagline', "VARCHAR(200)"),
-                        ('bio', "VARCHAR(500)"),
-                        ('avatar_url', "VARCHAR(500)"),
-                        ('is_protected', "BIT")
-                    ]
-                    
-                    for col_name, col_type in columns_to_check:
-                        check_col = text(f"""
-                            SELECT COUNT(*) FROM INFORMATION_SCHEMA.COLUMNS 
-                            WHERE TABLE_NAME = 'users' AND COLUMN_NAME = '{col_name}'
-                        """)
-                        result = conn.execute(check_col)
-                        if result.scalar() == 0:
-                            missing_columns.append((col_name, col_type))
-                    
-                    # Add missing columns
-                    for col_name, col_type in missing_columns:
-                        try:
-                            if col_name == 'is_protected':
-                                conn.execute(text(f"ALTER TABLE users ADD {col_name} {col_type} DEFAULT 0"))
-                            else:
-                                conn.execute(text(f"ALTER TABLE users ADD {col_name} {col_type}"))
-                            print(f"✅ Added missing column: users.{col_name}")
-                        except Exception as col_err:
-                            print(f"⚠️  Could not add column {col_name}: {col_err}")
-    except Exception as e:
-        print(f"⚠️  Database init error: {e}")
+def get_pool_status() -> dict:
+    """Live connection pool statistics for this worker process"""
+    pool = engine.pool
+    return {
+        "pool_class": type(pool).__name__,
+        "pool_size": pool.size(),
+        "max_overflow": max_overflow,
+        "checked_out": pool.checkedout(),
+        "checked_in": pool.checkedin(),
+        "overflow": pool.overflow(),
+        "waits": pool_wait_stats.waits,
+        "wait_time_ms": round(pool_wait_stats.wait_time * 1000, 2),
+        "timeouts": pool_wait_stats.timeouts,
+        "timeout_seconds": settings.DB_POOL_TIMEOUT,
+        "recycle_seconds": settings.DB_POOL_RECYCLE,
+        "pre_ping": settings.DB_POOL_PRE_PING,
+        "use_lifo": settings.DB_POOL_USE_LIFO,
+        "workers": settings.worker_count,
+    }
 
 
 def get_db():
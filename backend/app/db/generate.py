@@ -0,0 +1,252 @@
+"""Synthetic data at production scale, for reproducing scaling problems locally.
+
+Bulk-loads users, per-user themes and resources into the configured database
+(SQLite or Azure SQL) with weighted distributions over status, region and
+icon. Rows go in batched transactions (multi-row INSERT ... VALUES on Azure
+SQL, executemany on SQLite), and every user gets one of a few bcrypt hashes
+computed up front, so millions of rows take minutes:
+
+    python -m app.db.generate --users 200000 --resources 5000000 --themes 0.3
+
+Generated users are ``<prefix><n>@example.com`` with ``--password``;
+numbering continues after the users already generated with that prefix, so
+running the command again adds more data. Resources belong to the resource
+owner admin, whose resources every user sees. Use ``--seed`` for repeatable
+data.
+"""
+import argparse
+import json
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Sequence
+
+from sqlalchemy import func, select
+from sqlalchemy.engine import Connection
+
+from app.db import search_index
+from app.db.bulk import insert_rows
+from app.db.database import SessionLocal, engine
+
+DEFAULT_PASSWORD = "generated-password"
+DEFAULT_PREFIX = "gen-"
+EMAIL_DOMAIN = "example.com"
+
+# Distinct bcrypt hashes (different salts) shared by all generated users
+HASH_VARIANTS = 4
+
+# Weighted the way a real inventory looks: mostly running, a few regions
+STATUS_WEIGHTS = {"Running": 70, "Stopped": 15, "Pending": 8, "Deploying": 4, "Failed": 3}
+REGION_WEIGHTS = {
+    "East US": 28, "West Europe": 18, "East US 2": 12, "Southeast Asia": 10, "West US 2": 9,
+    "Central India": 8, "North Europe": 6, "Japan East": 4, "Australia East": 3, "Brazil South": 2,
+}
+ICON_WEIGHTS = {
+    "server": 30, "database": 15, "globe": 12, "cloud": 10, "hard_drive": 8, "network": 7,
+    "shield": 5, "lock": 4, "key": 3, "activity": 3, "link": 2, "boxes": 1,
+}
+THEME_PRIMARY_COLORS = ("#0078d4", "#107c10", "#d83b01", "#5c2d91", "#008272", "#e3008c")
+
+PROGRESS_INTERVAL_SECONDS = 5.0
+
+
+class _Weighted:
+    """Fast repeated weighted choice from a dict of value -> weight"""
+
+    def __init__(self, weights: Dict[str, int]):
+        self.values = list(weights)
+        self.cumulative = []
+        total = 0
+        for value in self.values:
+            total += weights[value]
+            self.cumulative.append(total)
+
+    def sample(self, rng: random.Random, k: int) -> List[str]:
+        return rng.choices(self.values, cum_weights=self.cumulative, k=k)
+
+
+def _batches(start: int, stop: int, size: int) -> Iterable[range]:
+    for first in range(start, stop, size):
+        yield range(first, min(stop, first + size))
+
+
+class _Progress:
+    def __init__(self, label: str, total: int):
+        self.label = label
+        self.total = total
+        self.done = 0
+        self.started = time.perf_counter()
+        self.reported = self.started
+
+    def add(self, count: int) -> None:
+        self.done += count
+        now = time.perf_counter()
+        if now - self.reported >= PROGRESS_INTERVAL_SECONDS:
+            print(f"ℹ️  {self.label}: {self.done}/{self.total} ({self.done / (now - self.started):.0f} rows/s)")
+            self.reported = now
+
+    def finish(self) -> dict:
+        seconds = time.perf_counter() - self.started
+        rate = self.done / seconds if seconds else 0.0
+        print(f"✅ {self.label}: {self.done} rows in {seconds:.1f} s ({rate:.0f} rows/s)")
+        return {"rows": self.done, "seconds": round(seconds, 2), "rows_per_second": round(rate, 1)}
+
+
+def _prepare(conn: Connection) -> None:
+    if conn.dialect.name == "sqlite":
+        # Generated data can be regenerated; skip fsync per batch
+        conn.exec_driver_sql("PRAGMA synchronous = OFF")
+
+
+def existing_generated_users(prefix: str = DEFAULT_PREFIX) -> int:
+    from app.models.user import User
+    with engine.connect() as conn:
+        return conn.execute(
+            select(func.count(User.id)).where(User.email.like(f"{prefix}%@{EMAIL_DOMAIN}"))
+        ).scalar()
+
+
+def generate_users(count: int, prefix: str = DEFAULT_PREFIX, password: str = DEFAULT_PASSWORD,
+                   themes: float = 0.0, batch_size: int = 5000, seed: Optional[int] = None,
+                   password_hashes: Optional[Sequence[str]] = None) -> dict:
+    """Add ``count`` users numbered after the existing ``prefix`` users; ``themes`` is the
+    fraction of them that get a saved theme"""
+    from app.core.security import get_password_hash
+    from app.models.user import User, UserRole, UserTheme
+
+    rng = random.Random(seed)
+    first = existing_generated_users(prefix)
+    hashes = list(password_hashes or [get_password_hash(password) for _ in range(HASH_VARIANTS)])
+    users, user_themes = User.__table__, UserTheme.__table__
+    signup_start = datetime.utcnow() - timedelta(days=730)
+    signup_step = timedelta(days=730) / max(first + count, 1)
+    progress = _Progress("users", count)
+    theme_count = 0
+
+    for batch in _batches(first, first + count, batch_size):
+        rows = [
+            {
+                "email": f"{prefix}{n}@{EMAIL_DOMAIN}",
+                "hashed_password": hashes[n % len(hashes)],
+                "display_name": f"Generated User {n}",
+                "tagline": None if rng.random() < 0.6 else "Cloud engineer",
+                "role": UserRole.user,
+                "is_protected": False,
+                "created_at": signup_start + signup_step * n,
+            }
+            for n in batch
+        ]
+        with engine.begin() as conn:
+            _prepare(conn)
+            before = conn.execute(select(func.coalesce(func.max(users.c.id), 0))).scalar()
+            insert_rows(conn, users, rows)
+            if themes > 0:
+                new_ids = conn.execute(
+                    select(users.c.id).where(users.c.id > before, users.c.email.like(f"{prefix}%"))
+                ).scalars().all()
+                theme_rows = [
+                    {
+                        "user_id": str(user_id),
+                        "payload": json.dumps({
+                            "primary": rng.choice(THEME_PRIMARY_COLORS),
+                            "mode": "dark" if rng.random() < 0.35 else "light",
+                        }, separators=(",", ":")),
+                    }
+                    for user_id in new_ids if rng.random() < themes
+                ]
+                insert_rows(conn, user_themes, theme_rows)
+                theme_count += len(theme_rows)
+        progress.add(len(rows))
+
+    return {**progress.finish(), "themes": theme_count}
+
+
+def generate_resources(count: int, owner_id: Optional[int] = None, batch_size: int = 5000,
+                       seed: Optional[int] = None, days: int = 365) -> dict:
+    """Add ``count`` resources owned by ``owner_id`` (default: the resource owner admin)"""
+    from app.core.templates import get_catalog
+    from app.db.resource_owner import resolve_resource_owner_id
+    from app.models.resource import Resource
+
+    if owner_id is None:
+        with SessionLocal() as db:
+            owner_id = resolve_resource_owner_id(db)
+        if owner_id is None:
+            raise RuntimeError("No admin user to own the resources; run python -m app.db.bootstrap first")
+
+    rng = random.Random(seed)
+    templates = get_catalog().rows
+    statuses, regions, icons = (_Weighted(w) for w in (STATUS_WEIGHTS, REGION_WEIGHTS, ICON_WEIGHTS))
+    resources = Resource.__table__
+    with engine.connect() as conn:
+        first = conn.execute(select(func.count(resources.c.id))).scalar()
+    now = datetime.utcnow()
+    window = days * 86400
+    progress = _Progress("resources", count)
+
+    for batch in _batches(first, first + count, batch_size):
+        k = len(batch)
+        batch_statuses, batch_regions, batch_icons = statuses.sample(rng, k), regions.sample(rng, k), icons.sample(rng, k)
+        rows = []
+        for i, n in enumerate(batch):
+            template = templates[rng.randrange(len(templates))]
+            # Skewed towards recent resources, like a growing inventory
+            created = now - timedelta(seconds=window * rng.random() ** 2)
+            region = batch_regions[i]
+            rows.append({
+                "user_id": str(owner_id),
+                "icon": batch_icons[i],
+                "title": f"{template['title']} {n}",
+                "resource_name": f"{template['resource_name']}-{region.replace(' ', '').lower()}-{n}"[:200],
+                "description": template["description"] if rng.random() < 0.9 else None,
+                "status": batch_statuses[i],
+                "region": region,
+                "created_at": created,
+                "updated_at": created + (now - created) * rng.random() ** 3,
+            })
+        with engine.begin() as conn:
+            _prepare(conn)
+            before = conn.execute(select(func.coalesce(func.max(resources.c.id), 0))).scalar()
+            insert_rows(conn, resources, rows)
+            search_index.index_resources_after(conn, before)
+        progress.add(k)
+
+    return progress.finish()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m app.db.generate", description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--users", type=int, default=0, help="users to add")
+    parser.add_argument("--resources", type=int, default=0, help="resources to add")
+    parser.add_argument("--themes", type=float, default=0.0, help="fraction of new users with a saved theme")
+    parser.add_argument("--prefix", default=DEFAULT_PREFIX, help=f"email prefix (default {DEFAULT_PREFIX})")
+    parser.add_argument("--password", default=DEFAULT_PASSWORD)
+    parser.add_argument("--owner-id", type=int, help="user id owning the resources (default: resource owner)")
+    parser.add_argument("--days", type=int, default=365, help="spread resource creation over this many days")
+    parser.add_argument("--batch-size", type=int, default=5000, help="rows per transaction")
+    parser.add_argument("--seed", type=int, help="random seed for repeatable data")
+    args = parser.parse_args(argv)
+
+    from app.db.bootstrap import bootstrap_database
+    bootstrap_database()
+    summary = {}
+    if args.users:
+        summary["users"] = generate_users(
+            args.users, prefix=args.prefix, password=args.password, themes=args.themes,
+            batch_size=args.batch_size, seed=args.seed
+        )
+    if args.resources:
+        summary["resources"] = generate_resources(
+            args.resources, owner_id=args.owner_id, batch_size=args.batch_size,
+            seed=args.seed, days=args.days
+        )
+    print(json.dumps(summary, indent=2))
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
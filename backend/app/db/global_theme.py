@@ -0,0 +1,69 @@
+"""Read-through cache of the global ThemeConfig keys, consistent across workers.
+
+Every worker keeps the global keys as a pre-serialized JSON bundle. Writes go
+through ``bump_cache_version(db, GLOBAL_THEME_CACHE)`` in the same transaction
+as the change; readers compare their bundle's version with the stamp in
+``cache_versions`` at most once per ``THEME_GLOBAL_POLL_SECONDS`` and rebuild
+it when it moved. A change is therefore visible in every worker within one
+poll interval, and in the writing worker immediately.
+"""
+import hashlib
+import json
+import threading
+import time
+from typing import Dict, Optional
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.db.cache_versions import get_cache_version
+from app.models.user import ThemeConfig
+
+GLOBAL_THEME_CACHE = "theme_global"
+
+# Per-user themes lived in theme_config before the user_theme table
+_USER_THEME_PREFIX = "user_theme_"
+
+
+class GlobalThemeBundle:
+    def __init__(self, version: int, config: Dict[str, str]):
+        self.version = version
+        self.config = config
+        self.body = json.dumps(config, separators=(",", ":"), sort_keys=True).encode()
+        self.etag = f'"{hashlib.sha1(b"%d|" % version + self.body).hexdigest()}"'
+
+
+_lock = threading.Lock()
+_bundle: Optional[GlobalThemeBundle] = None
+_checked_at = 0.0
+
+
+def fresh_bundle() -> Optional[GlobalThemeBundle]:
+    """The cached bundle if it was validated within the poll interval"""
+    if _bundle is not None and time.monotonic() - _checked_at < settings.THEME_GLOBAL_POLL_SECONDS:
+        return _bundle
+    return None
+
+
+def load_bundle(db: Session) -> GlobalThemeBundle:
+    """Validate the cached bundle against the DB stamp, rebuilding it if stale"""
+    global _bundle, _checked_at
+    bundle = fresh_bundle()
+    if bundle is not None:
+        return bundle
+
+    version = get_cache_version(db, GLOBAL_THEME_CACHE)
+    with _lock:
+        if _bundle is None or _bundle.version != version:
+            rows = (
+                db.query(ThemeConfig.config_key, ThemeConfig.config_value)
+                .filter(~ThemeConfig.config_key.startswith(_USER_THEME_PREFIX, autoescape=True))
+                .all()
+            )
+            _bundle = GlobalThemeBundle(version, {key: value for key, value in rows})
+        _checked_at = time.monotonic()
+        return _bundle
+
+
+def invalidate_local() -> None:
+    """Force the next read in this worker to re-check the DB stamp"""
+    global _checked_at
+    _checked_at = 0.0
@@ -0,0 +1,554 @@
+"""Versioned, forward-only schema migrations for SQLite and Azure SQL.
+
+Migrations are listed in ``app/db/schema_migrations.py``. Each one is applied
+in its own transaction and recorded in the ``schema_migrations`` table, so a
+failed step leaves neither partial DDL nor a version row behind. Operations
+check the live catalog first and are idempotent, which lets databases created
+by the old ad-hoc ``init_db`` adopt the migrations without special casing.
+
+``ResumableBackfill`` is the exception to the single transaction: it runs a
+resumable ``app.db.backfill`` job in keyset chunks, committing each chunk,
+after the migration's DDL has committed. The version is recorded only once
+the backfill finishes, and the job resumes from its checkpoint if
+interrupted. (``Backfill``, its checkpoint-less predecessor, stays for
+migration 2.)
+
+    python -m app.db.migrations             # apply pending migrations
+    python -m app.db.migrations --dry-run   # print the plan, change nothing
+    python -m app.db.migrations --status    # applied / pending versions
+"""
+import sys
+import textwrap
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Union
+
+from sqlalchemy import MetaData, func, select, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.schema import CreateIndex as CreateIndexDDL, CreateTable as CreateTableDDL
+
+from app.core.config import settings
+from app.db.database import Base, engine
+
+DialectSQL = Union[str, Dict[str, str]]
+
+
+class MigrationError(Exception):
+    pass
+
+
+def load_catalog(conn: Connection) -> dict:
+    """Columns and indexes of every table in one catalog round trip
+
+    Returns {table_name: {"columns": {column: data_type}, "indexes": {name}}};
+    tables that do not exist are absent.
+    """
+    catalog = {}
+    if conn.dialect.name == "mssql":
+        rows = conn.execute(text("""
+            SELECT TABLE_NAME, COLUMN_NAME, DATA_TYPE, 'column' AS kind
+            FROM INFORMATION_SCHEMA.COLUMNS WHERE TABLE_SCHEMA = SCHEMA_NAME()
+            UNION ALL
+            SELECT t.name, i.name, NULL, 'index'
+            FROM sys.indexes i JOIN sys.tables t ON t.object_id = i.object_id
+            WHERE i.name IS NOT NULL AND t.schema_id = SCHEMA_ID()
+        """))
+    else:
+        rows = conn.execute(text("""
+            SELECT m.name, p.name, p.type, 'column' AS kind
+            FROM sqlite_master m JOIN pragma_table_info(m.name) p
+            WHERE m.type = 'table'
+            UNION ALL
+            SELECT tbl_name, name, NULL, 'index' FROM sqlite_master WHERE type = 'index'
+        """))
+    for table_name, name, data_type, kind in rows:
+        entry = catalog.setdefault(table_name, {"columns": {}, "indexes": set()})
+        if kind == "column":
+            entry["columns"][name] = (data_type or "").lower()
+        else:
+            entry["indexes"].add(name)
+    return catalog
+
+
+def _for_dialect(value: DialectSQL, dialect: str) -> str:
+    if isinstance(value, dict):
+        return value.get(dialect, value.get("default"))
+    return value
+
+
+class Operation:
+    """One schema change; ``statements`` is empty when the catalog already matches"""
+
+    transactional = True
+
+    def describe(self) -> str:
+        raise NotImplementedError
+
+    def statements(self, conn: Connection, catalog: dict) -> List[str]:
+        raise NotImplementedError
+
+    def apply(self, conn: Connection, catalog: dict) -> None:
+        for statement in self.statements(conn, catalog):
+            conn.exec_driver_sql(statement)
+
+    def warnings(self, catalog: dict) -> List[str]:
+        return []
+
+    def simulate(self, catalog: dict) -> None:
+        """Update ``catalog`` as if the operation had run (used by the dry-run plan)"""
+
+
+class CreateTables(Operation):
+    """Create model tables (with their indexes) that do not exist yet"""
+
+    def __init__(self, *table_names: str, foreign_keys: bool = True):
+        self.table_names = table_names
+        self.foreign_keys = foreign_keys
+
+    def describe(self) -> str:
+        return f"create tables {', '.join(self.table_names)} if missing"
+
+    def statements(self, conn, catalog):
+        statements = []
+        for name in self.table_names:
+            if name in catalog:
+                continue
+            table = Base.metadata.tables[name]
+            create = CreateTableDDL(table, include_foreign_key_constraints=None if self.foreign_keys else [])
+            statements.append(str(create.compile(dialect=conn.dialect)).strip())
+            for index in sorted(table.indexes, key=lambda index: index.name):
+                statements.append(str(CreateIndexDDL(index).compile(dialect=conn.dialect)).strip())
+        return statements
+
+    def simulate(self, catalog):
+        for name in self.table_names:
+            table = Base.metadata.tables[name]
+            catalog.setdefault(name, {
+                "columns": {column.name: "" for column in table.columns},
+                "indexes": {index.name for index in table.indexes},
+            })
+
+
+class AddColumn(Operation):
+    """ALTER TABLE ... ADD; a NOT NULL column needs a default so existing rows stay valid"""
+
+    def __init__(self, table: str, column: str, type_sql: DialectSQL,
+                 default: Optional[str] = None, nullable: bool = True):
+        if not nullable and default is None:
+            raise MigrationError(f"{table}.{column}: NOT NULL columns need a default")
+        self.table = table
+        self.column = column
+        self.type_sql = type_sql
+        self.default = default
+        self.nullable = nullable
+
+    def describe(self) -> str:
+        return f"add column {self.table}.{self.column}"
+
+    def statements(self, conn, catalog):
+        if self.column in catalog.get(self.table, {}).get("columns", {}):
+            return []
+        dialect = conn.dialect.name
+        parts = [_for_dialect(self.type_sql, dialect)]
+        if not self.nullable:
+            parts.append("NOT NULL")
+        if self.default is not None:
+            if dialect == "mssql":
+                # Named constraint; with a constant default Azure SQL adds the
+                # column as a metadata-only change instead of rewriting rows
+                parts.append(f"CONSTRAINT DF_{self.table}_{self.column} DEFAULT {self.default}")
+            else:
+                parts.append(f"DEFAULT {self.default}")
+        keyword = "ADD" if dialect == "mssql" else "ADD COLUMN"
+        return [f"ALTER TABLE {self.table} {keyword} {self.column} {' '.join(parts)}"]
+
+    def simulate(self, catalog):
+        catalog.setdefault(self.table, {"columns": {}, "indexes": set()})["columns"].setdefault(self.column, "")
+
+
+class CreateIndex(Operation):
+    """CREATE INDEX, built ONLINE on Azure SQL so reads and writes continue meanwhile"""
+
+    def __init__(self, name: str, table: str, columns: Sequence[str], unique: bool = False):
+        self.name = name
+        self.table = table
+        self.columns = columns
+        self.unique = unique
+
+    def describe(self) -> str:
+        return f"create index {self.name} on {self.table}({', '.join(self.columns)})"
+
+    def statements(self, conn, catalog):
+        if self.name in catalog.get(self.table, {}).get("indexes", set()):
+            return []
+        unique = "UNIQUE " if self.unique else ""
+        statement = f"CREATE {unique}INDEX {self.name} ON {self.table} ({', '.join(self.columns)})"
+        if conn.dialect.name == "mssql" and settings.MIGRATIONS_ONLINE_INDEXES:
+            statement += " WITH (ONLINE = ON)"
+        return [statement]
+
+    def simulate(self, catalog):
+        catalog.setdefault(self.table, {"columns": {}, "indexes": set()})["indexes"].add(self.name)
+
+
+class RebuildTable(Operation):
+    """Recreate a model table whose ``column`` type has drifted, keeping its rows
+
+    For type changes ALTER COLUMN cannot make on both engines (an INTEGER
+    PRIMARY KEY is the rowid on SQLite). Rows are copied into a new table with
+    ``CAST(column AS <model type>)``, then the old table is dropped; like
+    ``CreateTables(foreign_keys=False)`` the new table has no foreign keys.
+    """
+
+    def __init__(self, table: str, column: str, data_types: Sequence[str]):
+        self.table = table
+        self.column = column
+        self.data_types = data_types
+
+    def describe(self) -> str:
+        return f"rebuild {self.table} unless {self.column} is {', '.join(self.data_types)}"
+
+    def statements(self, conn, catalog):
+        columns = catalog.get(self.table, {}).get("columns")
+        if not columns or columns.get(self.column, "").startswith(tuple(self.data_types)):
+            return []
+        table = Base.metadata.tables[self.table]
+        staging = f"{self.table}_rebuild"
+        create = CreateTableDDL(table.to_metadata(MetaData(), name=staging), include_foreign_key_constraints=[])
+        names = [column.name for column in table.columns if column.name in columns]
+        values = [
+            f"CAST({name} AS {table.c[name].type.compile(dialect=conn.dialect)})" if name == self.column else name
+            for name in names
+        ]
+        if conn.dialect.name == "mssql":
+            rename = f"EXEC sp_rename '{staging}', '{self.table}'"
+        else:
+            rename = f"ALTER TABLE {staging} RENAME TO {self.table}"
+        copy = f"INSERT INTO {staging} ({', '.join(names)}) SELECT {', '.join(values)} FROM {self.table}"
+        if conn.dialect.name == "mssql" and table.autoincrement_column is not None:
+            # Keep the ids of an IDENTITY key
+            copy = f"SET IDENTITY_INSERT {staging} ON; {copy}; SET IDENTITY_INSERT {staging} OFF"
+        statements = [
+            str(create.compile(dialect=conn.dialect)).strip(),
+            copy,
+            f"DROP TABLE {self.table}",
+            rename,
+        ]
+        for index in sorted(table.indexes, key=lambda index: index.name):
+            statements.append(str(CreateIndexDDL(index).compile(dialect=conn.dialect)).strip())
+        return statements
+
+    def simulate(self, catalog):
+        columns = catalog.get(self.table, {}).get("columns")
+        if columns is not None:
+            columns[self.column] = self.data_types[0]
+
+
+class RunSQL(Operation):
+    """Data or DDL statements with no catalog check; keep them idempotent
+
+    A statement given as a dict with no entry for the dialect (and no
+    ``default``) is skipped there.
+    """
+
+    def __init__(self, description: str, *statements: DialectSQL):
+        self.description = description
+        self.sql = statements
+
+    def describe(self) -> str:
+        return self.description
+
+    def statements(self, conn, catalog):
+        statements = (_for_dialect(statement, conn.dialect.name) for statement in self.sql)
+        return [textwrap.dedent(statement).strip() for statement in statements if statement]
+
+
+class RunPython(Operation):
+    """Data step written in Python, run in the migration's transaction; keep it idempotent"""
+
+    def __init__(self, description: str, function: Callable[[Connection], None]):
+        self.description = description
+        self.function = function
+
+    def describe(self) -> str:
+        return self.description
+
+    def statements(self, conn, catalog):
+        return [f"-- {self.function.__module__}.{self.function.__name__}(conn)"]
+
+    def apply(self, conn, catalog):
+        self.function(conn)
+
+
+class ExpectColumn(Operation):
+    """Warn about drift that needs a hand-written migration; never drops data"""
+
+    def __init__(self, table: str, column: str, data_types: Sequence[str] = ()):
+        self.table = table
+        self.column = column
+        self.data_types = data_types
+
+    def describe(self) -> str:
+        return f"check {self.table}.{self.column}"
+
+    def statements(self, conn, catalog):
+        return []
+
+    def warnings(self, catalog):
+        columns = catalog.get(self.table, {}).get("columns")
+        if columns is None:
+            return []
+        data_type = columns.get(self.column)
+        if data_type is None:
+            return [f"{self.table}.{self.column} is missing; this table needs a manual migration"]
+        if self.data_types and not data_type.startswith(tuple(self.data_types)):
+            return [
+                f"{self.table}.{self.column} is {data_type}, expected one of "
+                f"{', '.join(self.data_types)}; this table needs a manual migration"
+            ]
+        return []
+
+    def apply(self, conn, catalog):
+        for warning in self.warnings(catalog):
+            print(f"⚠️  {warning}")
+
+
+class Backfill(Operation):
+    """UPDATE rows matching ``where`` in primary-key batches, one commit per batch
+
+    Kept for migration 2; new migrations use ``ResumableBackfill``.
+    """
+
+    transactional = False
+
+    def __init__(self, table: str, set_sql: str, where: str, pk: str = "id",
+                 batch_size: Optional[int] = None):
+        self.table = table
+        self.set_sql = set_sql
+        self.where = where
+        self.pk = pk
+        self.batch_size = batch_size
+
+    def describe(self) -> str:
+        return f"backfill {self.table} SET {self.set_sql} WHERE {self.where}"
+
+    def _batch_sql(self, dialect: str, batch_size: int) -> str:
+        if dialect == "mssql":
+            subquery = f"SELECT TOP ({batch_size}) {self.pk} FROM {self.table} WHERE {self.where} ORDER BY {self.pk}"
+        else:
+            subquery = f"SELECT {self.pk} FROM {self.table} WHERE {self.where} ORDER BY {self.pk} LIMIT {batch_size}"
+        return f"UPDATE {self.table} SET {self.set_sql} WHERE {self.pk} IN ({subquery})"
+
+    def statements(self, conn, catalog):
+        batch_size = self.batch_size or settings.MIGRATIONS_BACKFILL_BATCH_SIZE
+        return [self._batch_sql(conn.dialect.name, batch_size)]
+
+    def run(self) -> dict:
+        batch_size = self.batch_size or settings.MIGRATIONS_BACKFILL_BATCH_SIZE
+        statement = self._batch_sql(engine.dialect.name, batch_size)
+        started = time.perf_counter()
+        total = chunks = 0
+        while True:
+            # Short transactions keep row locks brief on a live database
+            with engine.begin() as conn:
+                updated = conn.exec_driver_sql(statement).rowcount
+            total += updated
+            chunks += 1
+            if updated < batch_size:
+                seconds = time.perf_counter() - started
+                return {
+                    "rows": total, "chunks": chunks,
+                    "rows_per_second": round(total / seconds, 1) if seconds else 0.0,
+                }
+
+
+class ResumableBackfill(Operation):
+    """Resumable keyset-chunked UPDATE (app.db.backfill), one commit per chunk
+
+    Its checkpoints live in backfill_checkpoints, created by migration 8.
+    """
+
+    transactional = False
+
+    def __init__(self, name: str, table: str, set_sql: str, where: Optional[str] = None, **options):
+        from app.db.backfill import BackfillJob
+        self.job = BackfillJob(name, table, set_sql=set_sql, where=where, **options)
+
+    def describe(self) -> str:
+        return self.job.describe()
+
+    def statements(self, conn, catalog):
+        return self.job.plan_sql(conn.dialect.name)
+
+    def run(self) -> dict:
+        return self.job.run()
+
+
+class Migration:
+    def __init__(self, version: int, name: str, operations: List[Operation]):
+        self.version = version
+        self.name = name
+        self.operations = operations
+
+
+@contextmanager
+def _migration_transaction() -> Iterator[Connection]:
+    """Transaction holding an exclusive migration lock, so concurrent workers apply each step once"""
+    with engine.connect() as conn:
+        try:
+            if conn.dialect.name == "sqlite":
+                # pysqlite does not BEGIN before DDL on its own; IMMEDIATE takes the write lock
+                conn.exec_driver_sql("BEGIN IMMEDIATE")
+            elif conn.dialect.name == "mssql":
+                conn.exec_driver_sql(
+                    "EXEC sp_getapplock @Resource = 'schema_migrations', @LockMode = 'Exclusive', "
+                    "@LockOwner = 'Transaction', @LockTimeout = 60000"
+                )
+            yield conn
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+
+
+def _ensure_migrations_table() -> None:
+    from app.models.meta import SchemaMigration
+    with _migration_transaction() as conn:
+        SchemaMigration.__table__.create(bind=conn, checkfirst=True)
+
+
+def _applied_versions(conn: Connection) -> set:
+    from app.models.meta import SchemaMigration
+    return set(conn.execute(select(SchemaMigration.version)).scalars())
+
+
+def _record(conn: Connection, migration: Migration, started: float) -> None:
+    from app.models.meta import SchemaMigration
+    conn.execute(SchemaMigration.__table__.insert().values(
+        version=migration.version,
+        name=migration.name,
+        duration_ms=int((time.perf_counter() - started) * 1000)
+    ))
+
+
+def _validate(migrations: List[Migration]) -> None:
+    versions = [migration.version for migration in migrations]
+    if versions != sorted(set(versions)):
+        raise MigrationError("Migration versions must be unique and in ascending order")
+
+
+def current_version() -> Optional[int]:
+    """Highest applied migration, or None when the migrations table does not exist yet"""
+    from app.models.meta import SchemaMigration
+    try:
+        with engine.connect() as conn:
+            return conn.execute(select(func.max(SchemaMigration.version))).scalar()
+    except SQLAlchemyError:
+        return None
+
+
+def latest_version() -> int:
+    from app.db.schema_migrations import MIGRATIONS
+    return MIGRATIONS[-1].version if MIGRATIONS else 0
+
+
+def plan(migrations: Optional[List[Migration]] = None) -> List[str]:
+    """SQL the pending migrations would run against the current database"""
+    from app.db.schema_migrations import MIGRATIONS
+    migrations = MIGRATIONS if migrations is None else migrations
+    _validate(migrations)
+    lines = []
+    with engine.connect() as conn:
+        catalog = load_catalog(conn)
+        applied = set()
+        if "schema_migrations" in catalog:
+            applied = _applied_versions(conn)
+        for migration in migrations:
+            if migration.version in applied:
+                continue
+            lines.append(f"-- {migration.version}: {migration.name}")
+            for operation in migration.operations:
+                statements = operation.statements(conn, catalog)
+                lines.extend(f"--   WARNING: {warning}" for warning in operation.warnings(catalog))
+                if not statements:
+                    lines.append(f"--   {operation.describe()}: nothing to do")
+                elif not operation.transactional:
+                    lines.append("--   in chunks, one transaction each, until no rows are left:")
+                lines.extend(f"{statement};" for statement in statements)
+                operation.simulate(catalog)
+        conn.rollback()
+    return lines
+
+
+def _apply(migration: Migration) -> bool:
+    """Apply one migration; False if another worker already had"""
+    started = time.perf_counter()
+    backfills = [op for op in migration.operations if not op.transactional]
+    with _migration_transaction() as conn:
+        # Re-read under the lock: another worker may have just applied it
+        if migration.version in _applied_versions(conn):
+            return False
+        catalog = load_catalog(conn)
+        for operation in migration.operations:
+            if operation.transactional:
+                operation.apply(conn, catalog)
+        if not backfills:
+            _record(conn, migration, started)
+    if backfills:
+        for backfill in backfills:
+            result = backfill.run()
+            print(
+                f"ℹ️  {backfill.describe()}: {result['rows']} rows in {result['chunks']} chunks, "
+                f"{result['rows_per_second']} rows/s"
+            )
+        with _migration_transaction() as conn:
+            if migration.version not in _applied_versions(conn):
+                _record(conn, migration, started)
+    return True
+
+
+def migrate(migrations: Optional[List[Migration]] = None) -> List[int]:
+    """Apply pending migrations in order; returns the versions applied
+
+    Stops at the first failing migration with a MigrationError naming it;
+    the later ones are left pending.
+    """
+    from app.db.schema_migrations import MIGRATIONS
+    migrations = MIGRATIONS if migrations is None else migrations
+    _validate(migrations)
+    _ensure_migrations_table()
+    applied_now = []
+    for migration in migrations:
+        try:
+            if not _apply(migration):
+                continue
+        except Exception as e:
+            raise MigrationError(f"Migration {migration.version} ({migration.name}) failed: {e}") from e
+        applied_now.append(migration.version)
+        print(f"✅ Applied migration {migration.version}: {migration.name}")
+    return applied_now
+
+
+def status() -> List[str]:
+    from app.db.schema_migrations import MIGRATIONS
+    current = current_version()
+    applied = set()
+    if current is not None:
+        with engine.connect() as conn:
+            applied = _applied_versions(conn)
+    return [
+        f"{'applied' if migration.version in applied else 'pending':8} {migration.version:>4}  {migration.name}"
+        for migration in MIGRATIONS
+    ]
+
+
+if __name__ == "__main__":
+    import app.db.schema_migrations  # noqa: F401  (loads the models)
+    if "--dry-run" in sys.argv[1:]:
+        print("\n".join(plan()) or "-- nothing to do")
+    elif "--status" in sys.argv[1:]:
+        print("\n".join(status()))
+    else:
+        migrate()
+    engine.dispose()
@@ -0,0 +1,28 @@
+"""Column-projected selects for read-only list endpoints.
+
+``select_for(User, UserResponse)`` selects only the columns a response
+schema needs (never ``hashed_password``), in the schema's field order. The
+result rows are plain ``Row`` tuples: no identity map, no attribute
+instrumentation, no lazy loaders. ``ListSerializer`` turns them into dicts
+with ``Row._asdict()`` and validates the list once through its TypeAdapter
+(see app/api/serialization.py).
+"""
+from functools import lru_cache
+from typing import Tuple, Type
+from pydantic import BaseModel
+from sqlalchemy import Select, inspect, select
+
+
+@lru_cache(maxsize=None)
+def response_columns(model, schema: Type[BaseModel]) -> Tuple:
+    """Mapped columns of ``model`` named like the fields of ``schema``"""
+    mapped = inspect(model).columns
+    columns = tuple(getattr(model, name) for name in schema.model_fields if name in mapped)
+    if not columns:
+        raise ValueError(f"{schema.__name__} has no fields mapped on {model.__name__}")
+    return columns
+
+
+def select_for(model, schema: Type[BaseModel]) -> Select:
+    """SELECT of the response columns only; execute it and read rows with ``.all()``"""
+    return select(*response_columns(model, schema))
@@ -0,0 +1,175 @@
+"""Opt-in query auditor for development and CI.
+
+With ``QUERY_AUDIT_ENABLED=true`` every request gets a ``QueryAudit`` that
+collects the fingerprints of the statements issued through ``SessionLocal``'s
+engine. At the end of the request it warns about fingerprints repeated more
+than ``QUERY_AUDIT_REPEAT_THRESHOLD`` times (the usual N+1 shape, e.g. a lazy
+``User.resources`` load per row). Statements slower than
+``QUERY_AUDIT_SLOW_MS`` are logged right away with the shape of their bind
+parameters; the values themselves are never logged.
+
+Tests can bound the query count of an endpoint without enabling the auditor
+(``tests/conftest.py`` registers the fixture; see ``tests/test_query_budgets.py``)::
+
+    def test_admin_user_list(client, admin, max_queries):
+        with max_queries(2):
+            client.get("/api/admin/users", headers=admin["headers"])
+"""
+import re
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+from app.db.database import SessionLocal
+
+_WHITESPACE = re.compile(r"\s+")
+_NUMBER = re.compile(r"\b\d+(\.\d+)?\b")
+_STRING = re.compile(r"'(?:[^']|'')*'")
+# Expanded IN lists (?, ?, ?) / (%(p_1)s, %(p_2)s) differ only by length
+_PARAM_LIST = re.compile(r"\((\s*(\?|%\(\w+\)s|:\w+)\s*,)+\s*(\?|%\(\w+\)s|:\w+)\s*\)")
+
+
+def fingerprint(statement: str) -> str:
+    """Normalize a statement so executions that differ only by values compare equal"""
+    text = _WHITESPACE.sub(" ", statement).strip()
+    text = _STRING.sub("?", text)
+    text = _NUMBER.sub("?", text)
+    return _PARAM_LIST.sub("(?...)", text)
+
+
+def bind_shape(parameters, executemany: bool) -> str:
+    """Types of the bind parameters, e.g. "(int, str)" or "100 x (int, str)" """
+    if executemany:
+        rows = list(parameters or [])
+        return f"{len(rows)} x {bind_shape(rows[0], False)}" if rows else "0 x ()"
+    if isinstance(parameters, dict):
+        return "{" + ", ".join(f"{key}: {type(value).__name__}" for key, value in parameters.items()) + "}"
+    return "(" + ", ".join(type(value).__name__ for value in (parameters or ())) + ")"
+
+
+class QueryAudit:
+    """Statements seen while the audit was active"""
+
+    def __init__(self):
+        self.statements: List[Tuple[str, float]] = []
+        self._lock = threading.Lock()
+
+    def record(self, statement: str, seconds: float) -> None:
+        with self._lock:
+            self.statements.append((fingerprint(statement), seconds))
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    def repeated(self, threshold: int) -> List[Tuple[str, int]]:
+        """Fingerprints executed more than ``threshold`` times, most frequent first"""
+        counts = Counter(sql for sql, _ in self.statements)
+        return [(sql, n) for sql, n in counts.most_common() if n > threshold]
+
+    def report(self) -> str:
+        counts = Counter(sql for sql, _ in self.statements)
+        return "\n".join(f"  {n}x {sql}" for sql, n in counts.most_common())
+
+
+# Per-request audit (follows the request into threadpool workers) ...
+_request_audit: ContextVar[Optional[QueryAudit]] = ContextVar("query_audit", default=None)
+# ... and process-wide audits for tests, whose client runs the app on another thread
+_global_audits: List[QueryAudit] = []
+_global_lock = threading.Lock()
+_installed_engines = set()
+
+
+def install(engine: Optional[Engine] = None) -> None:
+    """Attach the auditor to an engine (SessionLocal's by default); idempotent"""
+    engine = engine or SessionLocal.kw["bind"]
+    if id(engine) in _installed_engines:
+        return
+    _installed_engines.add(id(engine))
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info["audit_query_start"] = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        started = conn.info.pop("audit_query_start", None)
+        seconds = time.perf_counter() - started if started is not None else 0.0
+        audit = _request_audit.get()
+        if audit is not None:
+            audit.record(statement, seconds)
+        if _global_audits:
+            with _global_lock:
+                for global_audit in _global_audits:
+                    global_audit.record(statement, seconds)
+        if settings.QUERY_AUDIT_ENABLED and seconds * 1000 >= settings.QUERY_AUDIT_SLOW_MS:
+            print(
+                f"⚠️  Slow query ({seconds * 1000:.1f} ms, binds {bind_shape(parameters, executemany)}): "
+                f"{fingerprint(statement)[:500]}"
+            )
+
+
+@contextmanager
+def audit_queries() -> Iterator[QueryAudit]:
+    """Collect every statement issued by any thread while the block runs"""
+    install()
+    audit = QueryAudit()
+    with _global_lock:
+        _global_audits.append(audit)
+    try:
+        yield audit
+    finally:
+        with _global_lock:
+            _global_audits.remove(audit)
+
+
+@contextmanager
+def assert_max_queries(limit: int) -> Iterator[QueryAudit]:
+    """Fail with the statement breakdown if the block issues more than ``limit`` queries"""
+    with audit_queries() as audit:
+        yield audit
+    if audit.count > limit:
+        raise AssertionError(f"Expected at most {limit} queries, got {audit.count}:\n{audit.report()}")
+
+
+class QueryAuditMiddleware:
+    """Warns about repeated statements (likely N+1) per request"""
+
+    def __init__(self, app, threshold: int):
+        self.app = app
+        self.threshold = threshold
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        audit = QueryAudit()
+        token = _request_audit.set(audit)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _request_audit.reset(token)
+            for sql, count in audit.repeated(self.threshold):
+                print(
+                    f"⚠️  Possible N+1 on {scope['method']} {scope['path']}: "
+                    f"{count}x {sql[:300]}"
+                )
+
+
+try:
+    import pytest
+except ImportError:
+    pytest = None
+
+if pytest is not None:
+    @pytest.fixture
+    def max_queries():
+        """``with max_queries(n): ...`` fails the test if the block runs more than n queries"""
+        return assert_max_queries
@@ -0,0 +1,197 @@
+"""Background import of resources from CSV or NDJSON uploads.
+
+POST /api/resources/import spools the upload to ``IMPORT_UPLOAD_DIR`` and
+records a ``ResourceImportJob``. ``run_import`` then runs as a background task:
+it parses the file incrementally, validates each row against
+``ResourceCreate`` and commits every ``IMPORT_BATCH_ROWS`` rows together with
+the job's progress. An invalid row is recorded with its line number (up to
+``IMPORT_MAX_ERRORS`` of them) and skipped; it never aborts the file.
+Clients poll GET /api/resources/import/{job_id}, which any worker can answer.
+
+A job interrupted by a restart stays "running"; the rows committed before
+the interruption remain, and the file has to be uploaded again.
+"""
+import codecs
+import csv
+import json
+import os
+import shutil
+import tempfile
+from datetime import datetime
+from typing import BinaryIO, Iterator, List, Optional, Tuple
+
+from pydantic import ValidationError
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db import search_index
+from app.db.bulk import insert_rows
+from app.db.database import engine
+from app.models.resource import Resource, ResourceImportJob
+from app.schemas.resource import ResourceCreate
+
+STATUS_QUEUED = "queued"
+STATUS_RUNNING = "running"
+STATUS_DONE = "done"
+STATUS_FAILED = "failed"
+
+IMPORT_FORMATS = ("csv", "ndjson")
+_EXTENSIONS = {".csv": "csv", ".ndjson": "ndjson", ".jsonl": "ndjson"}
+
+# Copy uploads in 1 MB blocks
+_COPY_BUFFER = 1024 * 1024
+
+
+def detect_format(filename: Optional[str], content_type: Optional[str]) -> Optional[str]:
+    """csv or ndjson from the file extension, then the content type"""
+    extension = os.path.splitext(filename or "")[1].lower()
+    if extension in _EXTENSIONS:
+        return _EXTENSIONS[extension]
+    content_type = (content_type or "").split(";")[0].strip().lower()
+    if content_type in ("text/csv", "application/csv"):
+        return "csv"
+    if content_type in ("application/x-ndjson", "application/jsonl", "application/json-seq"):
+        return "ndjson"
+    return None
+
+
+def spool_upload(source: BinaryIO) -> Tuple[str, int]:
+    """Copy an upload to a file the background job owns; returns (path, size)"""
+    fd, path = tempfile.mkstemp(prefix="resource-import-", dir=settings.IMPORT_UPLOAD_DIR or None)
+    with os.fdopen(fd, "wb") as target:
+        shutil.copyfileobj(source, target, _COPY_BUFFER)
+        size = target.tell()
+    return path, size
+
+
+def create_job(db: Session, user_id, filename: Optional[str], import_format: str,
+               bytes_total: int) -> ResourceImportJob:
+    job = ResourceImportJob(
+        user_id=str(user_id),
+        filename=(filename or "")[:255] or None,
+        format=import_format,
+        status=STATUS_QUEUED,
+        bytes_total=bytes_total
+    )
+    db.add(job)
+    db.commit()
+    db.refresh(job)
+    return job
+
+
+def _csv_records(f: BinaryIO) -> Iterator[Tuple[int, Optional[dict], Optional[str]]]:
+    reader = csv.DictReader(codecs.getreader("utf-8-sig")(f, errors="replace"))
+    for record in reader:
+        if None in record:
+            yield reader.line_num, None, f"{len(record[None])} more values than header columns"
+            continue
+        # Empty cells fall back to the schema defaults
+        yield reader.line_num, {key: value for key, value in record.items() if value not in ("", None)}, None
+
+
+def _ndjson_records(f: BinaryIO) -> Iterator[Tuple[int, Optional[dict], Optional[str]]]:
+    for line_number, raw in enumerate(f, start=1):
+        if not raw.strip():
+            continue
+        try:
+            record = json.loads(raw)
+        except ValueError as e:
+            yield line_number, None, f"invalid JSON: {e}"
+            continue
+        if not isinstance(record, dict):
+            yield line_number, None, "expected a JSON object"
+            continue
+        yield line_number, record, None
+
+
+def _validation_message(error: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in detail['loc']) or 'row'}: {detail['msg']}"
+        for detail in error.errors()
+    )
+
+
+class _ImportBatch:
+    def __init__(self, job_id: int, owner_id):
+        self.job_id = job_id
+        self.owner_id = str(owner_id)
+        self.rows: List[dict] = []
+        self.errors: List[dict] = []
+        self.new_errors = False
+        self.rows_done = 0
+        self.rows_imported = 0
+        self.rows_failed = 0
+
+    def add(self, line: int, record: Optional[dict], error: Optional[str]) -> None:
+        self.rows_done += 1
+        if record is not None:
+            try:
+                item = ResourceCreate.model_validate(record)
+            except ValidationError as e:
+                error = _validation_message(e)
+            else:
+                now = datetime.utcnow()
+                row = item.model_dump(exclude={"created_at"})
+                row.update(user_id=self.owner_id, created_at=item.created_at or now, updated_at=now)
+                self.rows.append(row)
+                return
+        self.rows_failed += 1
+        if len(self.errors) < settings.IMPORT_MAX_ERRORS:
+            self.errors.append({"line": line, "error": error[:500]})
+            self.new_errors = True
+
+    def flush(self, bytes_done: int, **job_values) -> None:
+        """Insert the pending rows and record progress in one transaction"""
+        jobs = ResourceImportJob.__table__
+        values = {
+            "rows_done": self.rows_done,
+            "rows_imported": self.rows_imported + len(self.rows),
+            "rows_failed": self.rows_failed,
+            "bytes_done": bytes_done,
+            "updated_at": datetime.utcnow(),
+            **job_values,
+        }
+        if self.new_errors:
+            values["errors"] = json.dumps(self.errors)
+        resources = Resource.__table__
+        with engine.begin() as conn:
+            before = conn.execute(select(func.coalesce(func.max(resources.c.id), 0))).scalar()
+            insert_rows(conn, resources, self.rows)
+            search_index.index_resources_after(conn, before)
+            conn.execute(jobs.update().where(jobs.c.id == self.job_id).values(**values))
+        self.rows_imported += len(self.rows)
+        self.rows = []
+        self.new_errors = False
+
+
+def run_import(job_id: int, path: str, owner_id, import_format: str) -> None:
+    """Import the spooled file into ``owner_id``'s resources (background task)"""
+    jobs = ResourceImportJob.__table__
+    batch = _ImportBatch(job_id, owner_id)
+    try:
+        with engine.begin() as conn:
+            conn.execute(jobs.update().where(jobs.c.id == job_id).values(
+                status=STATUS_RUNNING, updated_at=datetime.utcnow()
+            ))
+        with open(path, "rb") as f:
+            records = _csv_records(f) if import_format == "csv" else _ndjson_records(f)
+            for line, record, error in records:
+                batch.add(line, record, error)
+                if batch.rows_done % settings.IMPORT_BATCH_ROWS == 0:
+                    batch.flush(f.tell())
+            batch.flush(f.tell(), status=STATUS_DONE, finished_at=datetime.utcnow())
+        print(f"✅ Resource import {job_id}: {batch.rows_imported} rows imported, {batch.rows_failed} failed")
+    except Exception as e:
+        print(f"⚠️  Resource import {job_id} failed: {str(e)[:200]}")
+        with engine.begin() as conn:
+            conn.execute(jobs.update().where(jobs.c.id == job_id).values(
+                status=STATUS_FAILED, message=str(e)[:500],
+                rows_done=batch.rows_done, rows_imported=batch.rows_imported,
+                rows_failed=batch.rows_failed, finished_at=datetime.utcnow(), updated_at=datetime.utcnow()
+            ))
+    finally:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
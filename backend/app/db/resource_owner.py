@@ -0,0 +1,37 @@
+from typing import Optional
+from sqlalchemy.orm import Session
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.models.user import User, UserRole
+
+# Non-admin users see the resources of one admin, the "resource owner".
+# Resolving it is one query, so the result is kept in-process and refreshed
+# whenever the admin set changes (the TTL covers changes made by other workers).
+_OWNER_KEY = "resource_owner_id"
+_owner_cache = TTLCache(max_entries=1, ttl_seconds=settings.RESOURCE_OWNER_CACHE_TTL_SECONDS)
+
+
+def resolve_resource_owner_id(db: Session) -> Optional[int]:
+    """Return the id of the admin whose resources regular users see
+
+    The protected super admin wins; otherwise the oldest admin account, so the
+    choice is stable when several admins exist.
+    """
+    cached = _owner_cache.get(_OWNER_KEY)
+    if cached is not None:
+        return cached[0]
+
+    row = (
+        db.query(User.id)
+        .filter(User.role == UserRole.admin)
+        .order_by(User.is_protected.desc(), User.id.asc())
+        .first()
+    )
+    owner_id = row.id if row else None
+    _owner_cache.set(_OWNER_KEY, (owner_id,))
+    return owner_id
+
+
+def invalidate_resource_owner() -> None:
+    """Forget the cached owner; call after the set of admins changes"""
+    _owner_cache.clear()
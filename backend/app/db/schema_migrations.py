@@ -0,0 +1,124 @@
+"""Ordered schema migrations; append new ones, never edit applied ones.
+
+Versions 1-3 reproduce what the old init_db checked on every boot, so existing
+databases adopt them as no-ops (apart from the is_protected backfill) while
+fresh databases get the full schema.
+"""
+from app.db.migrations import (
+    AddColumn, Backfill, CreateIndex, CreateTables, ExpectColumn, Migration, RebuildTable, ResumableBackfill,
+    RunPython, RunSQL
+)
+from app.db import search_index
+
+# Import every model so Base.metadata knows the tables CreateTables refers to
+import app.models.meta  # noqa: F401
+import app.models.resource  # noqa: F401
+import app.models.user  # noqa: F401
+
+MIGRATIONS = [
+    Migration(1, "base_tables", [
+        CreateTables("users", "theme_config", "token_versions"),
+        # users.id is INT but resources.user_id is VARCHAR(36); Azure SQL
+        # rejects a foreign key between them, so the table is created without it
+        CreateTables("resources", foreign_keys=False),
+        # The old init_db dropped and recreated these tables on a mismatch
+        ExpectColumn("resources", "user_id", ("varchar", "nvarchar")),
+        ExpectColumn("theme_config", "config_key"),
+    ]),
+    Migration(2, "user_profile_columns", [
+        AddColumn("users", "display_name", "VARCHAR(100)"),
+        AddColumn("users", "tagline", "VARCHAR(200)"),
+        AddColumn("users", "bio", "VARCHAR(500)"),
+        AddColumn("users", "avatar_url", "VARCHAR(500)"),
+        AddColumn("users", "is_protected", {"mssql": "BIT", "default": "BOOLEAN"}, default="0", nullable=False),
+        # Columns added by the old init_db were nullable and left NULL in existing rows
+        Backfill("users", "is_protected = 0", "is_protected IS NULL"),
+    ]),
+    Migration(3, "resource_list_indexes", [
+        # Keyset pagination, filters and sorting for GET /api/resources/
+        CreateIndex("ix_resources_user_created", "resources", ["user_id", "created_at", "id"]),
+        CreateIndex("ix_resources_user_updated", "resources", ["user_id", "updated_at", "id"]),
+        CreateIndex("ix_resources_user_title", "resources", ["user_id", "title", "id"]),
+        CreateIndex("ix_resources_user_status", "resources", ["user_id", "status"]),
+        CreateIndex("ix_resources_user_region", "resources", ["user_id", "region"]),
+        CreateIndex("ix_resources_user_icon", "resources", ["user_id", "icon"]),
+    ]),
+    Migration(4, "user_theme_table", [
+        # Keyed like resources.user_id, so no foreign key to users.id (see migration 1)
+        CreateTables("user_theme", foreign_keys=False),
+        # Move per-user themes out of the global theme_config key space. The
+        # keys were written from str(user.id): lowercase for UUIDs.
+        RunSQL(
+            "copy user_theme_<id> rows from theme_config",
+            {
+                "mssql": """
+                    INSERT INTO user_theme (user_id, payload, updated_at)
+                    SELECT LOWER(CONVERT(VARCHAR(36), u.id)), tc.config_value,
+                           COALESCE(tc.updated_at, tc.created_at, GETUTCDATE())
+                    FROM theme_config tc
+                    JOIN users u ON tc.config_key = 'user_theme_' + LOWER(CONVERT(VARCHAR(36), u.id))
+                    WHERE NOT EXISTS (
+                        SELECT 1 FROM user_theme ut WHERE ut.user_id = LOWER(CONVERT(VARCHAR(36), u.id))
+                    )
+                """,
+                "default": """
+                    INSERT INTO user_theme (user_id, payload, updated_at)
+                    SELECT CAST(u.id AS VARCHAR(36)), tc.config_value,
+                           COALESCE(tc.updated_at, tc.created_at, CURRENT_TIMESTAMP)
+                    FROM theme_config tc JOIN users u ON tc.config_key = 'user_theme_' || u.id
+                    WHERE NOT EXISTS (SELECT 1 FROM user_theme ut WHERE ut.user_id = CAST(u.id AS VARCHAR(36)))
+                """,
+            },
+            {
+                "mssql": """
+                    DELETE FROM theme_config WHERE config_key IN (
+                        SELECT 'user_theme_' + user_id FROM user_theme
+                    )
+                """,
+                "default": """
+                    DELETE FROM theme_config WHERE config_key IN (
+                        SELECT 'user_theme_' || user_id FROM user_theme
+                    )
+                """,
+            },
+        ),
+    ]),
+    Migration(5, "cache_versions", [
+        CreateTables("cache_versions"),
+    ]),
+    Migration(6, "resource_import_jobs", [
+        CreateTables("resource_import_jobs"),
+    ]),
+    Migration(7, "resource_search_index", [
+        # Azure SQL searches this word index; SQLite leaves it empty
+        CreateTables("resource_search_terms"),
+        RunSQL("create the resources_fts full-text table on SQLite", {
+            "sqlite": """
+                CREATE VIRTUAL TABLE IF NOT EXISTS resources_fts USING fts5(
+                    title, resource_name, description,
+                    tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3'
+                )
+            """,
+        }),
+        RunPython("index existing resources for search", search_index.rebuild),
+    ]),
+    Migration(8, "backfill_checkpoints", [
+        CreateTables("backfill_checkpoints"),
+        # Older builds created the table from app.db.backfill with an integer last_key
+        RebuildTable("backfill_checkpoints", "last_key", ("varchar", "nvarchar")),
+        # Checkpointed pass of the is_protected backfill; a no-op where migration 2 finished
+        ResumableBackfill("users_is_protected", "users", "is_protected = 0", "is_protected IS NULL"),
+    ]),
+    Migration(9, "string_keys", [
+        # users.id is a UUID on Azure SQL and older databases; tables created
+        # with INTEGER user ids could not hold them
+        RebuildTable("token_versions", "user_id", ("varchar", "nvarchar")),
+        RebuildTable("user_theme", "user_id", ("varchar", "nvarchar")),
+        # Where migration 8 ran before checkpoints stored the last key as text
+        RebuildTable("backfill_checkpoints", "last_key", ("varchar", "nvarchar")),
+    ]),
+    Migration(10, "import_job_owner_ids", [
+        # Like migration 9: import jobs of a UUID user could not be recorded
+        RebuildTable("resource_import_jobs", "user_id", ("varchar", "nvarchar")),
+    ]),
+]
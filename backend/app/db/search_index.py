@@ -0,0 +1,257 @@
+"""Full-text search over resource title, resource_name and description.
+
+SQLite keeps an FTS5 table, ``resources_fts`` (rowid = resources.id), with
+unicode61 tokens and prefix indexes; hits are ranked by bm25 and marked with
+FTS5 ``highlight()``. Azure SQL keeps ``resource_search_terms``, an inverted
+index of (owner, word, resource, field) rows: every query word is a
+``LIKE 'word%'`` seek on the (owner, term) index and hits are ranked by the
+weight of the fields they matched in. Both match the same way: every query
+word must start a word of the resource, ignoring case and accents. Title
+matches weigh most, then resource_name, then description.
+
+The index is maintained in the writer's transaction: call
+``index_resources`` after inserting or updating resources and
+``remove_resources`` when deleting them. Anything written behind the API's
+back can be picked up with ``python -m app.db.search_index --rebuild``.
+"""
+import argparse
+import html
+import re
+import sys
+import unicodedata
+from typing import Dict, Iterable, List, Optional, Sequence
+
+from sqlalchemy import and_, bindparam, case, column, func, literal_column, or_, select, table, text
+from sqlalchemy.engine import Connection
+
+from app.db.bulk import IN_CLAUSE_CHUNK, insert_rows
+from app.db.database import engine
+from app.models.resource import Resource, ResourceSearchTerm
+
+FTS_TABLE = "resources_fts"
+FIELDS = ("title", "resource_name", "description")
+FIELD_WEIGHTS = (10.0, 5.0, 1.0)
+
+# Longest query accepted, in words, and the longest indexed word
+MAX_QUERY_TERMS = 8
+MAX_TERM_LENGTH = 64
+
+# Highlight markers; swapped for <mark> once the text is HTML-escaped
+_OPEN, _CLOSE = "\x02", "\x03"
+
+# A word is a run of letters and digits, like FTS5's unicode61 tokenizer
+_WORD = re.compile(r"[^\W_]+")
+
+_fts = table(FTS_TABLE, column("rowid"), *(column(name) for name in FIELDS))
+
+_RESULT_COLUMNS = (
+    "id", "user_id", "icon", "title", "resource_name", "description",
+    "status", "region", "created_at", "updated_at",
+)
+
+
+def normalize(word: str) -> str:
+    """Lowercase and strip accents (unicode61 ``remove_diacritics 2``)"""
+    decomposed = unicodedata.normalize("NFKD", word.lower())
+    return "".join(char for char in decomposed if not unicodedata.combining(char))
+
+
+def query_terms(query: str) -> List[str]:
+    """Distinct normalized words of a search query, in order"""
+    terms = []
+    for word in _WORD.findall(query):
+        term = normalize(word)[:MAX_TERM_LENGTH]
+        if term and term not in terms:
+            terms.append(term)
+    return terms[:MAX_QUERY_TERMS]
+
+
+def _chunks(values: Sequence, size: int = IN_CLAUSE_CHUNK) -> Iterable[Sequence]:
+    for start in range(0, len(values), size):
+        yield values[start:start + size]
+
+
+def _uses_fts(conn: Connection) -> bool:
+    return conn.dialect.name == "sqlite"
+
+
+def remove_resources(conn: Connection, resource_ids: Iterable[int]) -> None:
+    """Drop resources from the index"""
+    ids = list(set(resource_ids))
+    for chunk in _chunks(ids):
+        if _uses_fts(conn):
+            conn.execute(
+                text(f"DELETE FROM {FTS_TABLE} WHERE rowid IN :ids").bindparams(bindparam("ids", expanding=True)),
+                {"ids": list(chunk)}
+            )
+        else:
+            terms = ResourceSearchTerm.__table__
+            conn.execute(terms.delete().where(terms.c.resource_id.in_(chunk)))
+
+
+def index_resources(conn: Connection, resources: Iterable) -> None:
+    """(Re)index resources from objects or rows with id, user_id and the text fields"""
+    resources = list(resources)
+    if not resources:
+        return
+    remove_resources(conn, [resource.id for resource in resources])
+    if _uses_fts(conn):
+        conn.execute(
+            text(f"INSERT INTO {FTS_TABLE} (rowid, {', '.join(FIELDS)}) VALUES (:id, :{', :'.join(FIELDS)})"),
+            [{"id": resource.id, **{name: getattr(resource, name) for name in FIELDS}} for resource in resources]
+        )
+        return
+    rows = []
+    for resource in resources:
+        owner = str(resource.user_id)
+        for field, name in enumerate(FIELDS):
+            words = {normalize(word)[:MAX_TERM_LENGTH] for word in _WORD.findall(getattr(resource, name) or "")}
+            rows.extend(
+                {"resource_id": resource.id, "field": field, "term": word, "user_id": owner}
+                for word in words
+            )
+    insert_rows(conn, ResourceSearchTerm.__table__, rows)
+
+
+def index_resources_after(conn: Connection, after_id: int) -> None:
+    """Index every resource with an id above ``after_id`` (rows just bulk-inserted)"""
+    resources = Resource.__table__
+    while True:
+        rows = conn.execute(
+            select(resources.c.id, resources.c.user_id, *(resources.c[name] for name in FIELDS))
+            .where(resources.c.id > after_id)
+            .order_by(resources.c.id)
+            .limit(IN_CLAUSE_CHUNK)
+        ).all()
+        if not rows:
+            return
+        index_resources(conn, rows)
+        after_id = rows[-1].id
+
+
+def rebuild(conn: Connection) -> None:
+    """Index every resource from scratch"""
+    if _uses_fts(conn):
+        conn.exec_driver_sql(f"DELETE FROM {FTS_TABLE}")
+        conn.exec_driver_sql(
+            f"INSERT INTO {FTS_TABLE} (rowid, {', '.join(FIELDS)}) "
+            f"SELECT id, {', '.join(FIELDS)} FROM resources"
+        )
+        return
+    conn.execute(ResourceSearchTerm.__table__.delete())
+    index_resources_after(conn, 0)
+
+
+def _highlight_words(value: Optional[str], terms: Sequence[str]) -> Optional[str]:
+    """Mark every word starting with one of ``terms``, as FTS5 highlight() does"""
+    if not value:
+        return value
+    parts = []
+    last = 0
+    for match in _WORD.finditer(value):
+        if normalize(match.group()).startswith(tuple(terms)):
+            parts.append(value[last:match.start()])
+            parts.append(_OPEN + match.group() + _CLOSE)
+            last = match.end()
+    parts.append(value[last:])
+    return "".join(parts)
+
+
+def _marked_html(value: Optional[str]) -> Optional[str]:
+    if value is None:
+        return None
+    return html.escape(value).replace(_OPEN, "<mark>").replace(_CLOSE, "</mark>")
+
+
+def _search_fts(conn: Connection, owner: str, terms: List[str], limit: int) -> List[dict]:
+    resources = Resource.__table__
+    fts = literal_column(FTS_TABLE)
+    rank = func.bm25(fts, *FIELD_WEIGHTS)
+    statement = (
+        select(
+            *(resources.c[name] for name in _RESULT_COLUMNS),
+            (-rank).label("score"),
+            *(func.highlight(fts, i, _OPEN, _CLOSE).label(f"{name}_highlight") for i, name in enumerate(FIELDS)),
+        )
+        .select_from(resources.join(_fts, _fts.c.rowid == resources.c.id))
+        # Quoted words with * are prefix queries; words hold letters and digits only
+        .where(fts.match(" ".join(f'"{term}"*' for term in terms)), resources.c.user_id == owner)
+        .order_by(rank, resources.c.id.desc())
+        .limit(limit)
+    )
+    hits = []
+    for row in conn.execute(statement):
+        hit = row._asdict()
+        hit["highlights"] = {name: _marked_html(hit.pop(f"{name}_highlight")) for name in FIELDS}
+        hits.append(hit)
+    return hits
+
+
+def _search_terms(conn: Connection, owner: str, terms: List[str], limit: int) -> List[dict]:
+    index = ResourceSearchTerm.__table__
+    # term LIKE 'abc%': a prefix seek under the column's collation
+    matches = [index.c.term.startswith(term) for term in terms]
+    weight = case(*((index.c.field == field, w) for field, w in enumerate(FIELD_WEIGHTS)), else_=0.0)
+    # Whole-word matches count double
+    exact = case((index.c.term.in_(terms), 2.0), else_=1.0)
+    score = func.sum(weight * exact).label("score")
+    statement = (
+        select(index.c.resource_id, score)
+        .where(index.c.user_id == owner, or_(*matches))
+        .group_by(index.c.resource_id)
+        .having(and_(*(func.max(case((match, 1), else_=0)) == 1 for match in matches)))
+        .order_by(score.desc(), index.c.resource_id.desc())
+        .limit(limit)
+    )
+    scores = {row.resource_id: row.score for row in conn.execute(statement)}
+    if not scores:
+        return []
+    resources = Resource.__table__
+    rows = {
+        row.id: row._asdict()
+        for row in conn.execute(
+            select(*(resources.c[name] for name in _RESULT_COLUMNS)).where(resources.c.id.in_(list(scores)))
+        )
+    }
+    hits = []
+    for resource_id, score in scores.items():
+        hit = rows.get(resource_id)
+        if hit is None:
+            continue
+        hit["score"] = float(score)
+        hit["highlights"] = {name: _marked_html(_highlight_words(hit[name], terms)) for name in FIELDS}
+        hits.append(hit)
+    return hits
+
+
+def search(conn: Connection, owner_id, query: str, limit: int = 20) -> List[Dict]:
+    """Best matches among ``owner_id``'s resources, best first
+
+    Each hit holds the resource columns, a ``score`` (higher is better) and
+    ``highlights``: the text fields HTML-escaped, with matched words wrapped
+    in <mark>.
+    """
+    terms = query_terms(query)
+    if not terms or owner_id is None:
+        return []
+    if _uses_fts(conn):
+        return _search_fts(conn, str(owner_id), terms, limit)
+    return _search_terms(conn, str(owner_id), terms, limit)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m app.db.search_index", description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rebuild", action="store_true", help="reindex every resource")
+    args = parser.parse_args(argv)
+    if not args.rebuild:
+        parser.print_help()
+        return
+    with engine.begin() as conn:
+        rebuild(conn)
+        count = conn.execute(select(func.count()).select_from(Resource.__table__)).scalar()
+    print(f"✅ Search index rebuilt: {count} resources")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -1,6 +1,8 @@
 from sqlalchemy.orm import Session
 from app.models.user import User, UserRole
 from app.core.security import get_password_hash
+from app.db.resource_owner import invalidate_resource_owner
+from app.db.token_versions import bump_token_version
 
 
 def create_super_user(db: Session) -> None:
@@ -15,6 +17,7 @@ def create_super_user(db: Session) -> None:
     
     for admin in other_admins:
         db.delete(admin)
+        bump_token_version(db, admin.id)
         print(f"🗑️  Removed duplicate admin: {admin.email}")
     
     if other_admins:
@@ -40,6 +43,7 @@ def create_super_user(db: Session) -> None:
         needs_update = False
         if existing_user.role != UserRole.admin:
             existing_user.role = UserRole.admin
+            bump_token_version(db, existing_user.id)
             needs_update = True
         if not existing_user.is_protected:
             existing_user.is_protected = True
@@ -50,3 +54,6 @@ def create_super_user(db: Session) -> None:
             print(f"✅ Updated user to protected admin: {admin_email}")
         else:
             print(f"ℹ️  Protected admin user already exists: {admin_email}")
+    
+    # The admin set may have changed; re-resolve the resource owner
+    invalidate_resource_owner()
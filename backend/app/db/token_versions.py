@@ -0,0 +1,51 @@
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.models.user import TokenVersion
+
+# Current token version per user id (as a string, the token_versions key
+# type, so integer and UUID ids share one cache entry). A bump is visible immediately in this
+# worker and within TOKEN_VERSION_CACHE_TTL_SECONDS in the others.
+_version_cache = TTLCache(
+    max_entries=settings.PRINCIPAL_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.TOKEN_VERSION_CACHE_TTL_SECONDS
+)
+
+
+def load_token_version(db: Session, user_id) -> int:
+    """Token version straight from the database, as every worker sees it"""
+    user_id = str(user_id)
+    version = db.query(TokenVersion.version).filter(TokenVersion.user_id == user_id).scalar() or 0
+    _version_cache.set(user_id, version)
+    return version
+
+
+def get_token_version(db: Session, user_id) -> int:
+    """Version tokens for this user must carry to be accepted (0 if never bumped)"""
+    cached = _version_cache.get(str(user_id))
+    if cached is not None:
+        return cached
+    return load_token_version(db, user_id)
+
+
+def bump_token_version(db: Session, user_id) -> None:
+    """Revoke all existing tokens of a user; the caller commits"""
+    user_id = str(user_id)
+    result = db.execute(
+        update(TokenVersion)
+        .where(TokenVersion.user_id == user_id)
+        .values(version=TokenVersion.version + 1)
+    )
+    if result.rowcount == 0:
+        db.add(TokenVersion(user_id=user_id, version=1))
+    _version_cache.invalidate(user_id)
+
+
+def forget_token_version(user_id) -> None:
+    """Drop the cached version after the bump has been committed"""
+    _version_cache.invalidate(str(user_id))
+
+
+def token_version_cache_stats() -> dict:
+    return _version_cache.stats()
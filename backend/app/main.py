@@ -1,13 +1,22 @@
-from fastapi import FastAPI
+import hmac
+import ipaddress
+from fastapi import FastAPI, HTTPException, Request, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse
 from app.core.config import settings
+from app.core.hash_pool import HashPoolOverloaded
+from app.core.metrics import MetricsMiddleware, registry as metrics_registry
+from app.core.security import hash_pool
 from app.api import auth, users, theme, resources, admin
-from app.db.database import Base, engine, init_db
+from app.api.serialization import JSON_RESPONSE_CLASS
+from app.db.database import get_pool_status
+from app.db.migrations import MigrationError
 
 app = FastAPI(
     title="Resource Management API",
     description="Python FastAPI backend with Azure SQL Database",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=JSON_RESPONSE_CLASS
 )
 
 # CORS Configuration - Use settings for consistent configuration management
@@ -17,8 +26,33 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "ETag", "Server-Timing"],
 )
 
+if settings.QUERY_AUDIT_ENABLED:
+    from app.db import query_audit
+    from app.db.async_database import AsyncSessionLocal
+    query_audit.install()
+    if AsyncSessionLocal is not None:
+        query_audit.install(AsyncSessionLocal.kw["bind"].sync_engine)
+    app.add_middleware(query_audit.QueryAuditMiddleware, threshold=settings.QUERY_AUDIT_REPEAT_THRESHOLD)
+    print("ℹ️  Query auditor enabled")
+
+# Added last so it wraps CORS too and times the whole request
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware, server_timing=settings.METRICS_SERVER_TIMING)
+
+_metrics_networks = [ipaddress.ip_network(network, strict=False) for network in settings.metrics_allowed_networks]
+
+
+@app.exception_handler(HashPoolOverloaded)
+async def hash_pool_overloaded_handler(request: Request, exc: HashPoolOverloaded):
+    # Shed load instead of queueing more bcrypt work behind a full pool
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": "Server is busy, please retry shortly"},
+        headers={"Retry-After": str(exc.retry_after)}
+    )
 
 
 # Include routers
@@ -31,24 +65,26 @@ app.include_router(admin.router, prefix="/api/admin", tags=["Admin"])
 
 @app.on_event("startup")
 def startup_event():
+    if not settings.DB_BOOTSTRAP_ON_STARTUP:
+        print("ℹ️ Database bootstrap already done for this deployment")
+        return
     try:
-        # Create tables
-        Base.metadata.create_all(bind=engine)
-        init_db()  # Initialize/fix Azure SQL schema
-        
-        # Create super user
-        from app.db.database import SessionLocal
-        from app.db.super_user_seed import create_super_user
-        db = SessionLocal()
-        try:
-            create_super_user(db)
-        finally:
-            db.close()
+        from app.db.bootstrap import bootstrap_database
+        bootstrap_database()
+    except MigrationError as e:
+        # Serving on a half-migrated schema turns one failed step into 500s everywhere
+        print(f"⚠️ Database migration failed, refusing to start: {e}")
+        raise
     except Exception as e:
         print(f"⚠️ Database initialization warning: {str(e)[:100]}")
         print("ℹ️ API will still start but database operations may fail")
 
 
+@app.on_event("shutdown")
+def shutdown_event():
+    hash_pool.shutdown()
+
+
 @app.get("/")
 def root():
     return {"message": "Resource Management API is running"}
@@ -57,3 +93,37 @@ def root():
 @app.get("/health")
 def health_check():
     return {"status": "healthy"}
+
+
+def _metrics_client_allowed(request: Request) -> bool:
+    if settings.METRICS_TOKEN:
+        scheme, _, token = request.headers.get("authorization", "").partition(" ")
+        if scheme.lower() == "bearer" and hmac.compare_digest(token.encode(), settings.METRICS_TOKEN.encode()):
+            return True
+    try:
+        client = ipaddress.ip_address(request.client.host) if request.client else None
+    except ValueError:
+        return False
+    return client is not None and any(client in network for network in _metrics_networks)
+
+
+@app.get("/metrics", include_in_schema=False)
+def metrics(request: Request):
+    """Prometheus scrape endpoint for METRICS_ALLOWED_NETWORKS or METRICS_TOKEN holders"""
+    if not settings.METRICS_ENABLED or not _metrics_client_allowed(request):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+
+    pool = get_pool_status()
+    hashing = hash_pool.stats()
+    extra = {
+        "db_pool_checked_out": ("gauge", "Connections currently checked out of the pool", pool["checked_out"]),
+        "db_pool_overflow": ("gauge", "Overflow connections currently open", pool["overflow"]),
+        "db_pool_waits_total": ("counter", "Checkouts that had to wait for a free connection", pool["waits"]),
+        "db_pool_timeouts_total": ("counter", "Checkouts that timed out waiting for a connection", pool["timeouts"]),
+        "password_hash_in_flight": ("gauge", "Password hashes running or queued", hashing["in_flight"]),
+        "password_hash_rejected_total": ("counter", "Logins shed with 503 by the hashing pool", hashing["rejected"]),
+    }
+    return PlainTextResponse(
+        metrics_registry.render(extra),
+        media_type="text/plain; version=0.0.4"
+    )
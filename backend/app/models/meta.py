@@ -0,0 +1,36 @@
+from sqlalchemy import BigInteger, Column, Integer, String, DateTime
+from sqlalchemy.sql import func
+from app.db.database import Base
+
+
+class SchemaMigration(Base):
+    """One row per applied migration; the highest version is the schema version"""
+    __tablename__ = "schema_migrations"
+    
+    version = Column(Integer, primary_key=True, autoincrement=False)
+    name = Column(String(100), nullable=False)
+    applied_at = Column(DateTime(timezone=True), server_default=func.now())
+    duration_ms = Column(Integer, nullable=True)
+
+
+class BackfillCheckpoint(Base):
+    """Progress of a resumable backfill job (see app.db.backfill)"""
+    __tablename__ = "backfill_checkpoints"
+    
+    job_name = Column(String(100), primary_key=True)
+    # Last key done, as text so GUID and string keys fit; NULL before the first chunk
+    last_key = Column(String(100), nullable=True)
+    rows_done = Column(BigInteger, nullable=False, default=0)
+    status = Column(String(20), nullable=False)
+    started_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now())
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+
+
+class CacheVersion(Base):
+    """Version stamp of a cached data set; bumping it invalidates every worker's copy"""
+    __tablename__ = "cache_versions"
+    
+    name = Column(String(100), primary_key=True)
+    version = Column(BigInteger, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
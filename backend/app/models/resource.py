@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Enum as SQLEnum, Boolean
+from sqlalchemy import BigInteger, Column, Integer, SmallInteger, String, Unicode, Text, DateTime, ForeignKey, Enum as SQLEnum, Boolean, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 import enum
@@ -25,6 +25,15 @@ class ResourceStatus(str, enum.Enum):
 
 class Resource(Base):
     __tablename__ = "resources"
+    __table_args__ = (
+        # Keyset pagination, filters and sorting for GET /api/resources/
+        Index("ix_resources_user_created", "user_id", "created_at", "id"),
+        Index("ix_resources_user_updated", "user_id", "updated_at", "id"),
+        Index("ix_resources_user_title", "user_id", "title", "id"),
+        Index("ix_resources_user_status", "user_id", "status"),
+        Index("ix_resources_user_region", "user_id", "region"),
+        Index("ix_resources_user_icon", "user_id", "icon"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(String(36), ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
@@ -39,3 +48,41 @@ class Resource(Base):
 
     # Relationship
     user = relationship("User", back_populates="resources")
+
+
+class ResourceImportJob(Base):
+    """Progress and row errors of a background CSV/NDJSON resource import"""
+    __tablename__ = "resource_import_jobs"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    # users.id as a string, like resources.user_id
+    user_id = Column(String(36), nullable=False, index=True)
+    filename = Column(String(255), nullable=True)
+    format = Column(String(10), nullable=False)
+    status = Column(String(20), nullable=False)
+    bytes_total = Column(BigInteger, nullable=False, default=0)
+    bytes_done = Column(BigInteger, nullable=False, default=0)
+    rows_done = Column(BigInteger, nullable=False, default=0)
+    rows_imported = Column(BigInteger, nullable=False, default=0)
+    rows_failed = Column(BigInteger, nullable=False, default=0)
+    # JSON list of {"line": n, "error": "..."}, capped at IMPORT_MAX_ERRORS
+    errors = Column(Text, nullable=True)
+    message = Column(String(500), nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    finished_at = Column(DateTime, nullable=True)
+
+
+class ResourceSearchTerm(Base):
+    """Inverted word index behind resource search on Azure SQL (SQLite uses FTS5)"""
+    __tablename__ = "resource_search_terms"
+    __table_args__ = (
+        # Prefix seeks for one owner's resources: user_id = ? AND term LIKE 'abc%'
+        Index("ix_resource_search_terms_owner_term", "user_id", "term"),
+    )
+
+    resource_id = Column(Integer, primary_key=True, autoincrement=False)
+    # 0 title, 1 resource_name, 2 description
+    field = Column(SmallInteger, primary_key=True, autoincrement=False)
+    term = Column(Unicode(64), primary_key=True)
+    user_id = Column(String(36), nullable=False)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, DateTime, Boolean, Enum as SQLEnum, Integer
+from sqlalchemy import Column, String, DateTime, Boolean, Enum as SQLEnum, Integer, Text, ForeignKey
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from app.db.database import Base
@@ -36,3 +36,23 @@ class ThemeConfig(Base):
     config_value = Column(String(2000), nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+
+class UserTheme(Base):
+    """A user's theme as compact JSON (ASCII, no whitespace), one row per user"""
+    __tablename__ = "user_theme"
+    
+    # Same type as resources.user_id: users.id is a UUID on Azure SQL and older databases
+    user_id = Column(String(36), ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    payload = Column(Text, nullable=False)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+
+class TokenVersion(Base):
+    """Per-user access token generation; bumping it revokes every token issued before"""
+    __tablename__ = "token_versions"
+    
+    # users.id as a string: UUIDs on Azure SQL and older databases
+    user_id = Column(String(36), primary_key=True)
+    version = Column(Integer, default=0, nullable=False)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
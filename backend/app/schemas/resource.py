@@ -1,6 +1,7 @@
-from pydantic import BaseModel, Field
+import json
+from pydantic import BaseModel, Field, computed_field, field_validator
 from datetime import datetime
-from typing import Optional
+from typing import Any, List, Optional
 
 
 class ResourceBase(BaseModel):
@@ -23,8 +24,100 @@ class ResourceUpdate(ResourceBase):
 class ResourceResponse(ResourceBase):
     id: int
     user_id: str
+    # NULL in legacy rows and rows inserted outside the API
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+
+class ResourceHighlights(BaseModel):
+    """Text fields HTML-escaped, with the matched words wrapped in <mark>"""
+    title: str
+    resource_name: str
+    description: Optional[str] = None
+
+
+class ResourceSearchHit(ResourceResponse):
+    score: float
+    highlights: ResourceHighlights
+
+
+class ResourcePatch(BaseModel):
+    """Partial update used by the bulk endpoint; omitted fields are left untouched"""
+    id: int
+    icon: Optional[str] = Field(None, max_length=50)
+    title: Optional[str] = Field(None, min_length=1, max_length=100)
+    resource_name: Optional[str] = Field(None, min_length=1, max_length=200)
+    description: Optional[str] = Field(None, max_length=500)
+    status: Optional[str] = Field(None, max_length=50)
+    region: Optional[str] = Field(None, max_length=50)
+    created_at: Optional[datetime] = None
+
+    @field_validator("icon", "title", "resource_name", "status", "region", "created_at")
+    @classmethod
+    def reject_null(cls, value):
+        """Omit a field to leave it unchanged; only description can be cleared"""
+        if value is None:
+            raise ValueError("cannot be null")
+        return value
+
+
+class ResourceBulkDelete(BaseModel):
+    ids: List[int]
+
+
+class BulkItemResult(BaseModel):
+    index: int
+    id: Optional[int] = None
+    status: str
+    error: Optional[str] = None
+    resource: Optional[ResourceResponse] = None
+
+
+class BulkResponse(BaseModel):
+    succeeded: int
+    failed: int
+    results: List[BulkItemResult]
+
+
+class ImportRowError(BaseModel):
+    line: int
+    error: str
+
+
+class ResourceImportJobResponse(BaseModel):
+    id: int
+    filename: Optional[str] = None
+    format: str
+    status: str
+    bytes_total: int
+    bytes_done: int
+    rows_done: int
+    rows_imported: int
+    rows_failed: int
+    errors: List[ImportRowError] = []
+    message: Optional[str] = None
     created_at: datetime
     updated_at: datetime
+    finished_at: Optional[datetime] = None
+
+    @field_validator("errors", mode="before")
+    @classmethod
+    def parse_errors(cls, value: Any):
+        """Stored as a JSON text column"""
+        if value is None:
+            return []
+        return json.loads(value) if isinstance(value, str) else value
+
+    @computed_field
+    @property
+    def progress(self) -> float:
+        """Percent of the uploaded file processed"""
+        if self.status == "done":
+            return 100.0
+        return round(min(self.bytes_done / self.bytes_total * 100, 100.0), 1) if self.bytes_total else 0.0
 
     class Config:
         from_attributes = True
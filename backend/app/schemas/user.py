@@ -1,5 +1,5 @@
-from pydantic import BaseModel, EmailStr, Field, field_serializer
-from typing import Optional, Any
+from pydantic import BaseModel, EmailStr, Field, field_serializer, field_validator
+from typing import Optional, Any, Dict
 from datetime import datetime
 from uuid import UUID
 from app.models.user import UserRole
@@ -39,6 +39,12 @@ class UserResponse(UserBase):
     is_protected: bool = False
     created_at: datetime
     
+    @field_validator('id', mode='before')
+    @classmethod
+    def coerce_id(cls, value: Any) -> str:
+        # Lets list endpoints validate User rows directly
+        return str(value)
+    
     @field_serializer('id')
     def serialize_id(self, value: Any) -> str:
         if isinstance(value, UUID):
@@ -64,6 +70,19 @@ class TokenData(BaseModel):
     email: Optional[str] = None
 
 
+class TokenPrincipal(BaseModel):
+    """Caller identity taken from verified token claims, without loading the user row"""
+    id: str
+    email: str
+    role: UserRole
+    
+    @field_validator('id', mode='before')
+    @classmethod
+    def coerce_id(cls, value: Any) -> str:
+        # Integer or UUID user ids compare with the VARCHAR user_id columns
+        return str(value)
+
+
 class ThemeConfigResponse(BaseModel):
     id: str
     config_key: str
@@ -71,11 +90,11 @@ class ThemeConfigResponse(BaseModel):
     created_at: datetime
     updated_at: datetime
     
-    @field_serializer('id')
-    def serialize_id(self, value: Any) -> str:
-        if isinstance(value, UUID):
-            return str(value)
-        return value
+    @field_validator('id', mode='before')
+    @classmethod
+    def coerce_id(cls, value: Any) -> str:
+        # Integer primary keys on the current schema, UUIDs on the legacy one
+        return str(value)
     
     class Config:
         from_attributes = True
@@ -83,3 +102,9 @@ class ThemeConfigResponse(BaseModel):
 
 class ThemeConfigUpdate(BaseModel):
     config_value: str
+
+
+class UserThemeResponse(BaseModel):
+    user_id: str
+    theme: Dict[str, Any]
+    updated_at: Optional[datetime] = None
@@ -0,0 +1,110 @@
+"""High-concurrency load test for the async read routes.
+
+Drives GET /api/resources/ and GET /api/theme/ with many concurrent clients
+against a throwaway SQLite database, in-process through httpx's ASGI
+transport. Compare the threaded adapter with the native aiosqlite engine:
+
+    python benchmarks/async_reads.py --mode thread --concurrency 200
+    python benchmarks/async_reads.py --mode native --concurrency 200
+
+The admin account comes from BENCH_ADMIN_EMAIL / BENCH_ADMIN_PASSWORD (or
+--admin-email / --admin-password), as for harness.py.
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+
+from harness import admin_credentials  # noqa: E402
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+async def run(args):
+    import httpx
+    from app.main import app
+
+    await app.router.startup()
+    transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+    limits = httpx.Limits(max_connections=None, max_keepalive_connections=None)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", limits=limits) as client:
+        response = await client.post(
+            "/api/auth/login", json={"email": args.admin_email, "password": args.admin_password}
+        )
+        headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+        await client.post(
+            "/api/resources/bulk",
+            json=[{"icon": "server", "title": f"Load {i}", "resource_name": f"load-{i}"} for i in range(args.resources)],
+            headers=headers
+        )
+        await client.put("/api/theme/", json={"primary": "#0078d4"}, headers=headers)
+
+        # Warm up the principal cache and connection pool before the burst
+        for url in ("/api/resources/?limit=50", "/api/theme/"):
+            await client.get(url, headers=headers)
+
+        latencies = []
+        errors = 0
+        deadline = time.perf_counter() + args.duration
+
+        async def reader(index):
+            nonlocal errors
+            url = "/api/resources/?limit=50" if index % 2 else "/api/theme/"
+            while time.perf_counter() < deadline:
+                started = time.perf_counter()
+                r = await client.get(url, headers=headers)
+                latencies.append((time.perf_counter() - started) * 1000)
+                if r.status_code != 200:
+                    errors += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*[reader(i) for i in range(args.concurrency)])
+        elapsed = time.perf_counter() - started
+
+    await app.router.shutdown()
+    return {
+        "mode": args.mode,
+        "concurrency": args.concurrency,
+        "requests": len(latencies),
+        "errors": errors,
+        "requests_per_s": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(statistics.median(latencies), 2) if latencies else 0.0,
+        "p95_ms": round(percentile(latencies, 95), 2),
+        "p99_ms": round(percentile(latencies, 99), 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mode", choices=["thread", "native"], default="thread")
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--resources", type=int, default=200)
+    parser.add_argument("--admin-email", help="admin account (default: $BENCH_ADMIN_EMAIL)")
+    parser.add_argument("--admin-password", help="its password (default: $BENCH_ADMIN_PASSWORD)")
+    args = parser.parse_args()
+    args.admin_email, args.admin_password = admin_credentials(args)
+
+    os.environ["SQLITE_PATH"] = str(Path(tempfile.mkdtemp(prefix="bench-async-")) / "bench.db")
+    os.environ["ASYNC_DB_ENABLED"] = "true" if args.mode == "native" else "false"
+    for key in ("AZURE_SQL_SERVER", "AZURE_SQL_DATABASE", "AZURE_SQL_USERNAME", "AZURE_SQL_PASSWORD"):
+        os.environ[key] = ""
+
+    print(json.dumps(asyncio.run(run(args)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
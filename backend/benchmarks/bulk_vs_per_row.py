@@ -0,0 +1,109 @@
+"""Per-row resource API vs the /api/resources/bulk endpoints.
+
+Creates, updates and deletes the same number of resources both ways against a
+throwaway SQLite database and reports wall time and SQL statements issued:
+
+    python benchmarks/bulk_vs_per_row.py --rows 200
+
+The admin account comes from BENCH_ADMIN_EMAIL / BENCH_ADMIN_PASSWORD (or
+--admin-email / --admin-password), as for harness.py.
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+
+from harness import admin_credentials  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=200)
+    parser.add_argument("--admin-email", help="admin account (default: $BENCH_ADMIN_EMAIL)")
+    parser.add_argument("--admin-password", help="its password (default: $BENCH_ADMIN_PASSWORD)")
+    args = parser.parse_args()
+    email, password = admin_credentials(args)
+
+    os.environ["SQLITE_PATH"] = str(Path(tempfile.mkdtemp(prefix="bench-bulk-")) / "bench.db")
+    for key in ("AZURE_SQL_SERVER", "AZURE_SQL_DATABASE", "AZURE_SQL_USERNAME", "AZURE_SQL_PASSWORD"):
+        os.environ[key] = ""
+
+    from fastapi.testclient import TestClient
+    from sqlalchemy import event
+    from app.db.database import engine
+    from app.main import app
+
+    statements = {"count": 0}
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def count_statement(conn, cursor, statement, parameters, context, executemany):
+        statements["count"] += 1
+
+    def measure(label, fn):
+        statements["count"] = 0
+        started = time.perf_counter()
+        fn()
+        return {
+            "operation": label,
+            "seconds": round(time.perf_counter() - started, 3),
+            "sql_statements": statements["count"],
+        }
+
+    payload = [
+        {"icon": "server", "title": f"Bench {i}", "resource_name": f"bench-{i}", "region": "East US"}
+        for i in range(args.rows)
+    ]
+
+    with TestClient(app) as client:
+        token = client.post("/api/auth/login", json={"email": email, "password": password}).json()["access_token"]
+        headers = {"Authorization": f"Bearer {token}"}
+        results = []
+        ids = []
+
+        def per_row_create():
+            for item in payload:
+                ids.append(client.post("/api/resources/", json=item, headers=headers).json()["id"])
+
+        def per_row_update():
+            for resource_id, item in zip(ids, payload):
+                client.put(f"/api/resources/{resource_id}", json={**item, "status": "Stopped"}, headers=headers)
+
+        def per_row_delete():
+            for resource_id in ids:
+                client.delete(f"/api/resources/{resource_id}", headers=headers)
+
+        results.append(measure("per_row_create", per_row_create))
+        results.append(measure("per_row_update", per_row_update))
+        results.append(measure("per_row_delete", per_row_delete))
+
+        bulk_ids = []
+
+        def bulk_create():
+            response = client.post("/api/resources/bulk", json=payload, headers=headers)
+            bulk_ids.extend(item["id"] for item in response.json()["results"])
+
+        def bulk_update():
+            client.patch(
+                "/api/resources/bulk",
+                json=[{"id": resource_id, "status": "Stopped"} for resource_id in bulk_ids],
+                headers=headers
+            )
+
+        def bulk_delete():
+            client.post("/api/resources/bulk/delete", json={"ids": bulk_ids}, headers=headers)
+
+        results.append(measure("bulk_create", bulk_create))
+        results.append(measure("bulk_update", bulk_update))
+        results.append(measure("bulk_delete", bulk_delete))
+
+    print(json.dumps({"rows": args.rows, "results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,304 @@
+"""Reproducible load test of the whole API against a seeded SQLite database.
+
+``run`` seeds (or reuses) a SQLite file with the requested number of users
+and resources, boots ``app.main:app`` in-process (or targets ``--url``) and
+drives a weighted mix of realistic requests from concurrent virtual users.
+It reports p50/p95/p99 latency and requests per second per scenario as JSON.
+``compare`` diffs two such reports and exits non-zero on regressions:
+
+    python benchmarks/harness.py run --resources 10000 --users 100 --output base.json
+    # ... change app/api/resources.py ...
+    python benchmarks/harness.py run --resources 10000 --users 100 --output new.json
+    python benchmarks/harness.py compare base.json new.json --threshold 10
+
+The admin account comes from BENCH_ADMIN_EMAIL / BENCH_ADMIN_PASSWORD (or
+--admin-email / --admin-password); there is no default password.
+
+Data comes from app.db.generate. Seeded databases are kept in the temp
+directory per size (see --db), so large sizes (1M resources, 100k users)
+are only generated once.
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+
+USER_PREFIX = "bench-"
+USER_PASSWORD = "bench-password"
+
+DEFAULT_MIX = "login=1,list_resources=6,theme_get=4,theme_put=1,admin_users=1"
+# Latency metrics where higher is worse, and throughput where lower is worse
+LATENCY_KEYS = ("p50_ms", "p95_ms", "p99_ms")
+THROUGHPUT_KEYS = ("requests_per_s",)
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def admin_credentials(args):
+    email = args.admin_email or os.getenv("BENCH_ADMIN_EMAIL")
+    password = args.admin_password or os.getenv("BENCH_ADMIN_PASSWORD")
+    if not email or not password:
+        raise SystemExit("Set BENCH_ADMIN_EMAIL and BENCH_ADMIN_PASSWORD (or --admin-email/--admin-password)")
+    return email, password
+
+
+def parse_mix(value):
+    mix = {}
+    for item in value.split(","):
+        name, _, weight = item.partition("=")
+        if name.strip() not in SCENARIOS:
+            raise SystemExit(f"Unknown scenario {name.strip()!r}; choose from {', '.join(SCENARIOS)}")
+        mix[name.strip()] = float(weight or 1)
+    return mix
+
+
+def seed(resources, users):
+    """Fill the configured database up to the requested sizes (idempotent)"""
+    from sqlalchemy import func, select
+    from app.db.bootstrap import bootstrap_database
+    from app.db.database import engine
+    from app.db.generate import existing_generated_users, generate_resources, generate_users
+    from app.models.resource import Resource
+
+    bootstrap_database()
+    have_users = existing_generated_users(USER_PREFIX)
+    with engine.connect() as conn:
+        have_resources = conn.execute(select(func.count(Resource.id))).scalar()
+    if have_users < users:
+        generate_users(users - have_users, prefix=USER_PREFIX, password=USER_PASSWORD, seed=0)
+    if have_resources < resources:
+        generate_resources(resources - have_resources, seed=0)
+    engine.dispose()
+
+
+async def scenario_login(client, session):
+    return await client.post("/api/auth/login", json={"email": session["email"], "password": session["password"]})
+
+
+async def scenario_list_resources(client, session):
+    return await client.get("/api/resources/?limit=50", headers=session["headers"])
+
+
+async def scenario_theme_get(client, session):
+    return await client.get("/api/theme/", headers=session["headers"])
+
+
+async def scenario_theme_put(client, session):
+    rng = session["rng"]
+    theme = {"primary": f"#{rng.randrange(0x1000000):06x}", "mode": rng.choice(("light", "dark"))}
+    return await client.put("/api/theme/", json=theme, headers=session["headers"])
+
+
+async def scenario_admin_users(client, session):
+    return await client.get("/api/admin/users", headers=session["admin_headers"])
+
+
+SCENARIOS = {
+    "login": scenario_login,
+    "list_resources": scenario_list_resources,
+    "theme_get": scenario_theme_get,
+    "theme_put": scenario_theme_put,
+    "admin_users": scenario_admin_users,
+}
+
+
+def summarize(latencies, errors, elapsed):
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "requests_per_s": round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+        "p50_ms": round(statistics.median(latencies), 2) if latencies else 0.0,
+        "p95_ms": round(percentile(latencies, 95), 2),
+        "p99_ms": round(percentile(latencies, 99), 2),
+    }
+
+
+async def drive(args, mix):
+    import httpx
+
+    admin_email, admin_password = args.admin_email, args.admin_password
+    app = None
+    if args.url:
+        client = httpx.AsyncClient(base_url=args.url, timeout=60)
+    else:
+        from app.main import app
+        await app.router.startup()
+        transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+        client = httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=60)
+
+    async with client:
+        response = await client.post("/api/auth/login", json={"email": admin_email, "password": admin_password})
+        if response.status_code != 200:
+            raise SystemExit(f"Could not sign in {admin_email}: {response.status_code} {response.text[:200]}")
+        admin_headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+        # One signed-in session per virtual user (seeded users, or the admin when there are none)
+        sessions = []
+        for index in range(args.concurrency):
+            email = f"{USER_PREFIX}{index % args.users}@example.com" if args.users else admin_email
+            password = USER_PASSWORD if args.users else admin_password
+            response = await client.post("/api/auth/login", json={"email": email, "password": password})
+            if response.status_code != 200:
+                raise SystemExit(f"Could not sign in {email}: {response.status_code} {response.text[:200]}")
+            sessions.append({
+                "email": email,
+                "password": password,
+                "headers": {"Authorization": f"Bearer {response.json()['access_token']}"},
+                "admin_headers": admin_headers,
+            })
+
+        names = list(mix)
+        weights = [mix[name] for name in names]
+        latencies = {name: [] for name in names}
+        errors = {name: 0 for name in names}
+
+        async def virtual_user(session, deadline, rng, record):
+            session["rng"] = rng
+            while time.perf_counter() < deadline:
+                name = rng.choices(names, weights)[0]
+                started = time.perf_counter()
+                response = await SCENARIOS[name](client, session)
+                if record:
+                    latencies[name].append((time.perf_counter() - started) * 1000)
+                    if response.status_code >= 400:
+                        errors[name] += 1
+
+        if args.warmup:
+            deadline = time.perf_counter() + args.warmup
+            await asyncio.gather(*[
+                virtual_user(session, deadline, random.Random(args.seed + i), False)
+                for i, session in enumerate(sessions)
+            ])
+
+        started = time.perf_counter()
+        deadline = started + args.duration
+        await asyncio.gather(*[
+            virtual_user(session, deadline, random.Random(args.seed + 1000 + i), True)
+            for i, session in enumerate(sessions)
+        ])
+        elapsed = time.perf_counter() - started
+
+    if app is not None:
+        await app.router.shutdown()
+
+    every = [value for values in latencies.values() for value in values]
+    return {
+        "scenarios": {name: summarize(latencies[name], errors[name], elapsed) for name in names},
+        "total": summarize(every, sum(errors.values()), elapsed),
+    }
+
+
+def run(args):
+    mix = parse_mix(args.mix)
+    args.admin_email, args.admin_password = admin_credentials(args)
+    if not args.url:
+        db_path = args.db or str(Path(tempfile.gettempdir()) / f"bench-harness-{args.resources}r-{args.users}u.db")
+        os.environ["SQLITE_PATH"] = db_path
+        os.environ["ASYNC_DB_ENABLED"] = "true" if args.async_db else "false"
+        for key in ("AZURE_SQL_SERVER", "AZURE_SQL_DATABASE", "AZURE_SQL_USERNAME", "AZURE_SQL_PASSWORD"):
+            os.environ[key] = ""
+        seed(args.resources, args.users)
+
+    results = asyncio.run(drive(args, mix))
+    report = {
+        "config": {
+            "target": args.url or "in-process",
+            "resources": args.resources,
+            "users": args.users,
+            "concurrency": args.concurrency,
+            "duration_s": args.duration,
+            "mix": mix,
+            "seed": args.seed,
+            "async_db": args.async_db,
+        },
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "timestamp": datetime.utcnow().isoformat(timespec="seconds") + "Z",
+        },
+        **results,
+    }
+    output = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(output + "\n")
+    print(output)
+
+
+def compare(args):
+    """Per-scenario deltas of two reports; exit 1 when any metric regressed beyond the threshold"""
+    base = json.loads(Path(args.base).read_text())
+    new = json.loads(Path(args.new).read_text())
+    rows = []
+    regressions = []
+    for name in [*base["scenarios"], "total"]:
+        old_stats = base["total"] if name == "total" else base["scenarios"].get(name)
+        new_stats = new["total"] if name == "total" else new["scenarios"].get(name)
+        if old_stats is None or new_stats is None:
+            continue
+        row = {"scenario": name}
+        for key in LATENCY_KEYS + THROUGHPUT_KEYS:
+            before, after = old_stats[key], new_stats[key]
+            change = round((after - before) / before * 100, 1) if before else 0.0
+            row[key] = {"base": before, "new": after, "change_pct": change}
+            worse = change > args.threshold if key in LATENCY_KEYS else change < -args.threshold
+            if worse:
+                regressions.append(f"{name}.{key} {before} -> {after} ({change:+.1f}%)")
+        rows.append(row)
+
+    if base["config"] != new["config"]:
+        print("⚠️  The runs used different configurations; deltas may not be comparable", file=sys.stderr)
+    print(json.dumps({"threshold_pct": args.threshold, "scenarios": rows, "regressions": regressions}, indent=2))
+    if regressions:
+        sys.exit(1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="seed the database and run the load mix")
+    run_parser.add_argument("--resources", type=int, default=10000, help="e.g. 100, 10000 or 1000000")
+    run_parser.add_argument("--users", type=int, default=100, help="e.g. 10 or 100000")
+    run_parser.add_argument("--concurrency", type=int, default=50)
+    run_parser.add_argument("--duration", type=float, default=20.0)
+    run_parser.add_argument("--warmup", type=float, default=2.0)
+    run_parser.add_argument("--mix", default=DEFAULT_MIX, help=f"weighted scenarios (default {DEFAULT_MIX})")
+    run_parser.add_argument("--seed", type=int, default=42)
+    run_parser.add_argument("--db", help="SQLite file to seed and reuse (default: one per size in the temp dir)")
+    run_parser.add_argument("--async-db", action="store_true", help="use the native aiosqlite engine")
+    run_parser.add_argument("--url", help="drive a running server instead (no seeding)")
+    run_parser.add_argument("--output", help="also write the JSON report to this file")
+    run_parser.add_argument("--admin-email", help="admin account (default: $BENCH_ADMIN_EMAIL)")
+    run_parser.add_argument("--admin-password", help="its password (default: $BENCH_ADMIN_PASSWORD)")
+    run_parser.set_defaults(handler=run)
+
+    compare_parser = commands.add_parser("compare", help="diff two reports")
+    compare_parser.add_argument("base")
+    compare_parser.add_argument("new")
+    compare_parser.add_argument("--threshold", type=float, default=10.0,
+                                help="percent change counted as a regression (default 10)")
+    compare_parser.set_defaults(handler=compare)
+
+    args = parser.parse_args()
+    args.handler(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""Full ORM entity loads vs column-projected rows for the list endpoints.
+
+Seeds a throwaway SQLite database, then loads the same resources and users
+both ways and serializes them as the endpoints do. Reports median wall time
+and peak Python memory (tracemalloc, in a separate run) per variant:
+
+    python benchmarks/list_projection.py --sizes 1000,100000 --repeat 3
+"""
+import argparse
+import gc
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="1000,100000")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    os.environ["SQLITE_PATH"] = str(Path(tempfile.mkdtemp(prefix="bench-projection-")) / "bench.db")
+    for key in ("AZURE_SQL_SERVER", "AZURE_SQL_DATABASE", "AZURE_SQL_USERNAME", "AZURE_SQL_PASSWORD"):
+        os.environ[key] = ""
+
+    from sqlalchemy import delete, insert, select
+    from app.main import app  # noqa: F401  (configures every mapper before app.api.deps inspects User)
+    from app.api.admin import user_list
+    from app.api.resources import resource_list
+    from app.db.bootstrap import bootstrap_database
+    from app.db.database import SessionLocal, engine
+    from app.db.projections import select_for
+    from app.models.resource import Resource
+    from app.models.user import User, UserRole
+    from app.schemas.resource import ResourceResponse
+    from app.schemas.user import UserResponse
+
+    bootstrap_database()
+
+    def measure(label, size, fn):
+        timings = []
+        for _ in range(args.repeat):
+            gc.collect()
+            started = time.perf_counter()
+            fn()
+            timings.append((time.perf_counter() - started) * 1000)
+        # Separate run: tracemalloc slows allocation-heavy code down several times
+        gc.collect()
+        tracemalloc.start()
+        fn()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        return {
+            "rows": size,
+            "variant": label,
+            "median_ms": round(statistics.median(timings), 2),
+            "peak_mb": round(peak / 2**20, 2),
+        }
+
+    def load(statement, serializer, entities):
+        with SessionLocal() as db:
+            result = db.execute(statement)
+            rows = result.scalars().all() if entities else result.all()
+            return serializer.dump(rows)
+
+    results = []
+    now = datetime.utcnow()
+    for size in (int(value) for value in args.sizes.split(",")):
+        with engine.begin() as conn:
+            conn.execute(delete(Resource))
+            conn.execute(delete(User).where(User.email.like("bench-%")))
+            conn.execute(insert(Resource), [
+                {"user_id": "1", "icon": "server", "title": f"Resource {i}", "resource_name": f"resource-{i}",
+                 "description": "Windows/Linux VM for compute workloads", "status": "Running",
+                 "region": "East US", "created_at": now, "updated_at": now}
+                for i in range(size)
+            ])
+            conn.execute(insert(User), [
+                {"email": f"bench-{i}@example.com", "hashed_password": "$2b$12$" + "x" * 53,
+                 "display_name": f"User {i}", "role": UserRole.user, "is_protected": False, "created_at": now}
+                for i in range(size)
+            ])
+
+        variants = [
+            ("resources_entities", lambda: load(select(Resource).where(Resource.user_id == "1"), resource_list, True)),
+            ("resources_projected", lambda: load(
+                select_for(Resource, ResourceResponse).where(Resource.user_id == "1"), resource_list, False)),
+            ("users_entities", lambda: load(select(User), user_list, True)),
+            ("users_projected", lambda: load(select_for(User, UserResponse), user_list, False)),
+        ]
+        for label, fn in variants:
+            results.append(measure(label, size, fn))
+
+    print(json.dumps({"repeat": args.repeat, "results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
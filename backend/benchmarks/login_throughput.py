@@ -0,0 +1,113 @@
+"""Login storm benchmark: bcrypt logins running next to cheap resource reads.
+
+Runs the app in-process against a throwaway SQLite database and reports login
+throughput, 503 rejections and resource-read latency while logins are hammering
+the server. Compare the old behaviour with the hashing pool:
+
+    python benchmarks/login_throughput.py --executor inline
+    python benchmarks/login_throughput.py --executor thread
+    python benchmarks/login_throughput.py --executor process
+
+The admin account comes from BENCH_ADMIN_EMAIL / BENCH_ADMIN_PASSWORD (or
+--admin-email / --admin-password), as for harness.py.
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+
+from harness import admin_credentials  # noqa: E402
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def run(args):
+    import httpx
+    from app.main import app
+
+    await app.router.startup()
+    transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+    credentials = {"email": args.admin_email, "password": args.admin_password}
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        response = await client.post("/api/auth/login", json=credentials)
+        headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+        logins = {"ok": 0, "rejected": 0, "failed": 0}
+        read_latencies = []
+        deadline = time.perf_counter() + args.duration
+
+        async def login_worker():
+            while time.perf_counter() < deadline:
+                r = await client.post("/api/auth/login", json=credentials)
+                if r.status_code == 200:
+                    logins["ok"] += 1
+                elif r.status_code == 503:
+                    logins["rejected"] += 1
+                    await asyncio.sleep(0.05)
+                else:
+                    logins["failed"] += 1
+
+        async def read_worker():
+            while time.perf_counter() < deadline:
+                started = time.perf_counter()
+                await client.get("/api/resources/", headers=headers)
+                read_latencies.append((time.perf_counter() - started) * 1000)
+
+        started = time.perf_counter()
+        await asyncio.gather(
+            *[login_worker() for _ in range(args.login_concurrency)],
+            *[read_worker() for _ in range(args.read_concurrency)]
+        )
+        elapsed = time.perf_counter() - started
+
+    await app.router.shutdown()
+    return {
+        "executor": args.executor,
+        "duration_s": round(elapsed, 2),
+        "login_concurrency": args.login_concurrency,
+        "read_concurrency": args.read_concurrency,
+        "logins_per_s": round(logins["ok"] / elapsed, 1),
+        "logins_rejected_503": logins["rejected"],
+        "logins_failed": logins["failed"],
+        "reads_per_s": round(len(read_latencies) / elapsed, 1),
+        "read_p50_ms": round(statistics.median(read_latencies), 2) if read_latencies else 0.0,
+        "read_p95_ms": round(percentile(read_latencies, 95), 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--executor", choices=["inline", "thread", "process"], default="thread")
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--login-concurrency", type=int, default=64)
+    parser.add_argument("--read-concurrency", type=int, default=8)
+    parser.add_argument("--admin-email", help="admin account (default: $BENCH_ADMIN_EMAIL)")
+    parser.add_argument("--admin-password", help="its password (default: $BENCH_ADMIN_PASSWORD)")
+    args = parser.parse_args()
+    args.admin_email, args.admin_password = admin_credentials(args)
+
+    db_file = Path(tempfile.mkdtemp(prefix="bench-login-")) / "bench.db"
+    os.environ["SQLITE_PATH"] = str(db_file)
+    os.environ["PASSWORD_HASH_EXECUTOR"] = args.executor
+    for key in ("AZURE_SQL_SERVER", "AZURE_SQL_DATABASE", "AZURE_SQL_USERNAME", "AZURE_SQL_PASSWORD"):
+        os.environ[key] = ""
+
+    print(json.dumps(asyncio.run(run(args)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""Serialization cost of GET /api/resources/ for 10, 1k and 10k resources.
+
+Compares, without a database, the ways a list of resource rows can become a
+response body:
+
+- per_row_models: a ResourceResponse built per row, validated again through
+  the route's response_model and rendered by JSONResponse (the old path)
+- per_row_models_orjson: the same, rendered by ORJSONResponse
+- list_serializer: ListSerializer, one validation pass and pydantic-core JSON
+
+    python benchmarks/serialization.py --sizes 10,1000,10000 --repeat 20
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from types import SimpleNamespace
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+
+
+def make_rows(count):
+    created = datetime(2024, 1, 1, 9, 30)
+    return [
+        SimpleNamespace(
+            id=i + 1, user_id="1", icon="server", title=f"Resource {i}",
+            resource_name=f"resource-{i}", description="Windows/Linux VM for compute workloads",
+            status="Running", region="East US",
+            created_at=created + timedelta(seconds=i), updated_at=created + timedelta(seconds=i)
+        )
+        for i in range(count)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="10,1000,10000")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    os.environ["SQLITE_PATH"] = str(Path(tempfile.mkdtemp(prefix="bench-serialization-")) / "bench.db")
+    for key in ("AZURE_SQL_SERVER", "AZURE_SQL_DATABASE", "AZURE_SQL_USERNAME", "AZURE_SQL_PASSWORD"):
+        os.environ[key] = ""
+
+    from fastapi.responses import JSONResponse
+    from fastapi.routing import serialize_response
+    from app.api.resources import resource_list
+    from app.api.serialization import JSON_RESPONSE_CLASS
+    from app.main import app
+    from app.schemas.resource import ResourceResponse
+
+    loop = asyncio.new_event_loop()
+    route = next(r for r in app.routes if r.path == "/api/resources/" and "GET" in r.methods)
+
+    def per_row_models(rows, response_class):
+        models = [
+            ResourceResponse(
+                id=r.id, user_id=str(r.user_id), icon=r.icon, title=r.title,
+                resource_name=r.resource_name, description=r.description, status=r.status,
+                region=r.region, created_at=r.created_at, updated_at=r.updated_at
+            )
+            for r in rows
+        ]
+        content = loop.run_until_complete(serialize_response(
+            field=route.secure_cloned_response_field, response_content=models, is_coroutine=True
+        ))
+        return response_class(content=content).body
+
+    paths = {
+        "per_row_models": lambda rows: per_row_models(rows, JSONResponse),
+        "per_row_models_orjson": lambda rows: per_row_models(rows, JSON_RESPONSE_CLASS),
+        "list_serializer": lambda rows: resource_list.response(rows).body,
+    }
+
+    results = []
+    for size in (int(value) for value in args.sizes.split(",")):
+        rows = make_rows(size)
+        bodies = {name: json.loads(fn(rows)) for name, fn in paths.items()}
+        if any(body != bodies["per_row_models"] for body in bodies.values()):
+            raise SystemExit(f"Serialized bodies differ for {size} rows")
+        for name, fn in paths.items():
+            timings = []
+            for _ in range(args.repeat):
+                started = time.perf_counter()
+                fn(rows)
+                timings.append((time.perf_counter() - started) * 1000)
+            results.append({
+                "rows": size,
+                "path": name,
+                "median_ms": round(statistics.median(timings), 3),
+                "us_per_row": round(statistics.median(timings) * 1000 / size, 2),
+            })
+
+    print(json.dumps({"repeat": args.repeat, "results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
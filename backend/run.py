@@ -5,6 +5,22 @@ if __name__ == "__main__":
     # Check if running in development or production
     is_dev = os.getenv("APP_ENV", "development") == "development"
     
+    if not is_dev and os.getenv("DB_BOOTSTRAP_ON_STARTUP", "true").lower() == "true":
+        # Check the schema and seed the admin once here instead of in every worker
+        from app.db.migrations import MigrationError
+        try:
+            from app.db.bootstrap import bootstrap_database
+            from app.db.database import engine
+            bootstrap_database()
+            engine.dispose()
+            os.environ["DB_BOOTSTRAP_ON_STARTUP"] = "false"
+        except MigrationError as e:
+            # Workers would only hit the same failing migration again
+            print(f"⚠️ Database migration failed, not starting workers: {e}")
+            raise SystemExit(1)
+        except Exception as e:
+            print(f"⚠️ Database bootstrap failed, workers will retry on startup: {str(e)[:100]}")
+
     uvicorn.run(
         "app.main:app",
         host="0.0.0.0",  # Allow all hosts for Replit frontend access
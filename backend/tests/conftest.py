@@ -0,0 +1,70 @@
+"""Shared fixtures: the app on a throwaway SQLite database, and users to call it as"""
+import os
+import sys
+import tempfile
+import uuid
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+
+# Before anything imports app.core.config
+os.environ["SQLITE_PATH"] = str(Path(tempfile.mkdtemp(prefix="resource-tests-")) / "test.db")
+os.environ["ASYNC_DB_ENABLED"] = "false"
+for key in ("AZURE_SQL_SERVER", "AZURE_SQL_DATABASE", "AZURE_SQL_USERNAME", "AZURE_SQL_PASSWORD"):
+    os.environ[key] = ""
+
+import pytest  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+
+# The max_queries fixture; imported rather than listed in pytest_plugins,
+# which pytest only accepts in a conftest at the rootdir
+from app.db.query_audit import max_queries  # noqa: E402,F401
+
+
+@pytest.fixture(scope="session")
+def client():
+    from app.main import app
+    with TestClient(app) as client:
+        yield client
+
+
+def login(client, email: str, password: str) -> dict:
+    response = client.post("/api/auth/login", json={"email": email, "password": password})
+    assert response.status_code == 200, response.text
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+@pytest.fixture
+def make_user(client):
+    """make_user(role="user") signs up a new user; returns id, email, password and auth headers"""
+    from app.api.deps import invalidate_principal
+    from app.db.database import SessionLocal
+    from app.models.user import User, UserRole
+
+    def make(role: str = "user") -> dict:
+        email = f"test-{uuid.uuid4().hex[:12]}@example.com"
+        password = f"pw-{uuid.uuid4().hex}"
+        response = client.post("/api/auth/signup", json={"email": email, "password": password})
+        assert response.status_code == 201, response.text
+        if role == "admin":
+            db = SessionLocal()
+            try:
+                db.query(User).filter(User.email == email).update({"role": UserRole.admin})
+                db.commit()
+            finally:
+                db.close()
+            invalidate_principal(email)
+        return {
+            "id": response.json()["user"]["id"],
+            "email": email,
+            "password": password,
+            "headers": login(client, email, password),
+        }
+
+    return make
+
+
+@pytest.fixture
+def admin(make_user):
+    return make_user("admin")
@@ -0,0 +1,74 @@
+"""Resumable backfill jobs over integer and string (GUID) keys"""
+import uuid
+
+import pytest
+from sqlalchemy import create_engine, text
+
+from app.db import backfill
+from app.models.meta import BackfillCheckpoint
+
+
+@pytest.fixture
+def engine(tmp_path, monkeypatch):
+    engine = create_engine(f"sqlite:///{tmp_path / 'backfill.db'}")
+    BackfillCheckpoint.__table__.create(engine)
+    with engine.begin() as conn:
+        conn.exec_driver_sql("CREATE TABLE numbered (id INTEGER PRIMARY KEY, flag INTEGER)")
+        conn.exec_driver_sql("CREATE TABLE guids (id VARCHAR(36) PRIMARY KEY, flag INTEGER)")
+        conn.execute(text("INSERT INTO numbered (id, flag) VALUES (:id, NULL)"), [{"id": i} for i in range(1, 11)])
+        conn.execute(text("INSERT INTO guids (id, flag) VALUES (:id, NULL)"),
+                     [{"id": str(uuid.uuid4())} for _ in range(10)])
+    monkeypatch.setattr(backfill, "engine", engine)
+    yield engine
+    engine.dispose()
+
+
+def flags(engine, table):
+    with engine.connect() as conn:
+        return conn.execute(text(f"SELECT flag FROM {table}")).scalars().all()
+
+
+def checkpoint(engine, name):
+    with engine.connect() as conn:
+        return conn.execute(
+            text("SELECT last_key, rows_done, status FROM backfill_checkpoints WHERE job_name = :name"),
+            {"name": name}
+        ).one()
+
+
+@pytest.mark.parametrize("table", ["numbered", "guids"])
+def test_set_based_job_walks_every_chunk(engine, table):
+    job = backfill.BackfillJob(f"{table}_flag", table, set_sql="flag = 1", where="flag IS NULL",
+                               batch_size=3, sleep_ms=0)
+    result = job.run()
+    assert result["rows"] == 10
+    assert result["chunks"] == 4
+    assert flags(engine, table) == [1] * 10
+    last_key, rows_done, status = checkpoint(engine, f"{table}_flag")
+    assert isinstance(last_key, str)
+    assert (rows_done, status) == (10, backfill.STATUS_DONE)
+    # A finished job is skipped
+    assert job.run()["chunks"] == 0
+
+
+def test_guid_job_resumes_after_an_interruption(engine):
+    seen = []
+
+    def compute(rows):
+        if len(seen) == 2:
+            raise RuntimeError("interrupted")
+        seen.append([row["id"] for row in rows])
+        return {row["id"]: {"flag": 2} for row in rows}
+
+    job = backfill.BackfillJob("guids_computed", "guids", columns=["flag"], compute=compute,
+                               batch_size=4, sleep_ms=0)
+    with pytest.raises(RuntimeError):
+        job.run()
+    last_key, rows_done, status = checkpoint(engine, "guids_computed")
+    assert (last_key, rows_done, status) == (seen[-1][-1], 8, backfill.STATUS_RUNNING)
+
+    seen.clear()
+    result = job.run()
+    assert result["rows"] == 10
+    assert len(seen[0]) == 2
+    assert flags(engine, "guids") == [2] * 10
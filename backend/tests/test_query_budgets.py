@@ -0,0 +1,28 @@
+"""Query budgets for list endpoints: the count must not grow with the rows returned"""
+
+
+def test_admin_user_list(client, admin, make_user, max_queries):
+    for _ in range(8):
+        make_user()
+    client.get("/api/admin/users", headers=admin["headers"])
+    # Token version check + one SELECT of the users
+    with max_queries(2):
+        response = client.get("/api/admin/users", headers=admin["headers"])
+    assert response.status_code == 200
+    assert len(response.json()) >= 9
+
+
+def test_resource_list(client, admin, max_queries):
+    payload = [{"icon": "server", "title": f"Budget {i}", "resource_name": f"budget-{i}"} for i in range(20)]
+    assert client.post("/api/resources/bulk", json=payload, headers=admin["headers"]).status_code == 201
+    client.get("/api/resources/", headers=admin["headers"])
+    # (Cached) token version check + one SELECT of the page
+    with max_queries(2):
+        response = client.get("/api/resources/", headers=admin["headers"])
+    assert response.status_code == 200
+    assert len(response.json()) == 20
+
+    with max_queries(2):
+        response = client.get("/api/resources/?limit=5&sort=-title", headers=admin["headers"])
+    assert response.status_code == 200
+    assert len(response.json()) == 5
@@ -0,0 +1,97 @@
+"""Bulk create, update and delete: per-item results, partial failure and validation"""
+import pytest
+
+from app.core.config import settings
+
+MISSING_ID = 10 ** 9
+
+
+def create(client, headers, count: int, **fields) -> list:
+    payload = [
+        {"icon": "server", "title": f"bulk {i}", "resource_name": f"bulk-{i}", **fields}
+        for i in range(count)
+    ]
+    response = client.post("/api/resources/bulk", json=payload, headers=headers)
+    assert response.status_code == 201, response.text
+    return [result["resource"] for result in response.json()["results"]]
+
+
+def listed(client, headers) -> dict:
+    return {item["id"]: item for item in client.get("/api/resources/", headers=headers).json()}
+
+
+def test_update_reports_unknown_ids_and_applies_the_rest(client, admin):
+    headers = admin["headers"]
+    first, second = create(client, headers, 2, description="to be cleared")
+    response = client.patch("/api/resources/bulk", json=[
+        {"id": first["id"], "status": "Stopped"},
+        {"id": MISSING_ID, "status": "Stopped"},
+        {"id": second["id"], "title": "renamed", "description": None},
+    ], headers=headers)
+    assert response.status_code == 200, response.text
+    body = response.json()
+    assert (body["succeeded"], body["failed"]) == (2, 1)
+    assert [(r["index"], r["id"], r["status"]) for r in body["results"]] == [
+        (0, first["id"], "updated"), (1, MISSING_ID, "not_found"), (2, second["id"], "updated"),
+    ]
+    assert body["results"][1]["error"] == "Resource not found"
+    assert body["results"][1]["resource"] is None
+
+    rows = listed(client, headers)
+    assert rows[first["id"]]["status"] == "Stopped"
+    # Omitted fields are left as they were
+    assert rows[first["id"]]["title"] == first["title"]
+    assert rows[first["id"]]["description"] == "to be cleared"
+    assert rows[second["id"]]["title"] == "renamed"
+    assert rows[second["id"]]["description"] is None
+    assert rows[second["id"]]["status"] == second["status"]
+
+
+@pytest.mark.parametrize("field", ["icon", "title", "resource_name", "status", "region", "created_at"])
+def test_null_patch_is_a_422(client, admin, field):
+    headers = admin["headers"]
+    (resource,) = create(client, headers, 1)
+    response = client.patch("/api/resources/bulk", json=[
+        {"id": resource["id"], "status": "Stopped"},
+        {"id": resource["id"], field: None},
+    ], headers=headers)
+    assert response.status_code == 422
+    assert "cannot be null" in response.text
+    # The whole batch is rejected
+    assert listed(client, headers)[resource["id"]] == resource
+
+
+def test_delete_reports_unknown_ids_and_deletes_the_rest(client, admin):
+    headers = admin["headers"]
+    first, second, kept = create(client, headers, 3)
+    response = client.post("/api/resources/bulk/delete",
+                           json={"ids": [first["id"], MISSING_ID, second["id"]]}, headers=headers)
+    assert response.status_code == 200, response.text
+    body = response.json()
+    assert (body["succeeded"], body["failed"]) == (2, 1)
+    assert [r["status"] for r in body["results"]] == ["deleted", "not_found", "deleted"]
+    assert list(listed(client, headers)) == [kept["id"]]
+
+
+def test_create_with_an_invalid_item_creates_nothing(client, admin):
+    headers = admin["headers"]
+    response = client.post("/api/resources/bulk", json=[
+        {"icon": "server", "title": "valid", "resource_name": "valid"},
+        {"icon": "server", "title": "", "resource_name": "invalid"},
+    ], headers=headers)
+    assert response.status_code == 422
+    assert listed(client, headers) == {}
+
+
+def test_bulk_endpoints_are_admin_only(client, make_user):
+    headers = make_user()["headers"]
+    item = {"icon": "server", "title": "t", "resource_name": "r"}
+    assert client.post("/api/resources/bulk", json=[item], headers=headers).status_code == 403
+    assert client.patch("/api/resources/bulk", json=[{"id": 1, "status": "Stopped"}], headers=headers).status_code == 403
+    assert client.post("/api/resources/bulk/delete", json={"ids": [1]}, headers=headers).status_code == 403
+
+
+def test_oversized_batch_is_a_413(client, admin, monkeypatch):
+    monkeypatch.setattr(settings, "RESOURCES_BULK_MAX_ITEMS", 2)
+    response = client.post("/api/resources/bulk/delete", json={"ids": [1, 2, 3]}, headers=admin["headers"])
+    assert response.status_code == 413
@@ -0,0 +1,88 @@
+"""Background resource import: row errors, the error cap and the spooled upload"""
+import json
+
+import pytest
+
+from app.core.config import settings
+from app.db import resource_import
+
+
+@pytest.fixture
+def upload_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "IMPORT_UPLOAD_DIR", str(tmp_path))
+    monkeypatch.setattr(settings, "IMPORT_BATCH_ROWS", 3)
+    return tmp_path
+
+
+def upload(client, headers, filename: str, content: str) -> dict:
+    # TestClient runs the background import before returning
+    response = client.post("/api/resources/import", files={"file": (filename, content.encode())}, headers=headers)
+    assert response.status_code == 202, response.text
+    job = client.get(f"/api/resources/import/{response.json()['id']}", headers=headers)
+    assert job.status_code == 200, job.text
+    return job.json()
+
+
+def test_csv_import_skips_invalid_rows_and_caps_errors(client, admin, upload_dir, monkeypatch):
+    monkeypatch.setattr(settings, "IMPORT_MAX_ERRORS", 2)
+    lines = ["icon,title,resource_name,status"]
+    for i in range(10):
+        # Rows 3, 6 and 9 have no title; the header is line 1
+        lines.append(f"server,{'' if i % 3 == 2 else f'imported {i}'},imported-{i},Stopped")
+    lines.append("server,extra,extra,Running,surplus")
+    job = upload(client, admin["headers"], "resources.csv", "\n".join(lines) + "\n")
+
+    assert job["status"] == "done"
+    assert (job["rows_done"], job["rows_imported"], job["rows_failed"]) == (11, 7, 4)
+    assert [error["line"] for error in job["errors"]] == [4, 7]
+    assert job["errors"][0]["error"].startswith("title:")
+    assert job["bytes_done"] == job["bytes_total"]
+
+    titles = sorted(item["title"] for item in client.get("/api/resources/", headers=admin["headers"]).json())
+    assert titles == sorted(f"imported {i}" for i in range(10) if i % 3 != 2)
+    assert list(upload_dir.iterdir()) == []
+
+
+def test_ndjson_import_reports_bad_lines(client, admin, upload_dir):
+    content = "\n".join([
+        json.dumps({"icon": "database", "title": "first", "resource_name": "first"}),
+        "{not json",
+        "",
+        json.dumps(["not", "an", "object"]),
+        json.dumps({"icon": "database", "title": "second", "resource_name": "second", "region": "West Europe"}),
+    ])
+    job = upload(client, admin["headers"], "resources.ndjson", content)
+
+    assert job["status"] == "done"
+    assert (job["rows_imported"], job["rows_failed"]) == (2, 2)
+    assert [error["line"] for error in job["errors"]] == [2, 4]
+    assert job["errors"][0]["error"].startswith("invalid JSON")
+    assert job["errors"][1]["error"] == "expected a JSON object"
+    assert list(upload_dir.iterdir()) == []
+
+
+def test_failed_import_removes_the_upload(client, admin, upload_dir, monkeypatch):
+    def fail(conn, after_id):
+        raise RuntimeError("index unavailable")
+
+    monkeypatch.setattr(resource_import.search_index, "index_resources_after", fail)
+    job = upload(client, admin["headers"], "resources.csv", "icon,title,resource_name\nserver,t,r\n")
+
+    assert job["status"] == "failed"
+    assert job["message"] == "index unavailable"
+    assert job["rows_imported"] == 0
+    assert client.get("/api/resources/", headers=admin["headers"]).json() == []
+    assert list(upload_dir.iterdir()) == []
+
+
+def test_unknown_format_is_a_400(client, admin, upload_dir):
+    response = client.post("/api/resources/import", files={"file": ("resources.txt", b"x")},
+                           headers=admin["headers"])
+    assert response.status_code == 400
+    assert list(upload_dir.iterdir()) == []
+
+
+def test_import_is_admin_only(client, make_user, upload_dir):
+    response = client.post("/api/resources/import", files={"file": ("resources.csv", b"icon\n")},
+                           headers=make_user()["headers"])
+    assert response.status_code == 403
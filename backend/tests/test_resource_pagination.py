@@ -0,0 +1,115 @@
+"""Keyset pagination of GET /api/resources/: every sort key, both directions, NULLs and ties"""
+import base64
+import json
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import update
+
+from app.db.database import SessionLocal
+from app.models.resource import Resource
+
+SORTS = ["created_at", "-created_at", "updated_at", "-updated_at", "title", "-title"]
+
+BASE = datetime(2024, 1, 1, 12, 0, 0)
+# (title, created_at, updated_at): NULLs in both timestamps, ties in every sort key
+ROWS = [
+    ("beta", BASE, None),
+    ("alpha", None, BASE + timedelta(hours=1)),
+    ("beta", BASE, BASE),
+    ("gamma", BASE + timedelta(days=1), None),
+    ("alpha", None, None),
+    ("delta", BASE - timedelta(days=1), BASE),
+    ("beta", BASE + timedelta(days=2), BASE + timedelta(hours=1)),
+    ("epsilon", None, BASE - timedelta(hours=1)),
+    ("gamma", BASE, BASE + timedelta(minutes=1, microseconds=5)),
+    ("alpha", BASE + timedelta(days=1), None),
+    ("zeta", BASE - timedelta(days=1), BASE + timedelta(hours=1)),
+]
+
+
+@pytest.fixture
+def owner(client, admin):
+    payload = [{"icon": "server", "title": title, "resource_name": f"page-{i}"} for i, (title, _, _) in enumerate(ROWS)]
+    response = client.post("/api/resources/bulk", json=payload, headers=admin["headers"])
+    assert response.status_code == 201, response.text
+    ids = [result["id"] for result in response.json()["results"]]
+    db = SessionLocal()
+    try:
+        for resource_id, (_, created_at, updated_at) in zip(ids, ROWS):
+            db.execute(update(Resource).where(Resource.id == resource_id).values(
+                created_at=created_at, updated_at=updated_at
+            ))
+        db.commit()
+    finally:
+        db.close()
+    rows = {resource_id: row for resource_id, row in zip(ids, ROWS)}
+    return admin["headers"], rows
+
+
+def expected_order(rows, sort):
+    column = ("title", "created_at", "updated_at").index(sort.lstrip("-"))
+    # NULL first ascending (as SQLite and Azure SQL sort it), ties broken by id
+    ascending = sorted(rows, key=lambda rid: (rows[rid][column] is not None, rows[rid][column] or "", rid))
+    return ascending[::-1] if sort.startswith("-") else ascending
+
+
+def walk(client, headers, sort, limit):
+    ids, cursor, pages = [], None, 0
+    while True:
+        params = {"sort": sort, "limit": limit}
+        if cursor:
+            params["cursor"] = cursor
+        response = client.get("/api/resources/", params=params, headers=headers)
+        assert response.status_code == 200, response.text
+        page = [item["id"] for item in response.json()]
+        assert len(page) <= limit
+        ids.extend(page)
+        pages += 1
+        cursor = response.headers.get("X-Next-Cursor")
+        if cursor is None:
+            return ids, pages
+        assert pages <= len(ids) + 1, "pagination does not advance"
+
+
+@pytest.mark.parametrize("sort", SORTS)
+@pytest.mark.parametrize("limit", [1, 2, 4])
+def test_page_walk_matches_the_full_order(client, owner, sort, limit):
+    headers, rows = owner
+    ids, pages = walk(client, headers, sort, limit)
+    assert len(ids) == len(set(ids)), "duplicated rows"
+    assert ids == expected_order(rows, sort)
+    assert pages == -(-len(rows) // limit)
+
+    unpaged = client.get("/api/resources/", params={"sort": sort}, headers=headers).json()
+    assert [item["id"] for item in unpaged] == ids
+
+
+def test_null_timestamps_are_returned_as_null(client, owner):
+    headers, rows = owner
+    items = client.get("/api/resources/", params={"sort": "created_at"}, headers=headers).json()
+    nulls = [item for item in items if item["created_at"] is None]
+    assert len(nulls) == sum(1 for _, created_at, _ in rows.values() if created_at is None)
+    assert items[:len(nulls)] == nulls
+
+
+def _cursor(payload) -> str:
+    raw = payload if isinstance(payload, bytes) else json.dumps(payload).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+@pytest.mark.parametrize("sort, cursor", [
+    ("created_at", "not-a-cursor!"),
+    ("created_at", _cursor(b"{not json")),
+    ("created_at", _cursor(["title", "alpha", 1])),
+    ("created_at", _cursor(["created_at", "yesterday", 1])),
+    ("created_at", _cursor(["created_at", None, "one"])),
+    ("created_at", _cursor(["created_at", None])),
+    ("-updated_at", _cursor({"sort": "-updated_at"})),
+    ("title", _cursor(["title", "alpha", None])),
+])
+def test_invalid_cursor_is_a_400(client, owner, sort, cursor):
+    headers, _ = owner
+    response = client.get("/api/resources/", params={"sort": sort, "limit": 2, "cursor": cursor}, headers=headers)
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid cursor"
@@ -0,0 +1,73 @@
+"""Word-index search path (the one Azure SQL uses), run against SQLite"""
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import Unicode, create_engine
+
+from app.db import search_index
+from app.db.database import Base
+from app.models.resource import Resource, ResourceSearchTerm
+from app.models.user import User
+
+
+@pytest.fixture
+def conn(monkeypatch):
+    monkeypatch.setattr(search_index, "_uses_fts", lambda conn: False)
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine, tables=[User.__table__, Resource.__table__, ResourceSearchTerm.__table__])
+    with engine.begin() as conn:
+        yield conn
+    engine.dispose()
+
+
+def add(conn, resource_id, owner, title, resource_name="", description=None):
+    conn.execute(Resource.__table__.insert().values(
+        id=resource_id, user_id=owner, icon="server", title=title,
+        resource_name=resource_name, description=description
+    ))
+    search_index.index_resources(conn, [SimpleNamespace(
+        id=resource_id, user_id=owner, title=title, resource_name=resource_name, description=description
+    )])
+
+
+def found(conn, owner, query):
+    return [hit["id"] for hit in search_index.search(conn, owner, query)]
+
+
+def test_terms_are_unicode():
+    assert isinstance(ResourceSearchTerm.__table__.c.term.type, Unicode)
+
+
+def test_prefix_match_on_every_word(conn):
+    add(conn, 1, "u1", "Fizz buzz vm9", "web-server")
+    add(conn, 2, "u1", "Fizzle", "db")
+    assert sorted(found(conn, "u1", "fiz")) == [1, 2]
+    assert found(conn, "u1", "fizz vm9") == [1]
+    assert found(conn, "u1", "FIZZ web") == [1]
+    assert found(conn, "u1", "fizz nope") == []
+
+
+def test_owner_scoped(conn):
+    add(conn, 1, "u1", "Shared name")
+    add(conn, 2, "u2", "Shared name")
+    assert found(conn, "u2", "shared") == [2]
+
+
+def test_non_latin_words(conn):
+    # Same length, different letters: both must be kept as separate terms
+    add(conn, 1, "u1", "Сервер базы", "东京 大阪")
+    add(conn, 2, "u1", "Сервис", "Café")
+    assert sorted(found(conn, "u1", "серв")) == [1, 2]
+    assert found(conn, "u1", "базы") == [1]
+    assert found(conn, "u1", "大阪") == [1]
+    assert found(conn, "u1", "cafe") == [2]
+    terms = {row.term for row in conn.execute(ResourceSearchTerm.__table__.select())}
+    assert {"сервер", "базы", "东京", "大阪", "сервис"} <= terms
+
+
+def test_title_outranks_description(conn):
+    add(conn, 1, "u1", "Other", "x", "gateway notes")
+    add(conn, 2, "u1", "Gateway", "y")
+    hits = search_index.search(conn, "u1", "gateway")
+    assert [hit["id"] for hit in hits] == [2, 1]
+    assert hits[0]["highlights"]["title"] == "<mark>Gateway</mark>"
@@ -0,0 +1,66 @@
+"""Token versions: password resets, role changes and deletions revoke existing tokens"""
+from conftest import login
+
+from app.db.database import SessionLocal
+from app.models.user import TokenVersion
+
+# A route using the database principal and two using the token claims
+ROUTES = ["/api/users/me", "/api/resources/", "/api/theme/"]
+
+
+def statuses(client, headers) -> list:
+    return [client.get(route, headers=headers).status_code for route in ROUTES]
+
+
+def test_password_reset_revokes_existing_tokens(client, admin, make_user):
+    user = make_user()
+    assert statuses(client, user["headers"]) == [200, 200, 200]
+
+    response = client.post(f"/api/users/{user['id']}/reset-password",
+                           json={"new_password": "reset-password"}, headers=admin["headers"])
+    assert response.status_code == 200, response.text
+
+    assert statuses(client, user["headers"]) == [401, 401, 401]
+    old_password = client.post("/api/auth/login", json={"email": user["email"], "password": user["password"]})
+    assert old_password.status_code == 401
+    assert statuses(client, login(client, user["email"], "reset-password")) == [200, 200, 200]
+    # The admin who reset it is unaffected
+    assert statuses(client, admin["headers"]) == [200, 200, 200]
+
+
+def test_role_change_revokes_existing_tokens(client, admin, make_user):
+    user = make_user()
+    response = client.patch(f"/api/admin/users/{user['id']}/role", json={"role": "admin"}, headers=admin["headers"])
+    assert response.status_code == 200, response.text
+
+    assert statuses(client, user["headers"]) == [401, 401, 401]
+    headers = login(client, user["email"], user["password"])
+    assert client.get("/api/admin/users", headers=headers).status_code == 200
+
+
+def test_deletion_revokes_existing_tokens(client, admin, make_user):
+    user = make_user()
+    response = client.delete(f"/api/admin/users/{user['id']}", headers=admin["headers"])
+    assert response.status_code == 200, response.text
+    assert statuses(client, user["headers"]) == [401, 401, 401]
+
+
+def test_login_after_a_bump_on_another_worker(client, make_user):
+    user = make_user()
+    # Caches version 0 in this worker
+    assert statuses(client, user["headers"]) == [200, 200, 200]
+
+    # Another worker revokes the tokens: committed, but this worker's cache is not told
+    db = SessionLocal()
+    try:
+        row = db.get(TokenVersion, str(user["id"]))
+        if row is None:
+            db.add(TokenVersion(user_id=str(user["id"]), version=1))
+        else:
+            row.version += 1
+        db.commit()
+    finally:
+        db.close()
+
+    # A fresh token carries the committed version, not the cached one
+    assert statuses(client, login(client, user["email"], user["password"])) == [200, 200, 200]